@@ -0,0 +1,155 @@
+"""
+On-disk cache of parsed bank data files.
+
+- Each parsed file is stored as a pickled DataFrame keyed by the SHA-256 of the source file.
+- A small stat record per source (mtime + size) lets unchanged files skip re-hashing.
+- The cache is bounded in size; least recently used entries are evicted first, then the
+  stat records whose entry is gone.
+
+Entries are loaded with pickle, which can execute arbitrary code: the cache is opt-in
+(`--cache`) and must live in a directory that only trusted users can write to.
+"""
+
+import hashlib
+import json
+import os
+from typing import Callable
+
+import pandas as pd
+
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+ENTRY_SUFFIX = ".pkl"
+
+
+def file_digest(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_dir(file_path: str) -> str:
+    """
+    Cache directory placed next to the input directory,
+    e.g. bank_data/x.xlsx -> .bank_data_cache/
+    """
+    input_dir = os.path.dirname(os.path.abspath(file_path))
+    parent, name = os.path.split(input_dir)
+    return os.path.join(parent, f".{name}_cache")
+
+
+def _atomic_write(path: str, write: Callable[[str], None]) -> None:
+    """Write to a temp file and move it into place so parallel readers never see partial data."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _stat_record_path(cache_dir: str, file_path: str) -> str:
+    key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"stat_{key}.json")
+
+
+def cached_digest(file_path: str, cache_dir: str) -> str:
+    """
+    Return the content digest of a file, re-hashing only when its mtime or size changed.
+    """
+    stat = os.stat(file_path)
+    record_path = _stat_record_path(cache_dir, file_path)
+    try:
+        with open(record_path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        if record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+            return record["digest"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = file_digest(file_path)
+    record = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest}
+
+    def write(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+
+    _atomic_write(record_path, write)
+    return digest
+
+
+def evict(cache_dir: str, max_bytes: int) -> None:
+    """
+    Remove least recently used entries until the cache (entries and stat records)
+    fits into max_bytes, then the stat records pointing to an entry that is gone.
+    """
+    entries = []
+    records = []
+    for name in os.listdir(cache_dir):
+        is_entry = name.endswith(ENTRY_SUFFIX)
+        if not is_entry and not (name.startswith("stat_") and name.endswith(".json")):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if is_entry:
+            entries.append((stat.st_mtime, stat.st_size, path))
+        else:
+            records.append((stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries) + sum(size for size, _ in records)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+    # A record only saves re-hashing to find its entry; without the entry it is dead weight
+    for _, path in records:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                digest = json.load(f)["digest"]
+        except (OSError, ValueError, KeyError):
+            digest = None
+        if digest is None or not os.path.exists(
+            os.path.join(cache_dir, f"{digest}{ENTRY_SUFFIX}")
+        ):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def read_with_cache(
+    file_path: str,
+    reader: Callable[[str], pd.DataFrame],
+    cache_dir: str | None = None,
+    max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+) -> pd.DataFrame:
+    """
+    Return the parsed DataFrame for file_path, calling reader only on a cache miss.
+    """
+    cache_dir = cache_dir or default_cache_dir(file_path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    digest = cached_digest(file_path, cache_dir)
+    entry_path = os.path.join(cache_dir, f"{digest}{ENTRY_SUFFIX}")
+
+    if os.path.exists(entry_path):
+        try:
+            df = pd.read_pickle(entry_path)
+            # Touch the entry so eviction treats it as recently used
+            os.utime(entry_path)
+            return df
+        except Exception:
+            # Corrupted or incompatible entry: fall through and rebuild it
+            pass
+
+    df = reader(file_path)
+    _atomic_write(entry_path, df.to_pickle)
+    evict(cache_dir, max_bytes)
+    return df
@@ -0,0 +1,376 @@
+"""
+Benchmark harness for the compute_advanced_indicators pipeline.
+
+- Generates synthetic bank files with the columns read by the indicator modules.
+  Values follow a simple balance sheet (assets, loans, deposits, equity...). Some banks
+  lack direct-formula columns (so the proxies run), and some have all-NaN columns.
+- Times every stage separately over all banks: read, indicators, correlation, rules,
+  json, table and summary.
+- Appends one record per run (with the git commit) to a JSON Lines file and compares
+  it with the previous record of the same size, so regressions show up between commits.
+
+Run with `python -m project.compute_advanced_indicators.benchmark` from the repository root.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+
+from project.compute_advanced_indicators.build_correlation_matrix import (
+    CORR_FORMATS,
+    build_and_save_correlation_matrix,
+)
+from project.compute_advanced_indicators.build_stresstest_rules import (
+    build_stresstest_rules,
+)
+from project.compute_advanced_indicators.main import (
+    compute_advanced_indicators,
+    load_columns,
+)
+from project.compute_advanced_indicators.utils import (
+    create_summary,
+    read_bank_data,
+    save_bank_indicators_to_table,
+    save_json,
+)
+
+DATE_COL = "FYE"
+BANK_NAME_COL = "Bank Name"
+STAGES = ("read", "indicators", "correlation", "rules", "json", "table", "summary")
+# Relative to the working directory, so runs never write into the package
+DEFAULT_RESULTS_FILE = "benchmark_results.jsonl"
+
+# Columns only used by direct formulas: dropping them makes the indicator use its proxy
+DIRECT_ONLY_COLUMNS = (
+    "Retail Customer Deposits $m",
+    "Loans and Advances to Financial Institutions $m",
+    "Deposits made by the Central Bank $m",
+    "Avg Duration of Assets",
+    "Avg Duration of Liabilities",
+    "FX Assets",
+    "FX Liabilities",
+    "Held-to-Maturity Securities $m",
+    "Loan Impairment Provisions $m",
+    "Unrealized Gains or Losses on Financial Instruments Designated at Fair Value $m",
+    "Total Profit or Loss on Discontinued Operations & Extraordinary Items $m",
+    "Total Risk-Weighted Assets $m",
+)
+
+
+def synthetic_bank(
+    rng: np.random.Generator,
+    bank_id: int,
+    years: int = 30,
+    drop_rate: float = 0.3,
+    nan_column_rate: float = 0.05,
+) -> pd.DataFrame:
+    """
+    One synthetic bank: a row per financial year, newest first like the real files.
+    drop_rate: share of direct-only columns removed (proxy cases).
+    nan_column_rate: share of the remaining columns that are all-NaN (missing data).
+    """
+    n = years
+    growth = np.cumprod(1 + rng.normal(0.03, 0.05, n))[::-1]
+    assets = rng.lognormal(10, 1.5) * growth
+
+    def share(mean, sd=0.03):
+        return np.clip(rng.normal(mean, sd, n), 0, None) * assets
+
+    deposits = share(0.60)
+    retail = deposits * np.clip(rng.normal(0.55, 0.15), 0.05, 0.95)
+    loans = share(0.55)
+    equity = share(0.07, 0.01)
+    liabilities = assets - equity
+    income = share(0.04, 0.005)
+    fv_gains = rng.normal(0, 0.02, n) * income
+    discontinued = rng.normal(0, 0.05, n) * income
+
+    columns = {
+        DATE_COL: pd.date_range(end="2024-12-31", periods=n, freq="YE")[::-1],
+        BANK_NAME_COL: f"Synthetic Bank {bank_id}",
+        "Total Assets $m": assets,
+        "Total Liabilities $m": liabilities,
+        "Total Equity $m": equity,
+        "Gross Total Deposits $m": deposits,
+        "Retail Customer Deposits $m": retail,
+        "Corporate Customer Deposits $m": deposits - retail,
+        "Gross Total Loans $m": loans,
+        "Cash and Balance at Central Bank(s) $m": share(0.08),
+        "Loans and Advances to Financial Institutions $m": share(0.05),
+        "Deposits made by the Central Bank $m": share(0.02, 0.01),
+        "Deposits by Banks $m": share(0.05),
+        "Total Senior Debt $m": share(0.10),
+        "Subordinated Liabilities $m": share(0.02, 0.005),
+        "Avg Duration of Assets": rng.normal(4.0, 1.0, n),
+        "Avg Duration of Liabilities": rng.normal(2.5, 0.8, n),
+        "FX Assets": share(0.15),
+        "FX Liabilities": share(0.14),
+        "Derivatives (Assets) $m": share(0.06),
+        "Derivatives (Liabilities) $m": share(0.06),
+        # In percent like bank_data (the indicator divides it by 100)
+        "Net Stable Funding Ratio %": rng.normal(115, 15, n),
+        "Available-for-Sale Securities $m": share(0.10),
+        "Held-to-Maturity Securities $m": share(0.08),
+        "Loan Impairment Provisions $m": loans * np.abs(rng.normal(0.01, 0.005, n)),
+        "Allowance for Loan Losses $m": loans * np.abs(rng.normal(0.02, 0.005, n)),
+        "Trading Liabilities $m": share(0.04),
+        "Trading Securities $m": share(0.05),
+        "Unrealized Gains or Losses on Financial Instruments Designated at Fair Value $m": fv_gains,
+        "Net Trading Income $m": rng.normal(0.1, 0.05, n) * income,
+        "Total Profit or Loss on Discontinued Operations & Extraordinary Items $m": discontinued,
+        "Total Operating Income $m": income,
+        "Other Non-Interest Income $m": np.abs(rng.normal(0.08, 0.03, n)) * income,
+        "Total Risk-Weighted Assets $m": share(0.45, 0.08),
+        "Credit Risk-Weighted Assets $m": share(0.38, 0.07),
+    }
+    df = pd.DataFrame(columns)
+
+    dropped = [col for col in DIRECT_ONLY_COLUMNS if rng.random() < drop_rate]
+    df = df.drop(columns=dropped)
+    value_columns = [col for col in df.columns if col not in (DATE_COL, BANK_NAME_COL)]
+    for col in value_columns:
+        if rng.random() < nan_column_rate:
+            df[col] = np.nan
+    return df
+
+
+def write_synthetic_banks(
+    output_dir: str,
+    n_banks: int,
+    years: int = 30,
+    file_format: str = "csv",
+    seed: int = 0,
+) -> list[str]:
+    """Write n_banks synthetic bank files (csv or xlsx) and return their names."""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    files = []
+    for bank_id in range(n_banks):
+        df = synthetic_bank(rng, bank_id, years)
+        file = f"{bank_id:06d}_Synthetic_Bank.{file_format}"
+        path = os.path.join(output_dir, file)
+        if file_format == "csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_excel(path, index=False)
+        files.append(file)
+    return files
+
+
+def time_stages(
+    input_dir: str,
+    output_dir: str,
+    files: list[str],
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+) -> dict:
+    """Run the serial per-bank pipeline and return the wall time of each stage."""
+    timings = dict.fromkeys(STAGES, 0.0)
+    columns = load_columns(DATE_COL, BANK_NAME_COL)
+    corr_dir = os.path.join(output_dir, "correlation_matrices")
+    rules_dir = os.path.join(output_dir, "stresstest_rules")
+
+    def timed(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[stage] += time.perf_counter() - start
+        return result
+
+    results = []
+    for file in files:
+        df = timed(
+            "read",
+            read_bank_data,
+            os.path.join(input_dir, file),
+            use_cache=False,
+            columns=columns,
+        )
+        bank = timed(
+            "indicators",
+            compute_advanced_indicators,
+            df,
+            source_file=file,
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+        )
+        name = os.path.splitext(file)[0]
+        timed(
+            "correlation",
+            build_and_save_correlation_matrix,
+            bank,
+            corr_dir,
+            name,
+            corr_format=corr_format,
+            heatmap=heatmap,
+        )
+        timed("rules", build_stresstest_rules, bank, rules_dir, name)
+        timed(
+            "json",
+            save_json,
+            bank,
+            os.path.join(output_dir, f"{name}_indicators.json"),
+        )
+        results.append(bank)
+
+    timed(
+        "table",
+        save_bank_indicators_to_table,
+        results,
+        os.path.join(output_dir, "bank_indicators_table.csv"),
+    )
+    timed(
+        "summary",
+        create_summary,
+        results,
+        output_dir,
+        Console(file=io.StringIO()),
+    )
+    return timings
+
+
+def git_commit() -> str | None:
+    """Current commit of the repository, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+    n_banks: int,
+    years: int = 30,
+    file_format: str = "csv",
+    seed: int = 0,
+    work_dir: str | None = None,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+) -> dict:
+    """Generate n_banks synthetic banks, time every stage and return the record."""
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        input_dir = os.path.join(tmp_dir, "input")
+        files = write_synthetic_banks(input_dir, n_banks, years, file_format, seed)
+        timings = time_stages(
+            input_dir, os.path.join(tmp_dir, "output"), files, corr_format, heatmap
+        )
+
+    total = sum(timings.values())
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "n_banks": n_banks,
+        "years": years,
+        "file_format": file_format,
+        "seed": seed,
+        "corr_format": corr_format,
+        "heatmap": heatmap,
+        "total_s": total,
+        "stages_s": timings,
+        "per_bank_ms": {k: v / n_banks * 1000 for k, v in timings.items()},
+    }
+
+
+def previous_record(results_file: str, record: dict) -> dict | None:
+    """Last recorded run with the same size and settings."""
+    if not os.path.exists(results_file):
+        return None
+    previous = None
+    with open(results_file, "r", encoding="utf-8") as f:
+        for line in f:
+            old = json.loads(line)
+            if all(
+                old.get(k) == record[k]
+                for k in ("n_banks", "years", "file_format", "corr_format", "heatmap")
+            ):
+                previous = old
+    return previous
+
+
+def print_record(console: Console, record: dict, previous: dict | None) -> None:
+    console.print(
+        f"[bold]{record['n_banks']} banks[/bold] ({record['file_format']}, "
+        f"{record['years']} years, {record['corr_format']} correlation"
+        f"{'' if record['heatmap'] else ', no heatmap'}): {record['total_s']:.2f} s"
+    )
+    for stage in STAGES:
+        line = f"  {stage:<12}{record['stages_s'][stage]:>10.3f} s"
+        if previous is not None and previous["stages_s"].get(stage):
+            ratio = record["stages_s"][stage] / previous["stages_s"][stage]
+            line += f"  x{ratio:.2f} vs {previous.get('commit') or 'previous'}"
+        console.print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the indicators pipeline on synthetic banks."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10],
+        help="Numbers of banks to benchmark, e.g. 10 1000 100000 (large sizes are best run with --no_heatmap).",
+    )
+    parser.add_argument(
+        "--years", type=int, default=30, help="Financial years per synthetic bank."
+    )
+    parser.add_argument(
+        "--file_format",
+        choices=["csv", "xlsx"],
+        default="csv",
+        help="Format of the synthetic bank files.",
+    )
+    parser.add_argument(
+        "--corr_format",
+        choices=CORR_FORMATS,
+        default="xlsx",
+        help="Output format of the correlation matrices.",
+    )
+    parser.add_argument(
+        "--no_heatmap",
+        action="store_true",
+        help="Do not render the heatmaps embedded in xlsx correlation matrices.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument(
+        "--results_file",
+        default=DEFAULT_RESULTS_FILE,
+        help="JSON Lines file the benchmark records are appended to (default: in the working directory).",
+    )
+    parser.add_argument(
+        "--work_dir", help="Directory for the temporary synthetic data and outputs."
+    )
+
+    args = parser.parse_args()
+
+    console = Console()
+    for n_banks in args.sizes:
+        record = run_benchmark(
+            n_banks,
+            args.years,
+            args.file_format,
+            args.seed,
+            args.work_dir,
+            args.corr_format,
+            not args.no_heatmap,
+        )
+        print_record(console, record, previous_record(args.results_file, record))
+        with open(args.results_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
@@ -1,20 +1,24 @@
 """
-Build Spearman correlation matrix for bank indicators and save to Excel with heatmap.
+Build Spearman correlation matrix for bank indicators and save it.
 
-- Numeric correlation matrix is written into Excel.
-- Heatmap image is rendered in-memory (BytesIO) and embedded into Excel (no PNG file on disk).
+- Output formats: xlsx (default), npz, parquet, json.
+- For xlsx, the heatmap image is rendered in-memory (BytesIO) and embedded while the
+  workbook is written, in a single pass (no PNG file on disk, no reload of the workbook).
+- Heatmap rendering can be skipped entirely.
 """
 
+import json
 import os
 from io import BytesIO
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from PIL import Image as PILImage
-from openpyxl.drawing.image import Image as XLImage
-from openpyxl.utils import get_column_letter
-from openpyxl import load_workbook
+
+from project.compute_advanced_indicators.instrumentation import stage
+from project.compute_advanced_indicators.options import CORR_FORMATS
+
+# matplotlib, PIL and openpyxl are imported by the functions that need them, so runs
+# without xlsx output or heatmaps do not pay for their import
 
 
 def to_dataframe(indicators: dict[str, pd.Series]) -> pd.DataFrame:
@@ -51,6 +55,8 @@ def plot_heatmap_matplotlib(
     if mat.empty:
         return None
 
+    import matplotlib.pyplot as plt
+
     data = mat.values
     labels = list(mat.columns)
 
@@ -85,65 +91,73 @@ def plot_heatmap_matplotlib(
     return buf
 
 
-def insert_image(
-    excel_path: str, sheet_name: str, img_path, top_left_cell: str = "R1"
-) -> None:
-    """
-    Insert image into an Excel sheet.
-    - If `img_path` is BytesIO or a PIL.Image, it will be embedded directly.
-    - If `img_path` is a string path, it will be loaded from disk (legacy behavior).
-    """
-    wb = load_workbook(excel_path)
-    ws = wb[sheet_name]
-
-    if isinstance(img_path, BytesIO):
-        pil_img = PILImage.open(img_path)
-        img = XLImage(pil_img)
-    elif hasattr(img_path, "read"):  # file-like
-        pil_img = PILImage.open(img_path)
-        img = XLImage(pil_img)
-    elif isinstance(img_path, PILImage.Image):
-        img = XLImage(img_path)
-    else:
-        # Fallback to path on disk if provided (kept for compatibility)
-        img = XLImage(img_path)
-
-    ws.add_image(img, top_left_cell)
-    wb.save(excel_path)
-
-
 def write_corr_to_excel(
     excel_path: str,
     corr: pd.DataFrame,
     sheet_name: str = "Correlation_Matrix",
+    image: BytesIO | None = None,
 ) -> str:
     """
     Write correlation matrix to Excel and return cell for image placement.
+    If `image` is given, it is embedded in the same pass at that cell.
     """
-    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
-        if not corr.empty:
-            corr.to_excel(writer, sheet_name=sheet_name, startrow=0, startcol=0)
+    from openpyxl.drawing.image import Image as XLImage
+    from openpyxl.utils import get_column_letter
+    from PIL import Image as PILImage
 
     if not corr.empty:
         img_col = corr.shape[1] + 3  # leave a few columns gap for image
         anchor = f"{get_column_letter(img_col)}1"
     else:
         anchor = "R1"
+
+    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
+        # An empty matrix still gets its sheet: a workbook needs at least one visible sheet
+        corr.to_excel(writer, sheet_name=sheet_name, startrow=0, startcol=0)
+        if image is not None:
+            writer.sheets[sheet_name].add_image(XLImage(PILImage.open(image)), anchor)
+
     return anchor
 
 
-def build_and_save_correlation_matrix(
-    bank_data: dict,
-    output_dir: str,
-    filename_base: str,
+def corr_to_json(corr: pd.DataFrame) -> dict:
+    """Labels and matrix rows, with NaN as null."""
+    matrix = corr.astype(object).where(corr.notna(), None)
+    return {"labels": list(corr.columns), "matrix": matrix.values.tolist()}
+
+
+def write_corr(
+    path: str,
+    corr: pd.DataFrame,
+    corr_format: str,
+    image: BytesIO | None = None,
 ) -> None:
+    """Write the correlation matrix in the requested format."""
+    if corr_format == "xlsx":
+        write_corr_to_excel(path, corr, sheet_name="Correlation_Matrix", image=image)
+    elif corr_format == "npz":
+        np.savez(
+            path,
+            matrix=corr.to_numpy(dtype=float),
+            labels=np.array(corr.columns, dtype=str),
+        )
+    elif corr_format == "parquet":
+        # Requires pyarrow (checked by cli.py before the run)
+        corr.to_parquet(path)
+    elif corr_format == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(corr_to_json(corr), f, ensure_ascii=False)
+    else:
+        raise ValueError(
+            f"Unsupported correlation format: {corr_format}. Use one of {CORR_FORMATS}."
+        )
+
+
+def indicator_series(indicators: dict) -> dict[str, pd.Series]:
     """
-    Build only Spearman correlation matrix and save to Excel with embedded heatmap (no PNG file on disk).
+    Normalize to Series in case some indicators are lists/scalars,
+    keeping only those with at least 2 valid points.
     """
-    indicators = bank_data["indicators_full"]
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Normalize to Series in case some indicators are lists/scalars
     series_indicators: dict[str, pd.Series] = {}
     for k, v in indicators.items():
         if v is None:
@@ -157,22 +171,39 @@ def build_and_save_correlation_matrix(
         s = s.dropna()
         if s.count() >= 2:
             series_indicators[k] = s
+    return series_indicators
+
 
-    # 1) Prepare DataFrame
-    df = to_dataframe(series_indicators)
+def build_correlation_matrix(bank_data: dict) -> pd.DataFrame:
+    """Spearman correlation matrix of a bank's indicator time series."""
+    df = to_dataframe(indicator_series(bank_data["indicators_full"]))
+    return spearman_corr(df)
 
-    # 2) Correlation
-    corr = spearman_corr(df)
 
-    # 3) Excel path
-    excel_path = os.path.join(output_dir, f"{filename_base}_correlation.xlsx")
+def build_and_save_correlation_matrix(
+    bank_data: dict,
+    output_dir: str,
+    filename_base: str,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+) -> pd.DataFrame:
+    """
+    Build only Spearman correlation matrix and save it in `corr_format`.
+    For xlsx, the heatmap is embedded in the workbook unless `heatmap` is False.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    with stage("correlation:spearman"):
+        corr = build_correlation_matrix(bank_data)
 
-    # 4) Write numeric matrix
-    anchor = write_corr_to_excel(excel_path, corr, sheet_name="Correlation_Matrix")
+    img_bytes = None
+    if corr_format == "xlsx" and heatmap:
+        with stage("correlation:heatmap"):
+            img_bytes = plot_heatmap_matplotlib(
+                corr, out_png="", title="Spearman Correlation (Indicators)"
+            )
 
-    # 5) Render heatmap to bytes and embed directly into Excel
-    img_bytes = plot_heatmap_matplotlib(
-        corr, out_png="", title="Spearman Correlation (Indicators)"
-    )
-    if img_bytes is not None:
-        insert_image(excel_path, "Correlation_Matrix", img_bytes, top_left_cell=anchor)
+    path = os.path.join(output_dir, f"{filename_base}_correlation.{corr_format}")
+    with stage("correlation:write"):
+        write_corr(path, corr, corr_format, image=img_bytes)
+    return corr
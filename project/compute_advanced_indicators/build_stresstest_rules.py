@@ -1,26 +1,42 @@
 """
 Build stress-test logic rules (causal mapping) based on indicators.
+
+Thresholds come from each bank's own history. If peer quantiles (see peer_analytics)
+are given, every rule also gets peer-relative conditions built from the same quantiles
+of the whole universe.
 """
 
 import os
+import numpy as np
 import pandas as pd
 import json
 
+# Quantile levels used by the thresholds (q10/q25/q75/q90) and signed_direction (median)
+QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
 
 def clean_indicators(indicators_full: dict) -> dict:
     """Drop NaN inside each series and remove empty series entirely."""
     clean_data = {}
     for k, v in indicators_full.items():
         if v is not None:
-            v = v.dropna()
+            # Series, or plain lists once the result has been saved to JSON
+            v = pd.Series(v, dtype=float).dropna()
             if not v.empty:
                 clean_data[k] = v
     return clean_data
 
 
-def quantile(series: pd.Series, value: float) -> float:
-    """Compute quantile as float."""
-    return float(series.quantile(value))
+def series_quantiles(series: pd.Series) -> dict[float, float]:
+    """All QUANTILES of a series (NaN ignored) in a single np.quantile call."""
+    values = series.to_numpy(dtype=float)
+    values = values[~np.isnan(values)]
+    return dict(zip(QUANTILES, np.quantile(values, QUANTILES).tolist()))
+
+
+def quantile_table(indicators_full: dict) -> dict[str, dict[float, float]]:
+    """Per-bank threshold table: QUANTILES of every (cleaned) indicator, computed once."""
+    return {name: series_quantiles(series) for name, series in indicators_full.items()}
 
 
 def fmt(x: float, nd: int = 4) -> str:
@@ -36,17 +52,25 @@ def decimals_for(name: str) -> int:
     return 2 if name in two else 4
 
 
-def signed_direction(series: pd.Series, default_direction: str) -> str:
+def signed_direction(
+    series: pd.Series, default_direction: str, median: float | None = None
+) -> str:
     """
     Decide direction based on data sign when metric can be negative or positive.
     If median < 0 -> '<' (more negative is worse), else use default_direction.
+    A precomputed median (from quantile_table) can be passed instead of recomputing it.
     """
-    med = float(series.median())
+    med = float(series.median()) if median is None else median
     return "<" if med < 0 else default_direction
 
 
 def pick_threshold(
-    name: str, series: pd.Series, direction: str, expr: str | None = None
+    name: str,
+    series: pd.Series,
+    direction: str,
+    expr: str | None = None,
+    peer: pd.Series | None = None,
+    quantiles: dict[float, float] | None = None,
 ) -> dict:
     """
     Pick dynamic WARNING/CRITICAL thresholds from quantiles and immediately
@@ -59,11 +83,17 @@ def pick_threshold(
     expr:
         Optional left-hand expression for the condition (e.g., 'abs(Duration_Gap)').
         Defaults to the indicator name.
+
+    peer:
+        Optional universe quantiles of the indicator (index: 0.10, 0.25, 0.75, 0.90).
+        Adds peer-relative thresholds and conditions using the same quantile levels.
+
+    quantiles:
+        Optional precomputed quantiles of the series (see quantile_table).
     """
-    q10 = quantile(series, 0.10)
-    q25 = quantile(series, 0.25)
-    q75 = quantile(series, 0.75)
-    q90 = quantile(series, 0.90)
+    if quantiles is None:
+        quantiles = series_quantiles(series)
+    q10, q25, q75, q90 = (quantiles[q] for q in (0.10, 0.25, 0.75, 0.90))
 
     if direction == ">":
         warn, crit = q75, q90
@@ -75,7 +105,7 @@ def pick_threshold(
     nd = decimals_for(name)
     lhs = expr if expr is not None else name
 
-    return {
+    result = {
         "name": name,
         "warn": warn,
         "critical": crit,
@@ -83,27 +113,86 @@ def pick_threshold(
         "condition_critical": f"{lhs} {op} {fmt(crit, nd)}",
     }
 
+    if peer is not None:
+        if direction == ">":
+            peer_warn, peer_crit = float(peer[0.75]), float(peer[0.90])
+        else:
+            peer_warn, peer_crit = float(peer[0.25]), float(peer[0.10])
+        result.update(
+            {
+                "peer_warn": peer_warn,
+                "peer_critical": peer_crit,
+                "peer_condition_warning": f"{lhs} {op} {fmt(peer_warn, nd)}",
+                "peer_condition_critical": f"{lhs} {op} {fmt(peer_crit, nd)}",
+            }
+        )
+
+    return result
+
+
+def peer_conditions(*thresholds: dict) -> dict | None:
+    """Peer-relative conditions of a rule (AND of its parts), if all parts have them."""
+    if not all("peer_condition_warning" in thr for thr in thresholds):
+        return None
+    if len(thresholds) == 1:
+        return {
+            "peer_condition_warning": thresholds[0]["peer_condition_warning"],
+            "peer_condition_critical": thresholds[0]["peer_condition_critical"],
+        }
+    return {
+        "peer_condition_warning": " and ".join(
+            f"({thr['peer_condition_warning']})" for thr in thresholds
+        ),
+        "peer_condition_critical": " and ".join(
+            f"({thr['peer_condition_critical']})" for thr in thresholds
+        ),
+    }
+
 
 def add_rule(
-    rules: list, condition_warning: str, condition_critical: str, rationale: str
+    rules: list,
+    condition_warning: str,
+    condition_critical: str,
+    rationale: str,
+    peer: dict | None = None,
 ):
-    """Append a simple rule object."""
-    rules.append(
-        {
-            "condition_warning": condition_warning,
-            "condition_critical": condition_critical,
-            "rationale": rationale,
-        }
-    )
+    """Append a simple rule object (with peer-relative conditions if given)."""
+    rule = {
+        "condition_warning": condition_warning,
+        "condition_critical": condition_critical,
+        "rationale": rationale,
+    }
+    if peer is not None:
+        rule.update(peer)
+    rules.append(rule)
 
 
-def build_rules_from_bank_data(bank_data: dict) -> list:
+def build_rules_from_bank_data(
+    bank_data: dict, peer_quantiles: pd.DataFrame | None = None
+) -> list:
     """
-    Build rules from available indicators using only their own distributions.
+    Build rules from available indicators using their own distributions.
+    peer_quantiles (indicator x quantile level) adds peer-relative conditions.
     """
     indicators_full = clean_indicators(bank_data["indicators_full"])
     rules = []
 
+    # One sort per indicator; single and combo rules all read from this table
+    table = quantile_table(indicators_full)
+
+    def threshold(name, series, direction, expr=None):
+        peer = None
+        if peer_quantiles is not None and name in peer_quantiles.index:
+            peer = peer_quantiles.loc[name]
+        return pick_threshold(
+            name, series, direction, expr, peer=peer, quantiles=table[name]
+        )
+
+    def direction_of(name, default_direction):
+        return signed_direction(
+            indicators_full[name], default_direction, median=table[name][0.50]
+        )
+
     def has(k):
         return k in indicators_full and indicators_full[k].count() >= 2
 
@@ -112,52 +201,57 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
     # --------------------
     if has("Loan_to_Deposit_Ratio"):
         name = "Loan_to_Deposit_Ratio"
-        thr = pick_threshold(name, indicators_full[name], ">")
+        thr = threshold(name, indicators_full[name], ">")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "High Loan-to-Deposit Ratio indicates potential liquidity stress.",
+            peer=peer_conditions(thr),
         )
 
     if has("Net_Stable_Funding_Ratio"):
         name = "Net_Stable_Funding_Ratio"
-        thr = pick_threshold(name, indicators_full[name], "<")
+        thr = threshold(name, indicators_full[name], "<")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "NSFR below internal history hints funding stress.",
+            peer=peer_conditions(thr),
         )
 
     if has("Cash_Shortage_Proxy"):
         name = "Cash_Shortage_Proxy"
-        thr = pick_threshold(name, indicators_full[name], ">")
+        thr = threshold(name, indicators_full[name], ">")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "Deterioration in short-term liquidity conditions.",
+            peer=peer_conditions(thr),
         )
 
     if has("Core_Deposit_Mix_Ratio"):
         name = "Core_Deposit_Mix_Ratio"
-        thr = pick_threshold(name, indicators_full[name], "<")
+        thr = threshold(name, indicators_full[name], "<")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "Low share of core deposits weakens funding stability.",
+            peer=peer_conditions(thr),
         )
 
     if has("Core_Deposit_Stability"):
         name = "Core_Deposit_Stability"
-        thr = pick_threshold(name, indicators_full[name], "<")
+        thr = threshold(name, indicators_full[name], "<")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "Declining deposit stability increases funding risk.",
+            peer=peer_conditions(thr),
         )
 
     # --------------------
@@ -165,42 +259,46 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
     # --------------------
     if has("Duration_Gap"):
         name = "Duration_Gap"
-        thr = pick_threshold(name, indicators_full[name], ">", expr=f"abs({name})")
+        thr = threshold(name, indicators_full[name], ">", expr=f"abs({name})")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "Large duration gap increases interest rate risk (IRRBB).",
+            peer=peer_conditions(thr),
         )
 
     if has("Derivatives_Exposure"):
         name = "Derivatives_Exposure"
-        thr = pick_threshold(name, indicators_full[name], ">")
+        thr = threshold(name, indicators_full[name], ">")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "Higher derivatives exposure may raise market/counterparty risk.",
+            peer=peer_conditions(thr),
         )
 
     if has("FX_Mismatch"):
         name = "FX_Mismatch"
-        thr = pick_threshold(name, indicators_full[name], ">")
+        thr = threshold(name, indicators_full[name], ">")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "FX asset/liability imbalance indicates currency risk.",
+            peer=peer_conditions(thr),
         )
 
     if has("Fair_Value_Gains_Losses"):
         name = "Fair_Value_Gains_Losses"
-        thr = pick_threshold(name, indicators_full[name], "<")
+        thr = threshold(name, indicators_full[name], "<")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "Negative fair-value remeasurements indicate valuation pressure.",
+            peer=peer_conditions(thr),
         )
 
     # --------------------
@@ -208,19 +306,20 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
     # --------------------
     if has("RWA_to_Assets"):
         name = "RWA_to_Assets"
-        thr = pick_threshold(name, indicators_full[name], ">")
+        thr = threshold(name, indicators_full[name], ">")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "High RWA density implies risk-heavy balance sheet.",
+            peer=peer_conditions(thr),
         )
 
     # OCI-based unrealized losses (auto-direction by median sign)
     if has("OCI_Based_Unrealized_Losses_to_Equity"):
         name = "OCI_Based_Unrealized_Losses_to_Equity"
-        direction = signed_direction(indicators_full[name], default_direction=">")
-        thr = pick_threshold(name, indicators_full[name], direction)
+        direction = direction_of(name, default_direction=">")
+        thr = threshold(name, indicators_full[name], direction)
         add_rule(
             rules,
             thr["condition_warning"],
@@ -230,12 +329,13 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
                 if direction == ">"
                 else "More negative OCI-based unrealized losses weigh on capital."
             ),
+            peer=peer_conditions(thr),
         )
 
     if has("OCI_Based_Unrealized_Losses_to_Assets"):
         name = "OCI_Based_Unrealized_Losses_to_Assets"
-        direction = signed_direction(indicators_full[name], default_direction=">")
-        thr = pick_threshold(name, indicators_full[name], direction)
+        direction = direction_of(name, default_direction=">")
+        thr = threshold(name, indicators_full[name], direction)
         add_rule(
             rules,
             thr["condition_warning"],
@@ -245,6 +345,7 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
                 if direction == ">"
                 else "More negative OCI-based unrealized losses (to assets) signal valuation risk."
             ),
+            peer=peer_conditions(thr),
         )
 
     # --------------------
@@ -252,22 +353,24 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
     # --------------------
     if has("Cost_of_Risk"):
         name = "Cost_of_Risk"
-        thr = pick_threshold(name, indicators_full[name], ">")
+        thr = threshold(name, indicators_full[name], ">")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "Rising cost of risk indicates credit deterioration.",
+            peer=peer_conditions(thr),
         )
 
     if has("Non_Recurring_Income_Ratio"):
         name = "Non_Recurring_Income_Ratio"
-        thr = pick_threshold(name, indicators_full[name], ">")
+        thr = threshold(name, indicators_full[name], ">")
         add_rule(
             rules,
             thr["condition_warning"],
             thr["condition_critical"],
             "High share of non-recurring income undermines earnings quality.",
+            peer=peer_conditions(thr),
         )
 
     # --------------------
@@ -275,10 +378,10 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
     # --------------------
     # Liquidity: high LDR AND low NSFR
     if has("Loan_to_Deposit_Ratio") and has("Net_Stable_Funding_Ratio"):
-        ldr = pick_threshold(
+        ldr = threshold(
             "Loan_to_Deposit_Ratio", indicators_full["Loan_to_Deposit_Ratio"], ">"
         )
-        nsfr = pick_threshold(
+        nsfr = threshold(
             "Net_Stable_Funding_Ratio", indicators_full["Net_Stable_Funding_Ratio"], "<"
         )
         add_rule(
@@ -286,6 +389,7 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
             f"({ldr['condition_warning']}) and ({nsfr['condition_warning']})",
             f"({ldr['condition_critical']}) and ({nsfr['condition_critical']})",
             "High LDR together with low NSFR flags elevated liquidity stress.",
+            peer=peer_conditions(ldr, nsfr),
         )
 
     # Capital: high RWA density AND large OCI losses (equity or assets)
@@ -293,26 +397,27 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
         has("OCI_Based_Unrealized_Losses_to_Equity")
         or has("OCI_Based_Unrealized_Losses_to_Assets")
     ):
-        rwa = pick_threshold("RWA_to_Assets", indicators_full["RWA_to_Assets"], ">")
+        rwa = threshold("RWA_to_Assets", indicators_full["RWA_to_Assets"], ">")
         if has("OCI_Based_Unrealized_Losses_to_Equity"):
             oname = "OCI_Based_Unrealized_Losses_to_Equity"
         else:
             oname = "OCI_Based_Unrealized_Losses_to_Assets"
-        odir = signed_direction(indicators_full[oname], default_direction=">")
-        othr = pick_threshold(oname, indicators_full[oname], odir)
+        odir = direction_of(oname, default_direction=">")
+        othr = threshold(oname, indicators_full[oname], odir)
         add_rule(
             rules,
             f"({rwa['condition_warning']}) and ({othr['condition_warning'] if odir == '>' else othr['condition_warning']})",
             f"({rwa['condition_critical']}) and ({othr['condition_critical'] if odir == '>' else othr['condition_critical']})",
             "Risk-dense balance sheet combined with sizable OCI losses points to capital pressure.",
+            peer=peer_conditions(rwa, othr),
         )
 
     # Liquidity: cash shortage proxy AND weak core deposit stability
     if has("Cash_Shortage_Proxy") and has("Core_Deposit_Stability"):
-        csp = pick_threshold(
+        csp = threshold(
             "Cash_Shortage_Proxy", indicators_full["Cash_Shortage_Proxy"], ">"
         )
-        cds = pick_threshold(
+        cds = threshold(
             "Core_Deposit_Stability", indicators_full["Core_Deposit_Stability"], "<"
         )
         add_rule(
@@ -320,17 +425,18 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
             f"({csp['condition_warning']}) and ({cds['condition_warning']})",
             f"({csp['condition_critical']}) and ({cds['condition_critical']})",
             "Short-term liquidity strain paired with weak deposit stability.",
+            peer=peer_conditions(csp, cds),
         )
 
     # Market: big duration gap AND negative FV remeasurements
     if has("Duration_Gap") and has("Fair_Value_Gains_Losses"):
-        dg = pick_threshold(
+        dg = threshold(
             "Duration_Gap",
             indicators_full["Duration_Gap"],
             ">",
             expr="abs(Duration_Gap)",
         )
-        fv = pick_threshold(
+        fv = threshold(
             "Fair_Value_Gains_Losses", indicators_full["Fair_Value_Gains_Losses"], "<"
         )
         add_rule(
@@ -338,12 +444,13 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
             f"({dg['condition_warning']}) and ({fv['condition_warning']})",
             f"({dg['condition_critical']}) and ({fv['condition_critical']})",
             "IRRBB exposure coupled with valuation losses.",
+            peer=peer_conditions(dg, fv),
         )
 
     # Market/Counterparty: FX mismatch AND derivatives exposure both high
     if has("FX_Mismatch") and has("Derivatives_Exposure"):
-        fx = pick_threshold("FX_Mismatch", indicators_full["FX_Mismatch"], ">")
-        der = pick_threshold(
+        fx = threshold("FX_Mismatch", indicators_full["FX_Mismatch"], ">")
+        der = threshold(
             "Derivatives_Exposure", indicators_full["Derivatives_Exposure"], ">"
         )
         add_rule(
@@ -351,16 +458,17 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
             f"({fx['condition_warning']}) and ({der['condition_warning']})",
             f"({fx['condition_critical']}) and ({der['condition_critical']})",
             "Elevated FX imbalance together with sizable derivatives exposure.",
+            peer=peer_conditions(fx, der),
         )
 
     # Earnings quality: high non-recurring share AND negative FV
     if has("Non_Recurring_Income_Ratio") and has("Fair_Value_Gains_Losses"):
-        nri = pick_threshold(
+        nri = threshold(
             "Non_Recurring_Income_Ratio",
             indicators_full["Non_Recurring_Income_Ratio"],
             ">",
         )
-        fv = pick_threshold(
+        fv = threshold(
             "Fair_Value_Gains_Losses", indicators_full["Fair_Value_Gains_Losses"], "<"
         )
         add_rule(
@@ -368,14 +476,15 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
             f"({nri['condition_warning']}) and ({fv['condition_warning']})",
             f"({nri['condition_critical']}) and ({fv['condition_critical']})",
             "Large non-recurring income share alongside negative FV signals weak earnings quality.",
+            peer=peer_conditions(nri, fv),
         )
 
     # Funding mix: low core deposit mix AND low NSFR
     if has("Core_Deposit_Mix_Ratio") and has("Net_Stable_Funding_Ratio"):
-        cdm = pick_threshold(
+        cdm = threshold(
             "Core_Deposit_Mix_Ratio", indicators_full["Core_Deposit_Mix_Ratio"], "<"
         )
-        nsfr = pick_threshold(
+        nsfr = threshold(
             "Net_Stable_Funding_Ratio", indicators_full["Net_Stable_Funding_Ratio"], "<"
         )
         add_rule(
@@ -383,16 +492,22 @@ def build_rules_from_bank_data(bank_data: dict) -> list:
             f"({cdm['condition_warning']}) and ({nsfr['condition_warning']})",
             f"({cdm['condition_critical']}) and ({nsfr['condition_critical']})",
             "Weak core funding base combined with low NSFR.",
+            peer=peer_conditions(cdm, nsfr),
         )
 
     return rules
 
 
-def build_stresstest_rules(bank_data: dict, output_dir: str, file: str) -> list:
+def build_stresstest_rules(
+    bank_data: dict,
+    output_dir: str,
+    file: str,
+    peer_quantiles: pd.DataFrame | None = None,
+) -> list:
     """
     Build stress-test rules based on bank data indicators and save to JSON.
     """
-    rules = build_rules_from_bank_data(bank_data)
+    rules = build_rules_from_bank_data(bank_data, peer_quantiles)
 
     os.makedirs(output_dir, exist_ok=True)
 
@@ -0,0 +1,233 @@
+"""
+Command-line entry point of the indicators pipeline.
+
+Only argparse and the option names are imported to parse the arguments; the pipeline
+(pandas, rich, the indicator modules) is imported once they are valid, so `--help`
+and invalid invocations return immediately.
+
+Run it as `python -m project.compute_advanced_indicators.cli` from the repository root,
+or as the `compute-advanced-indicators` command once the project is installed.
+"""
+
+import argparse
+
+from project.compute_advanced_indicators.options import (
+    CORR_FORMATS,
+    JSON_FORMATS,
+    RANKINGS,
+    TABLE_FORMATS,
+    parquet_available,
+)
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compute advanced financial indicators for banks."
+    )
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
+        "--input_dir",
+        help="Path to the input directory containing bank data files.",
+    )
+    input_group.add_argument(
+        "--input_file",
+        help="Path to a single CSV containing all banks; it is streamed in chunks and split by --bank_name_col.",
+    )
+    parser.add_argument(
+        "--output_dir",
+        required=True,
+        help="Path to the output directory to save results.",
+    )
+    parser.add_argument(
+        "--date_col_name", help="Name of the date column in the bank data files."
+    )
+    parser.add_argument(
+        "--bank_name_col",
+        help="Name of the column containing bank names in the data files.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Number of worker processes used to process banks in parallel.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache parsed input files on disk (pickles: only for trusted cache directories).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only reprocess banks whose input file, code or thresholds changed since the last run.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["bank", "panel"],
+        default="bank",
+        help="'bank' computes indicators bank by bank; 'panel' computes them for all banks in one vectorised pass.",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=100_000,
+        help="Rows per chunk when streaming --input_file.",
+    )
+    parser.add_argument(
+        "--unsorted",
+        action="store_true",
+        help="--input_file rows are not grouped by bank: spill rows to temporary per-bank files first.",
+    )
+
+    parser.add_argument(
+        "--corr_format",
+        choices=CORR_FORMATS,
+        default="xlsx",
+        help="Output format of the per-bank correlation matrices.",
+    )
+    parser.add_argument(
+        "--no_heatmap",
+        action="store_true",
+        help="Do not render the heatmap embedded in xlsx correlation matrices.",
+    )
+    parser.add_argument(
+        "--defer_heatmaps",
+        action="store_true",
+        help="Render heatmaps as PNG files in a separate stage after all banks are processed.",
+    )
+    parser.add_argument(
+        "--json_format",
+        choices=JSON_FORMATS,
+        default="pretty",
+        help="Layout of the per-bank indicators JSON: indented for reading, or compact.",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Also write every bank result to a single indicators.jsonl (one compact JSON per line).",
+    )
+    parser.add_argument(
+        "--table_format",
+        choices=TABLE_FORMATS,
+        default="csv",
+        help="Format of the consolidated bank table (parquet requires pyarrow).",
+    )
+    parser.add_argument(
+        "--excel_export",
+        action="store_true",
+        help="Also export the consolidated table to Excel (streaming write-only workbook).",
+    )
+    parser.add_argument(
+        "--store",
+        help="Also write all outputs of the run to this consolidated SQLite file.",
+    )
+    parser.add_argument(
+        "--no_bank_files",
+        action="store_true",
+        help="Do not write the per-bank JSON, correlation and rules files (requires --store).",
+    )
+    parser.add_argument(
+        "--top_k",
+        type=positive_int,
+        default=5,
+        help="Number of riskiest banks listed in the summary.",
+    )
+    parser.add_argument(
+        "--rank_by",
+        choices=RANKINGS,
+        default="flag_count",
+        help="Ranking of the summary: flag count, or flag count with ties broken by breach severity.",
+    )
+    parser.add_argument(
+        "--peer_analytics",
+        action="store_true",
+        help="Compute the cross-bank correlation and peer quantiles, and add peer-relative conditions to the rules.",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record per-stage wall time, CPU time and peak memory into run_report.json.",
+    )
+    parser.add_argument(
+        "--chrome_trace",
+        action="store_true",
+        help="Also write trace.json for chrome://tracing or Perfetto (implies --instrument).",
+    )
+
+    return parser
+
+
+def run(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.input_file is not None and args.bank_name_col is None:
+        parser.error("--input_file requires --bank_name_col")
+    if args.input_file is not None and (args.incremental or args.engine == "panel"):
+        parser.error(
+            "--incremental and --engine panel apply to --input_dir only, not --input_file"
+        )
+    if args.no_bank_files and args.store is None:
+        parser.error("--no_bank_files requires --store")
+    # Fail before any bank is processed rather than when the first file is written
+    if args.corr_format == "parquet" and not parquet_available():
+        parser.error(
+            "--corr_format parquet requires pyarrow (pip install 'project[parquet]')"
+        )
+    if args.table_format == "parquet" and not parquet_available():
+        parser.error(
+            "--table_format parquet requires pyarrow (pip install 'project[parquet]')"
+        )
+    if args.engine == "panel" and args.workers > 1:
+        parser.error("--engine panel runs in one process and cannot use --workers")
+    if args.defer_heatmaps and args.no_heatmap:
+        parser.error("--defer_heatmaps cannot be combined with --no_heatmap")
+    if args.no_bank_files and (args.incremental or args.defer_heatmaps):
+        parser.error(
+            "--no_bank_files cannot be combined with --incremental or --defer_heatmaps"
+        )
+
+    from project.compute_advanced_indicators.main import main
+    from project.compute_advanced_indicators.streaming import UnsortedInputError
+
+    try:
+        main(
+            input_dir=args.input_dir,
+            output_dir=args.output_dir,
+            date_col_name=args.date_col_name,
+            bank_name_col=args.bank_name_col,
+            workers=args.workers,
+            use_cache=args.cache,
+            incremental=args.incremental,
+            engine=args.engine,
+            input_file=args.input_file,
+            chunksize=args.chunksize,
+            presorted=not args.unsorted,
+            corr_format=args.corr_format,
+            heatmap=not args.no_heatmap,
+            defer_heatmaps=args.defer_heatmaps,
+            peer_analytics=args.peer_analytics,
+            top_k=args.top_k,
+            rank_by=args.rank_by,
+            json_format=args.json_format,
+            jsonl=args.jsonl,
+            store=args.store,
+            bank_files=not args.no_bank_files,
+            table_format=args.table_format,
+            excel_export=args.excel_export,
+            instrument=args.instrument,
+            chrome_trace=args.chrome_trace,
+        )
+    except UnsortedInputError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,78 @@
+"""
+Shared fixtures: a few real bank files and their baseline results, computed with the
+original serial per-bank path (whole file read, then compute_advanced_indicators).
+"""
+
+import math
+import os
+import shutil
+
+import pytest
+
+from project.compute_advanced_indicators.main import compute_advanced_indicators
+from project.compute_advanced_indicators.utils import (
+    bank_result_to_json,
+    read_bank_data,
+)
+
+BANK_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "bank_data"
+)
+# Outputs of the original pipeline for bank_data, kept in the repository
+ORIGINAL_OUTPUT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "output_bank_indicators"
+)
+BANK_FILES = [
+    "1258_Barclays.xlsx",
+    "1275_Basler_Kantonalbank.xlsx",
+    "2938_KBC_Group.xlsx",
+]
+DATE_COL = "FYE"
+BANK_NAME_COL = "Bank Name"
+
+
+def baseline_result(path: str, source_file: str | None = None) -> dict:
+    """Result of the original per-bank path for one input file."""
+    return compute_advanced_indicators(
+        read_bank_data(path),
+        source_file=source_file or os.path.basename(path),
+        date_col_name=DATE_COL,
+        bank_name_col=BANK_NAME_COL,
+    )
+
+
+def _assert_same(actual, expected, path: str, rel: float) -> None:
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict) and actual.keys() == expected.keys(), path
+        for key in expected:
+            _assert_same(actual[key], expected[key], f"{path}.{key}", rel)
+    elif isinstance(expected, list):
+        assert isinstance(actual, list) and len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            _assert_same(a, e, f"{path}[{i}]", rel)
+    elif isinstance(expected, float) and not isinstance(actual, bool):
+        assert isinstance(actual, (int, float)), path
+        assert math.isclose(actual, expected, rel_tol=rel, abs_tol=1e-12), path
+    else:
+        assert actual == expected, path
+
+
+def assert_same_result(actual: dict, expected: dict, rel: float = 1e-9) -> None:
+    """Same meta, indicators, series, quality and flags (JSON form, floats to rel)."""
+    _assert_same(
+        bank_result_to_json(actual), bank_result_to_json(expected), "result", rel
+    )
+
+
+@pytest.fixture(scope="session")
+def bank_dir(tmp_path_factory) -> str:
+    directory = tmp_path_factory.mktemp("bank_data")
+    for file in BANK_FILES:
+        shutil.copy(os.path.join(BANK_DATA_DIR, file), directory / file)
+    return str(directory)
+
+
+@pytest.fixture(scope="session")
+def baseline(bank_dir) -> dict[str, dict]:
+    """Baseline result of every bank file, by file name."""
+    return {file: baseline_result(os.path.join(bank_dir, file)) for file in BANK_FILES}
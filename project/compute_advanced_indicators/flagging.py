@@ -0,0 +1,179 @@
+"""
+Vectorised threshold flagging for the whole bank universe.
+
+- The indicator matrix (bank x indicator) is compared with a threshold profile in one
+  array operation per sign, instead of a dict loop per bank.
+- Profiles are named threshold sets: the built-in "default" (utils.THRESHOLDS), profiles
+  loaded from a JSON config (e.g. "regulatory", "internal") and a "peer" profile built
+  from the peer quantiles of peer_analytics.
+- Rescoring only needs the indicator matrix (e.g. the consolidated table), so a new
+  profile does not require recomputing any indicator.
+
+Config format (an indicator missing from a profile keeps its default threshold):
+
+    {"regulatory": {"Net_Stable_Funding_Ratio": {"threshold": 1.0, "sign": "<"}}}
+
+Run with `python -m project.compute_advanced_indicators.flagging` from the repository root.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from project.compute_advanced_indicators.utils import THRESHOLDS
+
+DEFAULT_PROFILE = "default"
+PEER_PROFILE = "peer"
+
+
+def load_threshold_profiles(path: str | None = None) -> dict[str, dict]:
+    """Built-in default profile plus the profiles of a JSON config file."""
+    profiles = {DEFAULT_PROFILE: THRESHOLDS}
+    if path is None:
+        return profiles
+
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    for name, overrides in config.items():
+        for key, item in overrides.items():
+            if item.get("sign") not in (">", "<") or "threshold" not in item:
+                raise ValueError(
+                    f"Invalid threshold for {key!r} in profile {name!r}: {item}"
+                )
+        profiles[name] = {**THRESHOLDS, **overrides}
+    return profiles
+
+
+def peer_profile(peer_quantiles: dict, low: str = "q10", high: str = "q90") -> dict:
+    """
+    Peer-relative profile from peer_analytics quantiles ({indicator: {"q10": ..}}):
+    indicators where higher is worse breach above `high`, the others below `low`.
+    """
+    profile = {}
+    for key, item in THRESHOLDS.items():
+        quantiles = peer_quantiles.get(key)
+        if quantiles is None:
+            continue
+        level = high if item["sign"] == ">" else low
+        if quantiles.get(level) is not None:
+            profile[key] = {"threshold": quantiles[level], "sign": item["sign"]}
+    return profile
+
+
+def indicator_matrix(results: list[dict] | dict[str, dict]) -> pd.DataFrame:
+    """
+    Bank x indicator matrix of the aggregated indicators of bank results.
+    A dict of results is indexed by its keys, a list by position.
+    """
+    if isinstance(results, dict):
+        index, results = list(results), list(results.values())
+    else:
+        index = None
+    return pd.DataFrame(
+        [result["indicators"] for result in results], index=index, dtype=float
+    )
+
+
+def detect_flags_frame(
+    matrix: pd.DataFrame, profile: dict = THRESHOLDS
+) -> pd.DataFrame:
+    """
+    Flag every bank and indicator of the profile at once.
+    Returns a nullable boolean frame: True is bad, False is good, <NA> if the value is missing.
+    """
+    columns = [key for key in profile if key in matrix.columns]
+    values = matrix[columns].to_numpy(dtype=float)
+    thresholds = np.array([profile[key]["threshold"] for key in columns], dtype=float)
+    above = np.array([profile[key]["sign"] == ">" for key in columns])
+
+    flags = np.where(above, values > thresholds, values < thresholds)
+    missing = np.isnan(values)
+    return pd.DataFrame(
+        {
+            key: pd.arrays.BooleanArray(flags[:, j], missing[:, j])
+            for j, key in enumerate(columns)
+        },
+        index=matrix.index,
+    )
+
+
+def breach_counts(flags: pd.DataFrame) -> pd.Series:
+    """Number of breached thresholds per bank."""
+    return flags.sum(axis=1).astype(int)
+
+
+def score_profiles(
+    matrix: pd.DataFrame, profiles: dict[str, dict]
+) -> dict[str, tuple[pd.DataFrame, pd.Series]]:
+    """Flags and breach counts of the whole universe under every profile."""
+    result = {}
+    for name, profile in profiles.items():
+        flags = detect_flags_frame(matrix, profile)
+        result[name] = (flags, breach_counts(flags))
+    return result
+
+
+def read_indicator_table(path: str) -> pd.DataFrame:
+    """Indicator matrix from the consolidated table written by main.py."""
+    if path.endswith(".csv"):
+        df = pd.read_csv(path)
+    elif path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    elif path.endswith(".xlsx"):
+        df = pd.read_excel(path)
+    else:
+        raise ValueError(
+            "Unsupported table format. Please provide a CSV, Parquet or Excel file."
+        )
+    if "bank_name" in df.columns:
+        df = df.set_index("bank_name")
+    return df[[key for key in THRESHOLDS if key in df.columns]].astype(float)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-score the bank universe under named threshold profiles."
+    )
+    parser.add_argument(
+        "--table",
+        required=True,
+        help="Consolidated indicators table (CSV, Parquet or Excel) written by main.py.",
+    )
+    parser.add_argument(
+        "--output_dir",
+        required=True,
+        help="Directory for <profile>_flags.csv and breach_counts.csv.",
+    )
+    parser.add_argument("--profiles", help="JSON file with named threshold profiles.")
+    parser.add_argument(
+        "--peer_quantiles",
+        help="peer_quantiles.json written by --peer_analytics; adds the 'peer' profile.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        help="Profile to score (repeatable). Defaults to every loaded profile.",
+    )
+
+    args = parser.parse_args()
+
+    profiles = load_threshold_profiles(args.profiles)
+    if args.peer_quantiles is not None:
+        with open(args.peer_quantiles, "r", encoding="utf-8") as f:
+            profiles[PEER_PROFILE] = peer_profile(json.load(f)["quantiles"])
+    if args.profile:
+        unknown = set(args.profile) - set(profiles)
+        if unknown:
+            parser.error(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+        profiles = {name: profiles[name] for name in args.profile}
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    scores = score_profiles(read_indicator_table(args.table), profiles)
+    for name, (flags, _) in scores.items():
+        flags.to_csv(os.path.join(args.output_dir, f"{name}_flags.csv"))
+    pd.DataFrame({name: counts for name, (_, counts) in scores.items()}).to_csv(
+        os.path.join(args.output_dir, "breach_counts.csv")
+    )
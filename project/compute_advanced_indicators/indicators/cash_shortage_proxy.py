@@ -1,49 +1,51 @@
 import pandas as pd
 import numpy as np
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+    nonzero,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+
+COLUMNS = (
+    "Cash and Balance at Central Bank(s) $m",
+    "Loans and Advances to Financial Institutions $m",
+    "Deposits made by the Central Bank $m",
+    "Deposits by Banks $m",
+)
+PROXY_COLUMNS = (
+    "Cash and Balance at Central Bank(s) $m",
+    "Gross Total Deposits $m",
+)
 
 
 def compute_cash_shortage_proxy(df: pd.DataFrame) -> dict:
     """Cash Shortage Proxy"""
 
-    result = {}
-    if cols_exist_and_not_na(
-        df,
-        [
-            "Cash and Balance at Central Bank(s) $m",
-            "Loans and Advances to Financial Institutions $m",
-            "Deposits made by the Central Bank $m",
-            "Deposits by Banks $m",
-        ],
-    ):
+    if cols_exist_and_not_na(df, COLUMNS):
         cash = df["Cash and Balance at Central Bank(s) $m"]
         interbank = df["Loans and Advances to Financial Institutions $m"]
         short_term_liab = (
             df["Deposits made by the Central Bank $m"] + df["Deposits by Banks $m"]
         )
         indicator = (cash + interbank) / short_term_liab.replace(0, np.nan)
-        result["indicator_full"] = indicator
-        result["indicator"] = indicator.mean()
-        result["quality"] = "direct"
-    else:
-        result["indicator_full"] = proxy_cash_shortage(df, full=True)
-        result["indicator"] = proxy_cash_shortage(df)
-        result["quality"] = "proxy"
+        return indicator_result(indicator, "direct")
 
-    return result
+    return indicator_result(proxy_cash_shortage(df), "proxy")
 
 
-def proxy_cash_shortage(
-    df: pd.DataFrame, full: bool = False
-) -> float | pd.Series | None:
+def proxy_cash_shortage(df: pd.DataFrame) -> pd.Series | None:
     """Proxy for Cash Shortage based on Cash to Deposits Ratio"""
-    if cols_exist_and_not_na(
-        df, ["Cash and Balance at Central Bank(s) $m", "Gross Total Deposits $m"]
-    ):
-        proxy = df["Cash and Balance at Central Bank(s) $m"] / df[
-            "Gross Total Deposits $m"
-        ].replace(0, np.nan)
-        if full:
-            return proxy
-        return proxy.mean()
+    if cols_exist_and_not_na(df, PROXY_COLUMNS):
+        return df["Cash and Balance at Central Bank(s) $m"] / nonzero(
+            df, "Gross Total Deposits $m"
+        )
     return None
+
+
+SPEC = IndicatorSpec(
+    name="Cash_Shortage_Proxy",
+    columns=COLUMNS,
+    proxy_columns=PROXY_COLUMNS,
+    compute=compute_cash_shortage_proxy,
+)
@@ -1,37 +1,33 @@
 import pandas as pd
-import numpy as np
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+    nonzero,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+
+COLUMNS = ("Retail Customer Deposits $m", "Gross Total Deposits $m")
+PROXY_COLUMNS = ("Retail Customer Deposits $m", "Total Liabilities $m")
 
 
 def compute_core_deposit_stability(df: pd.DataFrame) -> dict:
     """Compute Core Deposit Stability Proxy"""
-    result = {}
-    cols = ["Retail Customer Deposits $m", "Gross Total Deposits $m"]
-    if cols_exist_and_not_na(df, cols):
-        indicator = df[cols[0]] / df[cols[1]].replace(0, np.nan)
-
-        result["indicator_full"] = indicator
-        result["indicator"] = indicator.mean()
-        result["quality"] = "direct"
-    else:
-        result["indicator_full"] = proxy_core_deposit_stability(df, full=True)
-        result["indicator"] = proxy_core_deposit_stability(df)
-        result["quality"] = "proxy"
-    return result
+    if cols_exist_and_not_na(df, COLUMNS):
+        indicator = df[COLUMNS[0]] / nonzero(df, COLUMNS[1])
+        return indicator_result(indicator, "direct")
+    return indicator_result(proxy_core_deposit_stability(df), "proxy")
 
 
-def proxy_core_deposit_stability(
-    df: pd.DataFrame, full: bool = False
-) -> float | pd.Series | None:
+def proxy_core_deposit_stability(df: pd.DataFrame) -> pd.Series | None:
     """Proxy: Use ratio of Retail Deposits to Total Liabilities"""
-    if cols_exist_and_not_na(
-        df, ["Retail Customer Deposits $m", "Total Liabilities $m"]
-    ):
-        proxy = df["Retail Customer Deposits $m"] / df["Total Liabilities $m"].replace(
-            0, np.nan
-        )
-
-        if full:
-            return proxy
-        return proxy.mean()
+    if cols_exist_and_not_na(df, PROXY_COLUMNS):
+        return df["Retail Customer Deposits $m"] / nonzero(df, "Total Liabilities $m")
     return None
+
+
+SPEC = IndicatorSpec(
+    name="Core_Deposit_Stability",
+    columns=COLUMNS,
+    proxy_columns=PROXY_COLUMNS,
+    compute=compute_core_deposit_stability,
+)
@@ -1,34 +1,33 @@
 import pandas as pd
-import numpy as np
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+    nonzero,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+
+COLUMNS = ("Loan Impairment Provisions $m", "Gross Total Loans $m")
+PROXY_COLUMNS = ("Allowance for Loan Losses $m", "Gross Total Loans $m")
 
 
 def compute_cost_of_risk(df: pd.DataFrame) -> dict:
     """Compute Cost of Risk"""
-    result = {}
-    cols = ["Loan Impairment Provisions $m", "Gross Total Loans $m"]
-    if cols_exist_and_not_na(df, cols):
-        indicator = df[cols[0]] / df[cols[1]].replace(0, np.nan)
-
-        result["indicator_full"] = indicator
-        result["indicator"] = indicator.mean()
-        result["quality"] = "direct"
-    else:
-        result["indicator_full"] = proxy_cost_of_risk(df, full=True)
-        result["indicator"] = proxy_cost_of_risk(df)
-        result["quality"] = "proxy"
-    return result
+    if cols_exist_and_not_na(df, COLUMNS):
+        indicator = df[COLUMNS[0]] / nonzero(df, COLUMNS[1])
+        return indicator_result(indicator, "direct")
+    return indicator_result(proxy_cost_of_risk(df), "proxy")
 
 
-def proxy_cost_of_risk(
-    df: pd.DataFrame, full: bool = False
-) -> float | pd.Series | None:
+def proxy_cost_of_risk(df: pd.DataFrame) -> pd.Series | None:
     """Proxy: Use Allowance for Loan Losses instead of provisions"""
-    cols = ["Allowance for Loan Losses $m", "Gross Total Loans $m"]
-    if cols_exist_and_not_na(df, cols):
-        proxy = df[cols[0]] / df[cols[1]].replace(0, np.nan)
-
-        if full:
-            return proxy
-        return proxy.mean()
+    if cols_exist_and_not_na(df, PROXY_COLUMNS):
+        return df[PROXY_COLUMNS[0]] / nonzero(df, PROXY_COLUMNS[1])
     return None
+
+
+SPEC = IndicatorSpec(
+    name="Cost_of_Risk",
+    columns=COLUMNS,
+    proxy_columns=PROXY_COLUMNS,
+    compute=compute_cost_of_risk,
+)
@@ -1,42 +1,41 @@
 import pandas as pd
-import numpy as np
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+    nonzero,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+
+COLUMNS = (
+    "Derivatives (Assets) $m",
+    "Derivatives (Liabilities) $m",
+    "Total Assets $m",
+)
+PROXY_COLUMNS = ("Trading Liabilities $m", "Trading Securities $m", "Total Assets $m")
 
 
 def compute_derivatives_exposure(df: pd.DataFrame) -> dict:
     """Compute Derivatives Exposure"""
-    result = {}
-    cols = [
-        "Derivatives (Assets) $m",
-        "Derivatives (Liabilities) $m",
-        "Total Assets $m",
-    ]
-    if cols_exist_and_not_na(df, cols):
+    if cols_exist_and_not_na(df, COLUMNS):
         indicator = (
             df["Derivatives (Assets) $m"] + df["Derivatives (Liabilities) $m"]
-        ) / df["Total Assets $m"].replace(0, np.nan)
-
-        result["indicator_full"] = indicator
-        result["indicator"] = indicator.mean()
-        result["quality"] = "direct"
-    else:
-        result["indicator_full"] = proxy_derivatives_exposure(df, full=True)
-        result["indicator"] = proxy_derivatives_exposure(df)
-        result["quality"] = "proxy"
-    return result
+        ) / nonzero(df, "Total Assets $m")
+        return indicator_result(indicator, "direct")
+    return indicator_result(proxy_derivatives_exposure(df), "proxy")
 
 
-def proxy_derivatives_exposure(
-    df: pd.DataFrame, full: bool = False
-) -> float | pd.Series | None:
+def proxy_derivatives_exposure(df: pd.DataFrame) -> pd.Series | None:
     """Proxy: Use Trading Liabilities + Trading Securities / Total Assets"""
-    cols = ["Trading Liabilities $m", "Trading Securities $m", "Total Assets $m"]
-    if cols_exist_and_not_na(df, cols):
-        proxy = (df["Trading Liabilities $m"] + df["Trading Securities $m"]) / df[
-            "Total Assets $m"
-        ].replace(0, np.nan)
-
-        if full:
-            return proxy
-        return proxy.mean()
+    if cols_exist_and_not_na(df, PROXY_COLUMNS):
+        return (df["Trading Liabilities $m"] + df["Trading Securities $m"]) / nonzero(
+            df, "Total Assets $m"
+        )
     return None
+
+
+SPEC = IndicatorSpec(
+    name="Derivatives_Exposure",
+    columns=COLUMNS,
+    proxy_columns=PROXY_COLUMNS,
+    compute=compute_derivatives_exposure,
+)
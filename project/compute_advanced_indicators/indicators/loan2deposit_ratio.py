@@ -1,42 +1,41 @@
 import pandas as pd
-import numpy as np
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+    nonzero,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+
+COLUMNS = ("Gross Total Loans $m", "Retail Customer Deposits $m")
+PROXY_COLUMNS = ("Gross Total Loans $m", "Gross Total Deposits $m")
 
 
 def compute_loan_to_deposit_ratio(df: pd.DataFrame) -> dict:
     """Loan-to-Deposit Ratio (LDR)"""
 
-    result = {}
-    if cols_exist_and_not_na(
-        df, ["Gross Total Loans $m", "Retail Customer Deposits $m"]
-    ):
-        indicator = df["Gross Total Loans $m"] / df[
-            "Retail Customer Deposits $m"
-        ].replace(0, np.nan)
-
-        result["indicator_full"] = indicator
-        result["indicator"] = indicator.mean()
-        result["quality"] = "direct"
-    else:
-        result["indicator_full"] = proxy_loan_to_deposit(df, full=True)
-        result["indicator"] = proxy_loan_to_deposit(df)
-        result["quality"] = "proxy"
+    if cols_exist_and_not_na(df, COLUMNS):
+        indicator = df["Gross Total Loans $m"] / nonzero(
+            df, "Retail Customer Deposits $m"
+        )
+        return indicator_result(indicator, "direct")
 
-    return result
+    return indicator_result(proxy_loan_to_deposit(df), "proxy")
 
 
-def proxy_loan_to_deposit(
-    df: pd.DataFrame, full: bool = False
-) -> float | pd.Series | None:
+def proxy_loan_to_deposit(df: pd.DataFrame) -> pd.Series | None:
     """Calculate Loan-to-Deposit Ratio using Gross Total Loans and Deposits."""
 
-    if cols_exist_and_not_na(df, ["Gross Total Loans $m", "Gross Total Deposits $m"]):
+    if cols_exist_and_not_na(df, PROXY_COLUMNS):
         loans = df["Gross Total Loans $m"]
-        deposits = df["Gross Total Deposits $m"].replace(0, np.nan)
-        proxy = loans / deposits
-
-        if full:
-            return proxy
-        return proxy.mean()
+        deposits = nonzero(df, "Gross Total Deposits $m")
+        return loans / deposits
 
     return None
+
+
+SPEC = IndicatorSpec(
+    name="Loan_to_Deposit_Ratio",
+    columns=COLUMNS,
+    proxy_columns=PROXY_COLUMNS,
+    compute=compute_loan_to_deposit_ratio,
+)
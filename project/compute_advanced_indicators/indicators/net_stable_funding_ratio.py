@@ -1,20 +1,26 @@
 import pandas as pd
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+
+COLUMNS = ("Net Stable Funding Ratio %",)
 
 
 def compute_net_stable_funding_ratio(df: pd.DataFrame) -> dict:
     """Net Stable Funding Ratio (NSFR)"""
 
-    result = {}
-    if cols_exist_and_not_na(df, ["Net Stable Funding Ratio %"]):
+    if cols_exist_and_not_na(df, COLUMNS):
         indicator = df["Net Stable Funding Ratio %"] / 100.0
+        return indicator_result(indicator, "direct")
+
+    return indicator_result(None, "proxy")
 
-        result["indicator_full"] = indicator
-        result["indicator"] = indicator.mean()
-        result["quality"] = "direct"
-    else:
-        result["indicator_full"] = None
-        result["indicator"] = None
-        result["quality"] = "proxy"
 
-    return result
+SPEC = IndicatorSpec(
+    name="Net_Stable_Funding_Ratio",
+    columns=COLUMNS,
+    proxy_columns=(),
+    compute=compute_net_stable_funding_ratio,
+)
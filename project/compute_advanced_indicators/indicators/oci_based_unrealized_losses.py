@@ -1,80 +1,66 @@
 import pandas as pd
-import numpy as np
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+    nonzero,
+    shared,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
 
+OCI_COLUMNS = ("Available-for-Sale Securities $m", "Held-to-Maturity Securities $m")
+PROXY_OCI_COLUMNS = ("Available-for-Sale Securities $m",)
 
-def compute_oci(df: pd.DataFrame, full: bool = False) -> float | pd.Series | None:
-    """Calculate Other Comprehensive Income (OCI)"""
-    if cols_exist_and_not_na(
-        df, ["Available-for-Sale Securities $m", "Held-to-Maturity Securities $m"]
-    ):
-        oci = (
+
+def compute_oci(df: pd.DataFrame) -> pd.Series | None:
+    """Calculate Other Comprehensive Income (OCI), built once per bank and shared by both ratios"""
+    return shared(df, "oci", lambda: _compute_oci(df))
+
+
+def _compute_oci(df: pd.DataFrame) -> pd.Series | None:
+    if cols_exist_and_not_na(df, OCI_COLUMNS):
+        return (
             df["Available-for-Sale Securities $m"]
             + df["Held-to-Maturity Securities $m"]
         )
-        if full:
-            return oci
-        return oci.mean()
-    else:
-        return proxy_oci(df, full=full)
+    return proxy_oci(df)
 
 
-def proxy_oci(df: pd.DataFrame, full: bool = False) -> float | pd.Series | None:
+def proxy_oci(df: pd.DataFrame) -> pd.Series | None:
     """Proxy for Other Comprehensive Income based on Available-for-Sale Securities"""
-    if cols_exist_and_not_na(df, ["Available-for-Sale Securities $m"]):
-        if full:
-            return df["Available-for-Sale Securities $m"]
-        return df["Available-for-Sale Securities $m"].mean()
+    if cols_exist_and_not_na(df, PROXY_OCI_COLUMNS):
+        return df["Available-for-Sale Securities $m"]
     return None
 
 
-def compute_oci_based_unrealized_losses_to_equity(df: pd.DataFrame) -> dict | None:
+def _oci_ratio(df: pd.DataFrame, denominator_col: str) -> dict:
+    """OCI divided by a balance-sheet column; the proxy OCI is already used inside compute_oci."""
+    oci = compute_oci(df)
+    if oci is not None and cols_exist_and_not_na(df, [denominator_col]):
+        return indicator_result(oci / nonzero(df, denominator_col), "direct")
+    return indicator_result(None, "proxy")
+
+
+def compute_oci_based_unrealized_losses_to_equity(df: pd.DataFrame) -> dict:
     """OCI-based Unrealized Losses to Equity"""
-    result = {}
-    oci_full = compute_oci(df, full=True)
-    oci_mean = compute_oci(df, full=False)
-
-    if oci_mean is not None and cols_exist_and_not_na(df, ["Total Equity $m"]):
-        indicator_full = oci_full / df["Total Equity $m"].replace(0, np.nan)
-        result["indicator_full"] = indicator_full
-        result["indicator"] = indicator_full.mean()
-        result["quality"] = "direct"
-    else:
-        proxy_full = proxy_oci(df, full=True)
-        if proxy_full is not None and cols_exist_and_not_na(df, ["Total Equity $m"]):
-            indicator_full = proxy_full / df["Total Equity $m"].replace(0, np.nan)
-            result["indicator_full"] = indicator_full
-            result["indicator"] = indicator_full.mean()
-            result["quality"] = "proxy"
-        else:
-            result["indicator_full"] = None
-            result["indicator"] = None
-            result["quality"] = "proxy"
-
-    return result
-
-
-def compute_oci_based_unrealized_losses_to_assets(df: pd.DataFrame) -> dict | None:
+    return _oci_ratio(df, "Total Equity $m")
+
+
+def compute_oci_based_unrealized_losses_to_assets(df: pd.DataFrame) -> dict:
     """OCI-based Unrealized Losses to Assets"""
-    result = {}
-    oci_full = compute_oci(df, full=True)
-    oci_mean = compute_oci(df, full=False)
-
-    if oci_mean is not None and cols_exist_and_not_na(df, ["Total Assets $m"]):
-        indicator_full = oci_full / df["Total Assets $m"].replace(0, np.nan)
-        result["indicator_full"] = indicator_full
-        result["indicator"] = indicator_full.mean()
-        result["quality"] = "direct"
-    else:
-        proxy_full = proxy_oci(df, full=True)
-        if proxy_full is not None and cols_exist_and_not_na(df, ["Total Assets $m"]):
-            indicator_full = proxy_full / df["Total Assets $m"].replace(0, np.nan)
-            result["indicator_full"] = indicator_full
-            result["indicator"] = indicator_full.mean()
-            result["quality"] = "proxy"
-        else:
-            result["indicator_full"] = None
-            result["indicator"] = None
-            result["quality"] = "proxy"
-
-    return result
+    return _oci_ratio(df, "Total Assets $m")
+
+
+SPEC_TO_ASSETS = IndicatorSpec(
+    name="OCI_Based_Unrealized_Losses_to_Assets",
+    columns=OCI_COLUMNS + ("Total Assets $m",),
+    proxy_columns=PROXY_OCI_COLUMNS + ("Total Assets $m",),
+    compute=compute_oci_based_unrealized_losses_to_assets,
+)
+
+
+SPEC_TO_EQUITY = IndicatorSpec(
+    name="OCI_Based_Unrealized_Losses_to_Equity",
+    columns=OCI_COLUMNS + ("Total Equity $m",),
+    proxy_columns=PROXY_OCI_COLUMNS + ("Total Equity $m",),
+    compute=compute_oci_based_unrealized_losses_to_equity,
+)
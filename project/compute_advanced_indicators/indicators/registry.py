@@ -0,0 +1,76 @@
+"""
+Registry of all indicators computed for a bank, in report order.
+
+Each indicator module declares an IndicatorSpec; the engine iterates over INDICATORS
+instead of calling every compute_* function by hand.
+"""
+
+import pandas as pd
+
+from project.compute_advanced_indicators.instrumentation import stage
+from project.compute_advanced_indicators.utils import frame_memo
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+from project.compute_advanced_indicators.indicators import (
+    cash_shortage_proxy,
+    core_deposit_mix_ratio,
+    core_deposit_stability,
+    cost_of_risk,
+    derivatives_exposure,
+    duration_gap,
+    fair_value_gains_losses,
+    fx_mismatch,
+    loan2deposit_ratio,
+    net_stable_funding_ratio,
+    non_recurring_income_ratio,
+    oci_based_unrealized_losses,
+    rwa_to_assets,
+)
+
+INDICATORS: list[IndicatorSpec] = [
+    cash_shortage_proxy.SPEC,
+    core_deposit_mix_ratio.SPEC,
+    duration_gap.SPEC,
+    fx_mismatch.SPEC,
+    loan2deposit_ratio.SPEC,
+    net_stable_funding_ratio.SPEC,
+    oci_based_unrealized_losses.SPEC_TO_ASSETS,
+    oci_based_unrealized_losses.SPEC_TO_EQUITY,
+    core_deposit_stability.SPEC,
+    cost_of_risk.SPEC,
+    derivatives_exposure.SPEC,
+    fair_value_gains_losses.SPEC,
+    non_recurring_income_ratio.SPEC,
+    rwa_to_assets.SPEC,
+]
+
+
+def required_columns(specs: list[IndicatorSpec] = INDICATORS) -> list[str]:
+    """Every source column read by the given indicators, in first-use order."""
+    columns = {}
+    for spec in specs:
+        columns.update(dict.fromkeys(spec.all_columns))
+    return list(columns)
+
+
+def compute_registered_indicators(
+    df: pd.DataFrame,
+    specs: list[IndicatorSpec] = INDICATORS,
+    available: dict[str, bool] | None = None,
+) -> tuple[dict, dict, dict]:
+    """
+    Run every registered indicator over a bank DataFrame.
+    Returns (indicators_full, indicators, quality) keyed by indicator name.
+    `available` optionally pre-seeds column availability instead of scanning df.
+    """
+    indicators_full = {}
+    indicators = {}
+    quality = {}
+    # Column checks, denominators and shared series (OCI) are memoised for this bank
+    with frame_memo(df, available):
+        for spec in specs:
+            with stage(f"indicator:{spec.name}"):
+                indicator_data = spec.compute(df)
+            indicators_full[spec.name] = indicator_data["indicator_full"]
+            indicators[spec.name] = indicator_data["indicator"]
+            quality[spec.name] = indicator_data["quality"]
+    return indicators_full, indicators, quality
@@ -1,41 +1,33 @@
 import pandas as pd
-import numpy as np
-from project.compute_advanced_indicators.utils import cols_exist_and_not_na
+from project.compute_advanced_indicators.utils import (
+    cols_exist_and_not_na,
+    indicator_result,
+    nonzero,
+)
+from project.compute_advanced_indicators.indicators.spec import IndicatorSpec
+
+COLUMNS = ("Total Risk-Weighted Assets $m", "Total Assets $m")
+PROXY_COLUMNS = ("Credit Risk-Weighted Assets $m", "Total Assets $m")
 
 
 def compute_rwa_to_assets(df: pd.DataFrame) -> dict:
     """Compute RWA to Total Assets Ratio"""
-    result = {}
-    cols = ["Total Risk-Weighted Assets $m", "Total Assets $m"]
-
-    if cols_exist_and_not_na(df, cols):
-        indicator_full = df[cols[0]] / df[cols[1]].replace(0, np.nan)
-        result["indicator_full"] = indicator_full
-        result["indicator"] = indicator_full.mean()
-        result["quality"] = "direct"
-    else:
-        proxy_full = proxy_rwa_to_assets(df, full=True)
-        if proxy_full is not None:
-            result["indicator_full"] = proxy_full
-            result["indicator"] = proxy_full.mean()
-            result["quality"] = "proxy"
-        else:
-            result["indicator_full"] = None
-            result["indicator"] = None
-            result["quality"] = "proxy"
-
-    return result
+    if cols_exist_and_not_na(df, COLUMNS):
+        indicator_full = df[COLUMNS[0]] / nonzero(df, COLUMNS[1])
+        return indicator_result(indicator_full, "direct")
+    return indicator_result(proxy_rwa_to_assets(df), "proxy")
 
 
-def proxy_rwa_to_assets(
-    df: pd.DataFrame, full: bool = False
-) -> float | pd.Series | None:
+def proxy_rwa_to_assets(df: pd.DataFrame) -> pd.Series | None:
     """Proxy: Use Credit RWA instead of Total RWA"""
-    cols = ["Credit Risk-Weighted Assets $m", "Total Assets $m"]
-
-    if cols_exist_and_not_na(df, cols):
-        proxy = df[cols[0]] / df[cols[1]].replace(0, np.nan)
-        if full:
-            return proxy
-        return proxy.mean()
+    if cols_exist_and_not_na(df, PROXY_COLUMNS):
+        return df[PROXY_COLUMNS[0]] / nonzero(df, PROXY_COLUMNS[1])
     return None
+
+
+SPEC = IndicatorSpec(
+    name="RWA_to_Assets",
+    columns=COLUMNS,
+    proxy_columns=PROXY_COLUMNS,
+    compute=compute_rwa_to_assets,
+)
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Callable
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    Declarative description of an indicator.
+
+    name: key used in the JSON report, the table and THRESHOLDS.
+    columns: source columns required for the direct calculation.
+    proxy_columns: source columns used by the proxy fallback (empty if there is none).
+    compute: function returning {"indicator_full", "indicator", "quality"} for a bank.
+    """
+
+    name: str
+    columns: tuple[str, ...]
+    proxy_columns: tuple[str, ...]
+    compute: Callable[[pd.DataFrame], dict]
+
+    @property
+    def all_columns(self) -> tuple[str, ...]:
+        """Every source column the indicator may read."""
+        return tuple(dict.fromkeys(self.columns + self.proxy_columns))
@@ -0,0 +1,105 @@
+"""
+The registry must compute what every indicator computes on the whole bank file:
+reading only the declared columns may not change any result, and neither may the
+per-bank memo of column checks, denominators and shared series.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+)
+from project.compute_advanced_indicators.indicators.registry import (
+    INDICATORS,
+    compute_registered_indicators,
+    required_columns,
+)
+from project.compute_advanced_indicators.main import (
+    compute_advanced_indicators,
+    load_columns,
+)
+from project.compute_advanced_indicators.utils import _FRAME_MEMOS, read_bank_data
+
+
+def assert_same_indicator(actual: dict, expected: dict) -> None:
+    assert actual["quality"] == expected["quality"]
+    if expected["indicator_full"] is None:
+        assert actual["indicator_full"] is None
+    else:
+        pd.testing.assert_series_equal(
+            actual["indicator_full"], expected["indicator_full"]
+        )
+
+
+def test_required_columns_cover_every_indicator():
+    columns = set(required_columns())
+    for spec in INDICATORS:
+        assert set(spec.all_columns) <= columns, spec.name
+
+
+@pytest.mark.parametrize("file", BANK_FILES)
+def test_declared_columns_are_enough(file, bank_dir):
+    df = read_bank_data(os.path.join(bank_dir, file))
+    for spec in INDICATORS:
+        declared = df[[col for col in spec.all_columns if col in df.columns]]
+        assert_same_indicator(spec.compute(declared), spec.compute(df))
+
+
+def test_loaded_columns_match_baseline(bank_dir, baseline):
+    for file in BANK_FILES:
+        df = read_bank_data(
+            os.path.join(bank_dir, file), columns=load_columns(DATE_COL, BANK_NAME_COL)
+        )
+        result = compute_advanced_indicators(
+            df, source_file=file, date_col_name=DATE_COL, bank_name_col=BANK_NAME_COL
+        )
+        assert_same_result(result, baseline[file])
+
+
+def proxy_variants(df: pd.DataFrame):
+    """The bank as is, without any direct columns (proxies only) and with zero denominators."""
+    yield df
+    direct = df.copy()
+    for spec in INDICATORS:
+        for col in spec.columns:
+            if col in direct.columns and spec.proxy_columns:
+                direct[col] = np.nan
+    yield direct
+    zeros = direct.copy()
+    for col in (
+        "Total Liabilities $m",
+        "Total Assets $m",
+        "Total Equity $m",
+        "Gross Total Deposits $m",
+    ):
+        if col in zeros.columns:
+            zeros.loc[zeros.index[::2], col] = 0
+    yield zeros
+
+
+@pytest.mark.parametrize("file", BANK_FILES)
+def test_memoised_registry_matches_unmemoised_indicators(file, bank_dir):
+    df = read_bank_data(os.path.join(bank_dir, file))
+    for variant in proxy_variants(df):
+        indicators_full, indicators, quality = compute_registered_indicators(variant)
+        assert not _FRAME_MEMOS
+        for spec in INDICATORS:
+            # Without an active memo every helper recomputes from the frame
+            expected = spec.compute(variant)
+            assert_same_indicator(
+                {
+                    "indicator_full": indicators_full[spec.name],
+                    "quality": quality[spec.name],
+                },
+                expected,
+            )
+            assert indicators[spec.name] == expected["indicator"] or (
+                pd.isna(indicators[spec.name]) and pd.isna(expected["indicator"])
+            )
@@ -0,0 +1,242 @@
+"""
+Opt-in per-stage instrumentation of a run.
+
+- `stage(name)` records wall time, CPU time, the current RSS of the process at the start
+  and end of a block and how much the block raised the process' peak RSS (ru_maxrss is a
+  lifetime high-water mark, so only its growth during the block is attributed to it).
+  Stages nest; the bank of the enclosing stage is inherited by nested stages.
+- Memory is measured on Unix only: the current RSS needs /proc (Linux) and the peak
+  growth needs the `resource` module; elsewhere these fields are null.
+- Events are appended to one JSON Lines file per process in a spool directory, so
+  worker processes report without sending anything back to the main process.
+- At the end of the run the events are aggregated into run_report.json (percentiles
+  across banks per stage) and optionally a Chrome trace (chrome://tracing, Perfetto).
+
+When instrumentation is disabled, `stage` does nothing.
+"""
+
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_spool_dir: str | None = None
+_spool_file = None
+_banks: list = []
+
+
+def enable(spool_dir: str) -> None:
+    """Start recording events of this process to spool_dir (also used as pool initializer)."""
+    global _spool_dir, _spool_file
+    os.makedirs(spool_dir, exist_ok=True)
+    _spool_dir = spool_dir
+    _spool_file = None
+
+
+def disable() -> None:
+    global _spool_dir, _spool_file
+    if _spool_file is not None:
+        _spool_file.close()
+    _spool_dir = None
+    _spool_file = None
+
+
+def spool_dir() -> str | None:
+    """Spool directory of the enabled instrumentation, or None."""
+    return _spool_dir
+
+
+def _rss_kb() -> int | None:
+    """Current resident set size of the process, or None without /proc."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _max_rss_kb() -> int | None:
+    """High-water mark of the process RSS since it started, or None without resource."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _max_mb(values) -> float | None:
+    values = [value for value in values if value is not None]
+    return max(values) / 1024 if values else None
+
+
+def _write(event: dict) -> None:
+    global _spool_file
+    if _spool_file is None:
+        path = os.path.join(_spool_dir, f"events-{os.getpid()}.jsonl")
+        # Line-buffered so events survive worker processes exiting without cleanup
+        _spool_file = open(path, "a", encoding="utf-8", buffering=1)
+    _spool_file.write(json.dumps(event, default=str) + "\n")
+
+
+@contextmanager
+def stage(name: str, bank=None):
+    """Record one stage; `bank` labels it and every nested stage."""
+    if _spool_dir is None:
+        yield
+        return
+
+    if bank is None and _banks:
+        bank = _banks[-1]
+    _banks.append(bank)
+    start_rss = _rss_kb()
+    start_max_rss = _max_rss_kb()
+    start_ns = time.perf_counter_ns()
+    start_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        wall_s = (time.perf_counter_ns() - start_ns) / 1e9
+        cpu_s = time.process_time() - start_cpu
+        end_max_rss = _max_rss_kb()
+        _banks.pop()
+        _write(
+            {
+                "stage": name,
+                "bank": bank,
+                "ts_us": start_ns // 1000,
+                "wall_s": wall_s,
+                "cpu_s": cpu_s,
+                "rss_start_kb": start_rss,
+                "rss_end_kb": _rss_kb(),
+                "peak_growth_kb": (
+                    None if start_max_rss is None else end_max_rss - start_max_rss
+                ),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+
+
+def collect_events(spool_dir: str) -> list[dict]:
+    """Read the events written by every process, ordered by start time."""
+    events = []
+    for path in glob.glob(os.path.join(spool_dir, "events-*.jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    events.sort(key=lambda event: event["ts_us"])
+    return events
+
+
+def _distribution(values: np.ndarray) -> dict:
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "total": float(values.sum()),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+def build_report(events: list[dict]) -> dict:
+    """
+    Aggregate events per stage: count, wall and CPU time distributions across
+    occurrences (one per bank for per-bank stages), the highest RSS at the end of an
+    occurrence and the largest growth of the process peak RSS during one occurrence.
+    The slowest banks of every stage are listed for quick triage.
+    """
+    by_stage = {}
+    for event in events:
+        by_stage.setdefault(event["stage"], []).append(event)
+
+    stages = {}
+    for name, stage_events in by_stage.items():
+        wall = np.array([event["wall_s"] for event in stage_events])
+        cpu = np.array([event["cpu_s"] for event in stage_events])
+        slowest = sorted(stage_events, key=lambda event: event["wall_s"], reverse=True)
+        stages[name] = {
+            "count": len(stage_events),
+            "wall_s": _distribution(wall),
+            "cpu_s": _distribution(cpu),
+            "rss_mb": _max_mb(event["rss_end_kb"] for event in stage_events),
+            "peak_growth_mb": _max_mb(
+                event["peak_growth_kb"] for event in stage_events
+            ),
+            "slowest": [
+                {"bank": event["bank"], "wall_s": event["wall_s"]}
+                for event in slowest[:5]
+                if event["bank"] is not None
+            ],
+        }
+
+    if events:
+        start = min(event["ts_us"] for event in events)
+        end = max(event["ts_us"] + event["wall_s"] * 1e6 for event in events)
+        elapsed = (end - start) / 1e6
+    else:
+        elapsed = 0.0
+    return {
+        "elapsed_s": elapsed,
+        "processes": len({event["pid"] for event in events}),
+        "stages": dict(
+            sorted(stages.items(), key=lambda item: -item[1]["wall_s"]["total"])
+        ),
+    }
+
+
+def write_chrome_trace(events: list[dict], path: str) -> None:
+    """Chrome trace event file: one complete ('X') event per stage."""
+    start = min((event["ts_us"] for event in events), default=0)
+    trace = [
+        {
+            "name": event["stage"],
+            "cat": "stage",
+            "ph": "X",
+            "ts": event["ts_us"] - start,
+            "dur": event["wall_s"] * 1e6,
+            "pid": event["pid"],
+            "tid": event["tid"],
+            "args": {
+                "bank": event["bank"],
+                "cpu_s": event["cpu_s"],
+                "rss_start_kb": event["rss_start_kb"],
+                "rss_end_kb": event["rss_end_kb"],
+                "peak_growth_kb": event["peak_growth_kb"],
+            },
+        }
+        for event in events
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, default=str)
+
+
+def write_run_report(
+    spool_dir: str, output_dir: str, chrome_trace: bool = False
+) -> dict:
+    """Aggregate the spooled events into run_report.json (and trace.json)."""
+    events = collect_events(spool_dir)
+    report = build_report(events)
+    with open(os.path.join(output_dir, "run_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, ensure_ascii=False, default=str)
+    if chrome_trace:
+        write_chrome_trace(events, os.path.join(output_dir, "trace.json"))
+    return report
+
+
+def pool_options() -> dict:
+    """ProcessPoolExecutor arguments that enable the same instrumentation in workers."""
+    if _spool_dir is None:
+        return {}
+    return {"initializer": enable, "initargs": (_spool_dir,)}
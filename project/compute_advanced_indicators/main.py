@@ -1,69 +1,68 @@
 """Compute advanced financial indicators for banks."""
 
 import os
-import sys
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 
 from rich.console import Console
 from rich.progress import track
 import pandas as pd
-import argparse
 from project.compute_advanced_indicators.build_stresstest_rules import (
     build_stresstest_rules,
 )
 from project.compute_advanced_indicators.build_correlation_matrix import (
     build_and_save_correlation_matrix,
 )
-from project.compute_advanced_indicators.utils import (
-    save_json,
-    read_bank_data,
-    save_bank_indicators_to_table,
-    detect_flags,
-    create_summary,
-)
-from project.compute_advanced_indicators.indicators.cash_shortage_proxy import (
-    compute_cash_shortage_proxy,
-)
-from project.compute_advanced_indicators.indicators.core_deposit_mix_ratio import (
-    compute_core_deposit_mix_ratio,
-)
-from project.compute_advanced_indicators.indicators.duration_gap import (
-    compute_duration_gap,
+from project.compute_advanced_indicators.instrumentation import (
+    disable as disable_instrumentation,
+    enable as enable_instrumentation,
+    pool_options,
+    stage,
+    write_run_report,
 )
-from project.compute_advanced_indicators.indicators.fx_mismatch import (
-    compute_fx_mismatch,
+from project.compute_advanced_indicators.manifest import (
+    input_digests,
+    is_up_to_date,
+    load_bank_indicators,
+    load_manifest,
+    manifest_entry,
+    output_paths,
+    pipeline_version,
+    save_manifest,
 )
-from project.compute_advanced_indicators.indicators.loan2deposit_ratio import (
-    compute_loan_to_deposit_ratio,
+from project.compute_advanced_indicators.output_store import SQLiteStore
+from project.compute_advanced_indicators.panel import compute_panel_indicators
+from project.compute_advanced_indicators.peer_analytics import (
+    build_and_save_peer_analytics,
 )
-from project.compute_advanced_indicators.indicators.net_stable_funding_ratio import (
-    compute_net_stable_funding_ratio,
+from project.compute_advanced_indicators.render_heatmaps import render_heatmaps
+from project.compute_advanced_indicators.streaming import (
+    BankKeys,
+    iter_bank_frames,
 )
-from project.compute_advanced_indicators.indicators.oci_based_unrealized_losses import (
-    compute_oci_based_unrealized_losses_to_assets,
-    compute_oci_based_unrealized_losses_to_equity,
+from project.compute_advanced_indicators.table_writer import (
+    BankTableWriter,
+    export_table_to_excel,
 )
-from project.compute_advanced_indicators.indicators.core_deposit_stability import (
-    compute_core_deposit_stability,
-)
-from project.compute_advanced_indicators.indicators.cost_of_risk import (
-    compute_cost_of_risk,
-)
-from project.compute_advanced_indicators.indicators.derivatives_exposure import (
-    compute_derivatives_exposure,
-)
-from project.compute_advanced_indicators.indicators.fair_value_gains_losses import (
-    compute_fair_value_gains_losses,
-)
-from project.compute_advanced_indicators.indicators.non_recurring_income_ratio import (
-    compute_non_recurring_income_ratio,
+from project.compute_advanced_indicators.utils import (
+    ranking_key,
+    TopKRanker,
+    save_json,
+    jsonl_line,
+    read_bank_data,
+    build_bank_result,
+    create_summary,
 )
-from project.compute_advanced_indicators.indicators.rwa_to_assets import (
-    compute_rwa_to_assets,
+from project.compute_advanced_indicators.indicators.registry import (
+    compute_registered_indicators,
+    required_columns,
 )
 
-
 console = Console()
 
 
@@ -78,116 +77,9 @@ def compute_advanced_indicators(
     Compute financial indicators and return structured JSON for a bank.
     Automatically detects period based on available date columns or index.
     """
-    indicators_full = {}
-    indicators = {}
-    quality = {}
-
-    # Compute indicators
-
-    # 1. Cash Shortage Proxy
-    indicator_data = compute_cash_shortage_proxy(df)
-    indicators_full["Cash_Shortage_Proxy"] = indicator_data["indicator_full"]
-    indicators["Cash_Shortage_Proxy"] = indicator_data["indicator"]
-    quality["Cash_Shortage_Proxy"] = indicator_data["quality"]
-
-    # 2. Core Deposit Mix Ratio
-    indicator_data = compute_core_deposit_mix_ratio(df)
-    indicators_full["Core_Deposit_Mix_Ratio"] = indicator_data["indicator_full"]
-    indicators["Core_Deposit_Mix_Ratio"] = indicator_data["indicator"]
-    quality["Core_Deposit_Mix_Ratio"] = indicator_data["quality"]
-
-    # 3. Duration Gap
-    indicator_data = compute_duration_gap(df)
-    indicators_full["Duration_Gap"] = indicator_data["indicator_full"]
-    indicators["Duration_Gap"] = indicator_data["indicator"]
-    quality["Duration_Gap"] = indicator_data["quality"]
-
-    # 4. FX Mismatch
-    indicator_data = compute_fx_mismatch(df)
-    indicators_full["FX_Mismatch"] = indicator_data["indicator_full"]
-    indicators["FX_Mismatch"] = indicator_data["indicator"]
-    quality["FX_Mismatch"] = indicator_data["quality"]
-
-    # 5. Loan to Deposit Ratio
-    indicator_data = compute_loan_to_deposit_ratio(df)
-    indicators_full["Loan_to_Deposit_Ratio"] = indicator_data["indicator_full"]
-    indicators["Loan_to_Deposit_Ratio"] = indicator_data["indicator"]
-    quality["Loan_to_Deposit_Ratio"] = indicator_data["quality"]
-
-    # 6. Net Stable Funding Ratio
-    indicator_data = compute_net_stable_funding_ratio(df)
-    indicators_full["Net_Stable_Funding_Ratio"] = indicator_data["indicator_full"]
-    indicators["Net_Stable_Funding_Ratio"] = indicator_data["indicator"]
-    quality["Net_Stable_Funding_Ratio"] = indicator_data["quality"]
-
-    # 7. OCI Based Unrealized Losses
-    oci_unrealized_losses_assets = compute_oci_based_unrealized_losses_to_assets(df)
-    indicators_full["OCI_Based_Unrealized_Losses_to_Assets"] = (
-        oci_unrealized_losses_assets["indicator_full"]
-    )
-    indicators["OCI_Based_Unrealized_Losses_to_Assets"] = oci_unrealized_losses_assets[
-        "indicator"
-    ]
-    quality["OCI_Based_Unrealized_Losses_to_Assets"] = oci_unrealized_losses_assets[
-        "quality"
-    ]
-
-    oci_unrealized_losses_equity = compute_oci_based_unrealized_losses_to_equity(df)
-    indicators_full["OCI_Based_Unrealized_Losses_to_Equity"] = (
-        oci_unrealized_losses_equity["indicator_full"]
-    )
-    indicators["OCI_Based_Unrealized_Losses_to_Equity"] = oci_unrealized_losses_equity[
-        "indicator"
-    ]
-    quality["OCI_Based_Unrealized_Losses_to_Equity"] = oci_unrealized_losses_equity[
-        "quality"
-    ]
-
-    # 8. Core Deposit Stability
-    indicator_data = compute_core_deposit_stability(df)
-    indicators_full["Core_Deposit_Stability"] = indicator_data["indicator_full"]
-    indicators["Core_Deposit_Stability"] = indicator_data["indicator"]
-    quality["Core_Deposit_Stability"] = indicator_data["quality"]
-
-    # 9. Cost of Risk
-    indicator_data = compute_cost_of_risk(df)
-    indicators_full["Cost_of_Risk"] = indicator_data["indicator_full"]
-    indicators["Cost_of_Risk"] = indicator_data["indicator"]
-    quality["Cost_of_Risk"] = indicator_data["quality"]
-
-    # 10. Derivatives Exposure
-    indicator_data = compute_derivatives_exposure(df)
-    indicators_full["Derivatives_Exposure"] = indicator_data["indicator_full"]
-    indicators["Derivatives_Exposure"] = indicator_data["indicator"]
-    quality["Derivatives_Exposure"] = indicator_data["quality"]
-
-    # 11. Fair Value Gains/Losses
-    indicator_data = compute_fair_value_gains_losses(df)
-    indicators_full["Fair_Value_Gains_Losses"] = indicator_data["indicator_full"]
-    indicators["Fair_Value_Gains_Losses"] = indicator_data["indicator"]
-    quality["Fair_Value_Gains_Losses"] = indicator_data["quality"]
-
-    # 12. Non-Recurring Income Ratio
-    indicator_data = compute_non_recurring_income_ratio(df)
-    indicators_full["Non_Recurring_Income_Ratio"] = indicator_data["indicator_full"]
-    indicators["Non_Recurring_Income_Ratio"] = indicator_data["indicator"]
-    quality["Non_Recurring_Income_Ratio"] = indicator_data["quality"]
-
-    # 13. RWA to Assets
-    indicator_data = compute_rwa_to_assets(df)
-    indicators_full["RWA_to_Assets"] = indicator_data["indicator_full"]
-    indicators["RWA_to_Assets"] = indicator_data["indicator"]
-    quality["RWA_to_Assets"] = indicator_data["quality"]
-
-    for key, value in indicators_full.items():
-        if value is not None:
-            if value.empty:
-                indicators_full[key] = None
-
-    indicators = {k: round(v, 2) for k, v in indicators.items()}
-
-    # Flags detection
-    flags = detect_flags(indicators)
+    # Compute indicators (see indicators/registry.py for the list and order)
+    with stage("indicators"):
+        indicators_full, indicators, quality = compute_registered_indicators(df)
 
     # Period detection
     if date_col_name is not None and date_col_name in df.columns:
@@ -203,86 +95,593 @@ def compute_advanced_indicators(
         period = None
 
     # Get the bank name
-    if bank_name_col is not None:
+    if bank_name_col is not None and not df.empty:
         bank_name = df.iloc[0][bank_name_col]
     else:
         bank_name = None
 
-    return {
-        "meta": {
-            "bank_name": bank_name,
-            "period": period,
-            "source_file": source_file,
-        },
-        "indicators_full": indicators_full,
-        "indicators": indicators,
-        "quality": quality,
-        "flags": flags,
+    meta = {
+        "bank_name": bank_name,
+        "period": period,
+        "source_file": source_file,
     }
+    return build_bank_result(meta, indicators_full, indicators, quality)
 
 
-def main(
+def load_columns(date_col_name: str = None, bank_name_col: str = None) -> list[str]:
+    """Only the columns used by the indicators, the period and the bank name are loaded."""
+    return required_columns() + [
+        col for col in (date_col_name, bank_name_col) if col is not None
+    ]
+
+
+def save_bank_outputs(
+    bank_indicators: dict,
+    output_dir: str,
+    file: str,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+    json_format: str = "pretty",
+    bank_files: bool = True,
+) -> dict:
+    """
+    Write the correlation matrix, stress-test rules and indicators JSON of a bank.
+    Nothing is written when bank_files is False (outputs go to the consolidated store).
+    The matrix and rules are kept in the result under "outputs" so that the store
+    does not build them again.
+    """
+    if not bank_files:
+        return bank_indicators
+    output_file = output_paths(output_dir, file)["indicators"]
+    file = file.replace(".csv", "").replace(".xlsx", "")
+    with stage("correlation"):
+        corr = build_and_save_correlation_matrix(
+            bank_indicators,
+            f"{output_dir}/correlation_matrices",
+            file,
+            corr_format=corr_format,
+            heatmap=heatmap,
+        )
+    with stage("rules"):
+        rules = build_stresstest_rules(
+            bank_indicators, f"{output_dir}/stresstest_rules", file
+        )
+    with stage("json"):
+        save_json(bank_indicators, output_file, json_format)
+    bank_indicators["outputs"] = {"corr": corr, "rules": rules}
+    return bank_indicators
+
+
+def process_bank_file(
+    file: str,
     input_dir: str,
     output_dir: str,
-    bank_indicators_table: str = "bank_indicators_table.xlsx",
     date_col_name: str = None,
     bank_name_col: str = None,
-):
-
-    os.makedirs(output_dir, exist_ok=True)
-
-    result_bank_indicators = []
-    for file in track(os.listdir(input_dir), description="Processing bank data..."):
-        df = read_bank_data(os.path.join(input_dir, file))
+    use_cache: bool = False,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+    json_format: str = "pretty",
+    bank_files: bool = True,
+) -> dict:
+    """
+    Run the full per-bank pipeline for one input file and return its indicators.
+    Kept at module level so it can be shipped to worker processes.
+    """
+    with stage("bank", bank=file):
+        with stage("read"):
+            df = read_bank_data(
+                os.path.join(input_dir, file),
+                use_cache=use_cache,
+                columns=load_columns(date_col_name, bank_name_col),
+            )
         bank_indicators = compute_advanced_indicators(
             df,
             source_file=file,
             date_col_name=date_col_name,
             bank_name_col=bank_name_col,
         )
-        result_bank_indicators.append(bank_indicators)
-
-        file = file.replace(".csv", "").replace(".xlsx", "")
-        output_file = os.path.join(output_dir, f"{file}_indicators.json")
-        build_and_save_correlation_matrix(
-            bank_indicators, f"{output_dir}/correlation_matrices", file
+        return save_bank_outputs(
+            bank_indicators,
+            output_dir,
+            file,
+            corr_format,
+            heatmap,
+            json_format,
+            bank_files,
         )
-        build_stresstest_rules(bank_indicators, f"{output_dir}/stresstest_rules", file)
-        save_json(bank_indicators, output_file)
 
-    save_bank_indicators_to_table(
-        result_bank_indicators, f"{output_dir}/{bank_indicators_table}"
-    )
-    create_summary(result_bank_indicators, output_dir, console)
 
+def process_bank_frame(
+    bank_name,
+    df: pd.DataFrame,
+    file_key: str,
+    source_file: str,
+    output_dir: str,
+    date_col_name: str = None,
+    bank_name_col: str = None,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+    json_format: str = "pretty",
+    bank_files: bool = True,
+) -> dict:
+    """Run the per-bank pipeline for a bank streamed out of a multi-bank CSV."""
+    with stage("bank", bank=bank_name):
+        bank_indicators = compute_advanced_indicators(
+            df,
+            source_file=source_file,
+            date_col_name=date_col_name,
+            bank_name_col=bank_name_col,
+        )
+        return save_bank_outputs(
+            bank_indicators,
+            output_dir,
+            file_key,
+            corr_format,
+            heatmap,
+            json_format,
+            bank_files,
+        )
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="Compute advanced financial indicators for banks."
-    )
-    parser.add_argument(
-        "--input_dir",
-        required=True,
-        help="Path to the input directory containing bank data files.",
+
+def process_stream(
+    input_file: str,
+    output_dir: str,
+    date_col_name: str = None,
+    bank_name_col: str = None,
+    workers: int = 1,
+    chunksize: int = 100_000,
+    presorted: bool = True,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+    json_format: str = "pretty",
+    bank_files: bool = True,
+    bank_keys: BankKeys | None = None,
+) -> Iterator[dict]:
+    """
+    Streaming mode: split one large CSV into banks chunk by chunk and process
+    each bank as soon as all its rows have been read. Results are yielded in input order.
+    Output file keys are issued by bank_keys (in this process, so they stay unique).
+    """
+    bank_keys = bank_keys or BankKeys()
+    frames = iter_bank_frames(
+        input_file,
+        bank_name_col,
+        chunksize=chunksize,
+        presorted=presorted,
+        columns=load_columns(date_col_name, bank_name_col),
     )
-    parser.add_argument(
-        "--output_dir",
-        required=True,
-        help="Path to the output directory to save results.",
+    process = partial(
+        process_bank_frame,
+        source_file=os.path.basename(input_file),
+        output_dir=output_dir,
+        date_col_name=date_col_name,
+        bank_name_col=bank_name_col,
+        corr_format=corr_format,
+        heatmap=heatmap,
+        json_format=json_format,
+        bank_files=bank_files,
     )
-    parser.add_argument(
-        "--date_col_name", help="Name of the date column in the bank data files."
+
+    if workers <= 1:
+        for bank_name, df in track(frames, description="Processing bank data..."):
+            yield process(bank_name, df, bank_keys.key(bank_name))
+        return
+
+    # Keep only a few banks in flight so memory stays bounded by the largest banks
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, **pool_options()) as executor:
+        for bank_name, df in track(frames, description="Processing bank data..."):
+            pending.append(
+                executor.submit(process, bank_name, df, bank_keys.key(bank_name))
+            )
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        for future in pending:
+            yield future.result()
+
+
+def process_panel(
+    files: list[str],
+    input_dir: str,
+    output_dir: str,
+    date_col_name: str = None,
+    bank_name_col: str = None,
+    use_cache: bool = False,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+    json_format: str = "pretty",
+    bank_files: bool = True,
+) -> list[dict]:
+    """
+    Panel engine: read every bank, compute all indicators in one vectorised pass,
+    then write the per-bank outputs.
+    """
+    columns = load_columns(date_col_name, bank_name_col)
+    frames = {
+        file: read_bank_data(
+            os.path.join(input_dir, file), use_cache=use_cache, columns=columns
+        )
+        for file in track(files, description="Reading bank data...")
+    }
+    results = compute_panel_indicators(frames, date_col_name, bank_name_col)
+    return [
+        save_bank_outputs(
+            results[file],
+            output_dir,
+            file,
+            corr_format,
+            heatmap,
+            json_format,
+            bank_files,
+        )
+        for file in track(files, description="Saving bank outputs...")
+    ]
+
+
+def bank_output_key(bank_indicators: dict, bank_keys: BankKeys | None = None) -> str:
+    """
+    Name of the per-bank outputs: the input file name, or the key of the bank name
+    issued by bank_keys when streamed.
+    """
+    meta = bank_indicators["meta"]
+    if bank_keys is not None:
+        return bank_keys.key(meta["bank_name"])
+    return meta["source_file"].replace(".csv", "").replace(".xlsx", "")
+
+
+def bank_store_key(bank_indicators: dict, bank_keys: BankKeys | None = None) -> str:
+    """
+    Key of a bank in the output store: the full input file name (so a.csv and a.xlsx
+    do not collide), or the bank's file key when streamed.
+    """
+    if bank_keys is not None:
+        return bank_output_key(bank_indicators, bank_keys)
+    return bank_indicators["meta"]["source_file"]
+
+
+def save_peer_rules(
+    result_bank_indicators: list[dict],
+    output_dir: str,
+    corr_format: str = "xlsx",
+    bank_keys: BankKeys | None = None,
+    bank_files: bool = True,
+) -> pd.DataFrame:
+    """
+    Build the cross-bank analytics once for the whole universe and rewrite every
+    bank's stress-test rules with peer-relative conditions. Returns the peer quantiles.
+    """
+    quantiles = build_and_save_peer_analytics(
+        result_bank_indicators, output_dir, corr_format
     )
-    parser.add_argument(
-        "--bank_name_col",
-        help="Name of the column containing bank names in the data files.",
+    if bank_files:
+        for bank_indicators in result_bank_indicators:
+            rules = build_stresstest_rules(
+                bank_indicators,
+                f"{output_dir}/stresstest_rules",
+                bank_output_key(bank_indicators, bank_keys),
+                quantiles,
+            )
+            if "outputs" in bank_indicators:
+                bank_indicators["outputs"]["rules"] = rules
+    return quantiles
+
+
+def save_to_store(
+    result_bank_indicators: list[dict],
+    store_path: str,
+    bank_keys: BankKeys | None = None,
+    peer_quantiles: pd.DataFrame | None = None,
+    settings: dict | None = None,
+) -> None:
+    """Write every bank's outputs to the consolidated SQLite store in batched transactions."""
+    with SQLiteStore(store_path, settings) as store:
+        for bank_indicators in track(
+            result_bank_indicators, description="Writing output store..."
+        ):
+            add_to_store(store, bank_indicators, bank_keys, peer_quantiles)
+
+
+def add_to_store(
+    store: SQLiteStore,
+    bank_indicators: dict,
+    bank_keys: BankKeys | None = None,
+    peer_quantiles: pd.DataFrame | None = None,
+) -> None:
+    """Buffer one bank in the store, reusing the matrix and rules built for its files."""
+    outputs = bank_indicators.get("outputs", {})
+    store.add_bank(
+        bank_store_key(bank_indicators, bank_keys),
+        bank_indicators,
+        corr=outputs.get("corr"),
+        rules=outputs.get("rules"),
+        peer_quantiles=peer_quantiles,
     )
 
-    args = parser.parse_args()
 
-    main(
-        input_dir=args.input_dir,
-        output_dir=args.output_dir,
-        date_col_name=args.date_col_name,
-        bank_name_col=args.bank_name_col,
+def merge_unchanged(
+    files: list[str],
+    stale_files: list[str],
+    computed: Iterable[dict],
+    output_dir: str,
+) -> Iterator[dict]:
+    """
+    Yield the result of every file in order: computed results of the stale files
+    (in the same order) and reloaded results of the unchanged ones.
+    """
+    stale = set(stale_files)
+    computed = iter(computed)
+    for file in files:
+        yield (
+            next(computed) if file in stale else load_bank_indicators(output_dir, file)
+        )
+
+
+def process_input_dir(
+    input_dir: str,
+    output_dir: str,
+    date_col_name: str = None,
+    bank_name_col: str = None,
+    workers: int = 1,
+    use_cache: bool = False,
+    incremental: bool = False,
+    engine: str = "bank",
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+    json_format: str = "pretty",
+    bank_files: bool = True,
+    peer_analytics: bool = False,
+) -> Iterator[dict]:
+    """
+    Process every bank file of input_dir and yield the results in sorted file order,
+    each one as soon as it is ready.
+    """
+    # Sorted so serial and parallel runs aggregate banks in the same order
+    files = sorted(os.listdir(input_dir))
+
+    # Incremental mode: only banks whose input, code or thresholds changed are recomputed
+    if incremental:
+        version = pipeline_version(
+            {
+                "date_col_name": date_col_name,
+                "bank_name_col": bank_name_col,
+                "corr_format": corr_format,
+                "heatmap": heatmap,
+                "json_format": json_format,
+                "peer_analytics": peer_analytics,
+            }
+        )
+        manifest = load_manifest(output_dir)
+        digests = input_digests(input_dir, files)
+        stale_files = [
+            file
+            for file in files
+            if not is_up_to_date(manifest, file, digests[file], version, output_dir)
+        ]
+    else:
+        stale_files = files
+
+    process = partial(
+        process_bank_file,
+        input_dir=input_dir,
+        output_dir=output_dir,
+        date_col_name=date_col_name,
+        bank_name_col=bank_name_col,
+        use_cache=use_cache,
+        corr_format=corr_format,
+        heatmap=heatmap,
+        json_format=json_format,
+        bank_files=bank_files,
     )
+
+    if engine == "panel":
+        computed = process_panel(
+            stale_files,
+            input_dir,
+            output_dir,
+            date_col_name=date_col_name,
+            bank_name_col=bank_name_col,
+            use_cache=use_cache,
+            corr_format=corr_format,
+            heatmap=heatmap,
+            json_format=json_format,
+            bank_files=bank_files,
+        )
+        yield from merge_unchanged(files, stale_files, computed, output_dir)
+    elif workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, **pool_options()) as executor:
+            # map() yields results in submission order as soon as they are ready
+            computed = track(
+                executor.map(process, stale_files),
+                total=len(stale_files),
+                description="Processing bank data...",
+            )
+            yield from merge_unchanged(files, stale_files, computed, output_dir)
+    else:
+        computed = (
+            process(file)
+            for file in track(stale_files, description="Processing bank data...")
+        )
+        yield from merge_unchanged(files, stale_files, computed, output_dir)
+
+    if incremental:
+        save_manifest(
+            output_dir,
+            {
+                "version": version,
+                "files": {
+                    file: manifest_entry(file, digests[file], output_dir, corr_format)
+                    for file in files
+                },
+            },
+        )
+        console.print(
+            f"Recomputed {len(stale_files)} of {len(files)} banks "
+            f"({len(files) - len(stale_files)} unchanged)."
+        )
+
+
+def main(
+    input_dir: str,
+    output_dir: str,
+    bank_indicators_table: str = None,
+    date_col_name: str = None,
+    bank_name_col: str = None,
+    workers: int = 1,
+    use_cache: bool = False,
+    incremental: bool = False,
+    engine: str = "bank",
+    input_file: str = None,
+    chunksize: int = 100_000,
+    presorted: bool = True,
+    corr_format: str = "xlsx",
+    heatmap: bool = True,
+    json_format: str = "pretty",
+    bank_files: bool = True,
+    defer_heatmaps: bool = False,
+    peer_analytics: bool = False,
+    top_k: int = 5,
+    rank_by: str = "flag_count",
+    jsonl: bool = False,
+    store: str = None,
+    table_format: str = "csv",
+    excel_export: bool = False,
+    instrument: bool = False,
+    chrome_trace: bool = False,
+):
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Per-stage timings are spooled by every process and aggregated after the run
+    spool = None
+    if instrument or chrome_trace:
+        spool = tempfile.mkdtemp(prefix="instrumentation-")
+        enable_instrumentation(spool)
+
+    try:
+        # Deferred heatmaps are rendered in a separate stage instead of being embedded per bank
+        embed_heatmap = heatmap and not defer_heatmaps
+
+        # Streamed banks are named after the bank: keys are issued once per run
+        bank_keys = BankKeys() if input_file is not None else None
+        if input_file is not None:
+            results = process_stream(
+                input_file,
+                output_dir,
+                date_col_name=date_col_name,
+                bank_name_col=bank_name_col,
+                workers=workers,
+                chunksize=chunksize,
+                presorted=presorted,
+                corr_format=corr_format,
+                heatmap=embed_heatmap,
+                json_format=json_format,
+                bank_files=bank_files,
+                bank_keys=bank_keys,
+            )
+        else:
+            results = process_input_dir(
+                input_dir,
+                output_dir,
+                date_col_name=date_col_name,
+                bank_name_col=bank_name_col,
+                workers=workers,
+                use_cache=use_cache,
+                incremental=incremental,
+                engine=engine,
+                corr_format=corr_format,
+                heatmap=embed_heatmap,
+                json_format=json_format,
+                bank_files=bank_files,
+                peer_analytics=peer_analytics,
+            )
+
+        if bank_indicators_table is None:
+            bank_indicators_table = f"bank_indicators_table.{table_format}"
+        table_file = f"{output_dir}/{bank_indicators_table}"
+        table_files = [table_file]
+        excel_file = f"{os.path.splitext(table_file)[0]}.xlsx"
+        if excel_export and not table_file.endswith((".csv", ".xlsx")):
+            table_files.append(excel_file)
+
+        # The table, the JSONL file, the top-k ranking and the store are fed one bank
+        # at a time as results arrive; only peer analytics needs every bank at once
+        # (and then the store waits for the peer quantiles)
+        store_settings = {"input": input_file or input_dir, "engine": engine}
+        stream_store = store is not None and not peer_analytics
+        result_bank_indicators = []
+        ranker = TopKRanker(top_k, ranking_key(rank_by))
+        with ExitStack() as sinks:
+            writers = [
+                sinks.enter_context(BankTableWriter(file)) for file in table_files
+            ]
+            jsonl_file = (
+                sinks.enter_context(open(f"{output_dir}/indicators.jsonl", "w"))
+                if jsonl
+                else None
+            )
+            bank_store = (
+                sinks.enter_context(SQLiteStore(store, store_settings))
+                if stream_store
+                else None
+            )
+            for bank_indicators in results:
+                for writer in writers:
+                    writer.add(bank_indicators)
+                if jsonl_file is not None:
+                    jsonl_file.write(jsonl_line(bank_indicators))
+                ranker.add(bank_indicators)
+                if bank_store is not None:
+                    add_to_store(bank_store, bank_indicators, bank_keys)
+                if peer_analytics:
+                    result_bank_indicators.append(bank_indicators)
+        if excel_export and table_file.endswith(".csv"):
+            with stage("excel_export"):
+                export_table_to_excel(table_file, excel_file)
+
+        quantiles = None
+        if peer_analytics:
+            with stage("peer_analytics"):
+                quantiles = save_peer_rules(
+                    result_bank_indicators,
+                    output_dir,
+                    corr_format,
+                    bank_keys=bank_keys,
+                    bank_files=bank_files,
+                )
+
+        if store is not None and not stream_store:
+            with stage("store"):
+                save_to_store(
+                    result_bank_indicators,
+                    store,
+                    bank_keys=bank_keys,
+                    peer_quantiles=quantiles,
+                    settings=store_settings,
+                )
+
+        with stage("summary"):
+            create_summary(ranker, output_dir, console)
+
+        if heatmap and defer_heatmaps:
+            # Incremental runs only rewrite the matrices of recomputed banks
+            with stage("render_heatmaps"):
+                pngs = render_heatmaps(
+                    f"{output_dir}/correlation_matrices",
+                    workers=workers,
+                    stale_only=incremental,
+                    corr_format=corr_format,
+                )
+            console.print(f"Rendered {len(pngs)} heatmaps.")
+
+    finally:
+        if spool is not None:
+            disable_instrumentation()
+            write_run_report(spool, output_dir, chrome_trace=chrome_trace)
+            shutil.rmtree(spool, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    from project.compute_advanced_indicators.cli import run
+
+    run()
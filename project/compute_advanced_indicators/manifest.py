@@ -0,0 +1,115 @@
+"""
+Run manifest for incremental recomputation.
+
+The manifest (manifest.json in the output directory) records, for every input file:
+- the SHA-256 of its content,
+- the pipeline version it was processed with (code + thresholds),
+- the output files written for it.
+
+A bank is reprocessed only when one of these no longer matches.
+"""
+
+import hashlib
+import json
+import os
+
+from project.compute_advanced_indicators.bank_data_cache import file_digest
+from project.compute_advanced_indicators.utils import THRESHOLDS
+
+MANIFEST_FILE = "manifest.json"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def is_test_file(name: str) -> bool:
+    return name == "conftest.py" or name.startswith("test_")
+
+
+def pipeline_version(settings: dict | None = None) -> str:
+    """
+    Hash of the package source code (tests excluded), risk thresholds and output settings.
+    Any change of these invalidates every manifest entry.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(THRESHOLDS, sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+    for root, dirs, files in os.walk(PACKAGE_DIR):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py") and not is_test_file(name):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, PACKAGE_DIR).encode("utf-8"))
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def output_paths(output_dir: str, file: str, corr_format: str = "xlsx") -> dict:
+    """Paths of every per-bank output produced for an input file."""
+    file = file.replace(".csv", "").replace(".xlsx", "")
+    return {
+        "indicators": os.path.join(output_dir, f"{file}_indicators.json"),
+        "correlation": os.path.join(
+            output_dir, "correlation_matrices", f"{file}_correlation.{corr_format}"
+        ),
+        "rules": os.path.join(output_dir, "stresstest_rules", f"{file}_rules.json"),
+    }
+
+
+def load_manifest(output_dir: str) -> dict:
+    """Load the manifest, or return an empty one if missing or unreadable."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": None, "files": {}}
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def save_manifest(output_dir: str, manifest: dict) -> None:
+    """Save the manifest atomically."""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def is_up_to_date(
+    manifest: dict, file: str, digest: str, version: str, output_dir: str
+) -> bool:
+    """Check whether the outputs recorded for a file are still valid."""
+    if manifest.get("version") != version:
+        return False
+    entry = manifest["files"].get(file)
+    if entry is None or entry.get("digest") != digest:
+        return False
+    return all(
+        os.path.exists(os.path.join(output_dir, path))
+        for path in entry.get("outputs", {}).values()
+    )
+
+
+def manifest_entry(
+    file: str, digest: str, output_dir: str, corr_format: str = "xlsx"
+) -> dict:
+    """Build the manifest record for a processed file (output paths relative to output_dir)."""
+    return {
+        "digest": digest,
+        "outputs": {
+            k: os.path.relpath(v, output_dir)
+            for k, v in output_paths(output_dir, file, corr_format).items()
+        },
+    }
+
+
+def input_digests(input_dir: str, files: list[str]) -> dict:
+    """Content digest of every input file."""
+    return {file: file_digest(os.path.join(input_dir, file)) for file in files}
+
+
+def load_bank_indicators(output_dir: str, file: str) -> dict:
+    """Reload the previously saved indicators JSON of a bank."""
+    with open(output_paths(output_dir, file)["indicators"], "r", encoding="utf-8") as f:
+        return json.load(f)
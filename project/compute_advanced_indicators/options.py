@@ -0,0 +1,18 @@
+"""
+Names of the output formats and summary rankings.
+
+Kept free of heavy imports so the command line can be parsed without loading the
+pipeline; the modules implementing them import the names from here.
+"""
+
+import importlib.util
+
+CORR_FORMATS = ("xlsx", "npz", "parquet", "json")
+JSON_FORMATS = ("pretty", "compact")
+TABLE_FORMATS = ("csv", "parquet", "xlsx")
+RANKINGS = ("flag_count", "severity")
+
+
+def parquet_available() -> bool:
+    """Whether pyarrow is installed (checked without importing it)."""
+    return importlib.util.find_spec("pyarrow") is not None
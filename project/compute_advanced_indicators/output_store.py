@@ -0,0 +1,250 @@
+"""
+Consolidated SQLite output store.
+
+Instead of three small files per bank, every run can be written to a single SQLite file
+with one indexed table per output:
+
+- runs:         one row per run (start time, settings)
+- banks:        bank meta (name, period, source file)
+- indicators:   aggregated value, quality and flag of every indicator
+- series:       the full indicator time series (one row per observation)
+- correlations: the Spearman matrix in long format (row, column, value)
+- rules:        the stress-test rules
+
+Rows are buffered and inserted with executemany, one transaction per batch of banks.
+Indexes are created after the bulk insert. If the run fails, every row of the run
+(including its `runs` row) is deleted in one transaction, so a truncated run never
+looks like a completed one.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from project.compute_advanced_indicators.build_correlation_matrix import (
+    build_correlation_matrix,
+)
+from project.compute_advanced_indicators.build_stresstest_rules import (
+    build_rules_from_bank_data,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS banks (
+    run_id INTEGER NOT NULL,
+    bank_key TEXT NOT NULL,
+    bank_name TEXT,
+    period TEXT,
+    source_file TEXT,
+    PRIMARY KEY (run_id, bank_key)
+);
+CREATE TABLE IF NOT EXISTS indicators (
+    run_id INTEGER NOT NULL,
+    bank_key TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    value REAL,
+    quality TEXT,
+    flag INTEGER,
+    PRIMARY KEY (run_id, bank_key, indicator)
+);
+CREATE TABLE IF NOT EXISTS series (
+    run_id INTEGER NOT NULL,
+    bank_key TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value REAL
+);
+CREATE TABLE IF NOT EXISTS correlations (
+    run_id INTEGER NOT NULL,
+    bank_key TEXT NOT NULL,
+    row_indicator TEXT NOT NULL,
+    col_indicator TEXT NOT NULL,
+    value REAL
+);
+CREATE TABLE IF NOT EXISTS rules (
+    run_id INTEGER NOT NULL,
+    bank_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    condition_warning TEXT,
+    condition_critical TEXT,
+    rationale TEXT,
+    peer_condition_warning TEXT,
+    peer_condition_critical TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_series_bank ON series (run_id, bank_key, indicator);
+CREATE INDEX IF NOT EXISTS idx_correlations_bank ON correlations (run_id, bank_key);
+CREATE INDEX IF NOT EXISTS idx_rules_bank ON rules (run_id, bank_key);
+CREATE INDEX IF NOT EXISTS idx_indicators_name ON indicators (run_id, indicator);
+"""
+
+TABLE_COLUMNS = {
+    "banks": 5,
+    "indicators": 6,
+    "series": 5,
+    "correlations": 5,
+    "rules": 8,
+}
+
+
+def _float_or_none(value):
+    return None if value is None or pd.isna(value) else float(value)
+
+
+class SQLiteStore:
+    """
+    Bulk writer for one run into a consolidated SQLite file.
+    Use as a context manager; pending rows are flushed and indexes built on exit.
+    """
+
+    def __init__(self, path: str, settings: dict | None = None, batch_size: int = 500):
+        self.path = path
+        self.settings = settings or {}
+        self.batch_size = batch_size
+        self.conn = None
+        self.run_id = None
+        self.pending = {table: [] for table in TABLE_COLUMNS}
+        self.pending_banks = 0
+
+    def __enter__(self) -> "SQLiteStore":
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, settings) VALUES (?, ?)",
+                (
+                    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    json.dumps(self.settings, sort_keys=True),
+                ),
+            )
+        self.run_id = cursor.lastrowid
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+                with self.conn:
+                    self.conn.executescript(INDEXES)
+            else:
+                self.discard()
+        finally:
+            self.conn.close()
+
+    def discard(self) -> None:
+        """Delete every row already committed for this run."""
+        self.pending = {table: [] for table in TABLE_COLUMNS}
+        self.pending_banks = 0
+        with self.conn:
+            for table in TABLE_COLUMNS:
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE run_id = ?", (self.run_id,)
+                )
+            self.conn.execute("DELETE FROM runs WHERE run_id = ?", (self.run_id,))
+
+    def add_bank(
+        self,
+        bank_key: str,
+        bank_data: dict,
+        corr: pd.DataFrame | None = None,
+        rules: list | None = None,
+        peer_quantiles: pd.DataFrame | None = None,
+    ) -> None:
+        """
+        Buffer every output of a bank. The correlation matrix and rules are built
+        from the bank result when not given.
+        """
+        if corr is None:
+            corr = build_correlation_matrix(bank_data)
+        if rules is None:
+            rules = build_rules_from_bank_data(bank_data, peer_quantiles)
+
+        run_id = self.run_id
+        meta = bank_data["meta"]
+        self.pending["banks"].append(
+            (
+                run_id,
+                bank_key,
+                None if meta.get("bank_name") is None else str(meta["bank_name"]),
+                meta.get("period"),
+                meta.get("source_file"),
+            )
+        )
+
+        for name, value in bank_data["indicators"].items():
+            flag = bank_data["flags"].get(name)
+            self.pending["indicators"].append(
+                (
+                    run_id,
+                    bank_key,
+                    name,
+                    _float_or_none(value),
+                    bank_data["quality"].get(name),
+                    None if flag is None else int(flag),
+                )
+            )
+
+        for name, values in bank_data["indicators_full"].items():
+            if values is None:
+                continue
+            values = np.asarray(values, dtype=float)
+            valid = np.flatnonzero(~np.isnan(values))
+            self.pending["series"].extend(
+                zip(
+                    [run_id] * len(valid),
+                    [bank_key] * len(valid),
+                    [name] * len(valid),
+                    valid.tolist(),
+                    values[valid].tolist(),
+                )
+            )
+
+        if not corr.empty:
+            long = corr.stack().dropna()
+            self.pending["correlations"].extend(
+                (run_id, bank_key, row, col, float(value))
+                for (row, col), value in long.items()
+            )
+
+        self.pending["rules"].extend(
+            (
+                run_id,
+                bank_key,
+                position,
+                rule["condition_warning"],
+                rule["condition_critical"],
+                rule["rationale"],
+                rule.get("peer_condition_warning"),
+                rule.get("peer_condition_critical"),
+            )
+            for position, rule in enumerate(rules)
+        )
+
+        self.pending_banks += 1
+        if self.pending_banks >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert all buffered rows in one transaction."""
+        if not self.pending_banks:
+            return
+        with self.conn:
+            for table, rows in self.pending.items():
+                if rows:
+                    placeholders = ", ".join("?" * TABLE_COLUMNS[table])
+                    self.conn.executemany(
+                        f"INSERT INTO {table} VALUES ({placeholders})", rows
+                    )
+        self.pending = {table: [] for table in TABLE_COLUMNS}
+        self.pending_banks = 0
@@ -0,0 +1,157 @@
+"""
+Panel engine: compute indicators for all banks in one vectorised pass.
+
+- All bank DataFrames are concatenated into one long panel keyed by source file.
+- Column availability is computed once per bank with a single groupby.
+- Banks sharing the same availability pick the same direct/proxy formulas, so every
+  indicator is evaluated once per availability group over all of its rows.
+- Aggregates and periods are derived with groupby, giving the same per-bank results
+  as `compute_advanced_indicators`.
+"""
+
+import numpy as np
+import pandas as pd
+
+from project.compute_advanced_indicators.indicators.registry import (
+    INDICATORS,
+    compute_registered_indicators,
+    required_columns,
+)
+from project.compute_advanced_indicators.utils import build_bank_result
+
+BANK_LEVEL = "source_file"
+
+
+def build_panel(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate bank DataFrames into one panel.
+    Index: (source_file, original row index), so each bank keeps its own row labels.
+    """
+    frames = {k: v for k, v in frames.items() if not v.empty}
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, names=[BANK_LEVEL, None])
+
+
+def column_availability(panel: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Boolean frame (bank x column): column exists and is not all NaN for the bank."""
+    banks = panel.index.unique(level=BANK_LEVEL)
+    present = [col for col in columns if col in panel.columns]
+    available = panel[present].notna().groupby(level=BANK_LEVEL, sort=False).any()
+    return available.reindex(index=banks, columns=columns, fill_value=False)
+
+
+def _bank_slices(index: pd.MultiIndex) -> dict[str, slice]:
+    """Positional slice of every bank; rows of a bank are contiguous in the panel."""
+    banks = index.get_level_values(BANK_LEVEL)
+    starts = np.flatnonzero(np.r_[True, banks[1:] != banks[:-1]])
+    stops = np.r_[starts[1:], len(banks)]
+    return {banks[start]: slice(start, stop) for start, stop in zip(starts, stops)}
+
+
+def _split_by_bank(series: pd.Series, slices: dict[str, slice]) -> dict[str, pd.Series]:
+    """Split a panel series into per-bank series with the original row index."""
+    values = series.to_numpy()
+    rows = series.index.get_level_values(-1)
+    return {
+        bank: pd.Series(values[sl], index=rows[sl], name=series.name, copy=False)
+        for bank, sl in slices.items()
+    }
+
+
+def _periods(panel: pd.DataFrame, date_col_name: str | None) -> dict:
+    """Period string per bank from the min/max of the date column."""
+    if date_col_name is None or date_col_name not in panel.columns:
+        return {}
+    dates = pd.to_datetime(panel[date_col_name]).groupby(level=BANK_LEVEL, sort=False)
+    min_dates, max_dates = dates.min(), dates.max()
+    periods = {}
+    for bank, min_date, max_date in zip(min_dates.index, min_dates, max_dates):
+        periods[bank] = (
+            f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}"
+            if pd.notna(min_date) and pd.notna(max_date)
+            else None
+        )
+    return periods
+
+
+def compute_panel_indicators(
+    frames: dict[str, pd.DataFrame],
+    date_col_name: str = None,
+    bank_name_col: str = None,
+) -> dict[str, dict]:
+    """
+    Compute indicators for every bank at once.
+    Returns {source_file: bank result} with the same structure as compute_advanced_indicators,
+    with an entry for every frame (banks without rows get all-None indicators).
+    """
+    panel = build_panel(frames)
+    if panel.empty:
+        return {bank: empty_bank_result(bank, frame) for bank, frame in frames.items()}
+
+    columns = required_columns(INDICATORS)
+    available = column_availability(panel, columns)
+
+    banks = list(available.index)
+    indicators_full = {bank: {} for bank in banks}
+    indicators = {bank: {} for bank in banks}
+    quality = {bank: {} for bank in banks}
+
+    # One vectorised evaluation of each indicator per availability signature
+    for signature, group in available.groupby(columns, sort=False):
+        group_banks = list(group.index)
+        group_panel = panel.loc[group_banks]
+        slices = _bank_slices(group_panel.index)
+        full, _, group_quality = compute_registered_indicators(
+            group_panel, INDICATORS, available=dict(zip(columns, signature))
+        )
+
+        for spec in INDICATORS:
+            series = full[spec.name]
+            if series is None:
+                for bank in group_banks:
+                    indicators_full[bank][spec.name] = None
+                    indicators[bank][spec.name] = None
+                    quality[bank][spec.name] = group_quality[spec.name]
+                continue
+
+            means = series.groupby(level=BANK_LEVEL, sort=False).mean().to_dict()
+            per_bank = _split_by_bank(series, slices)
+            for bank in group_banks:
+                indicators_full[bank][spec.name] = per_bank.get(bank)
+                indicators[bank][spec.name] = means.get(bank)
+                quality[bank][spec.name] = group_quality[spec.name]
+
+    periods = _periods(panel, date_col_name)
+    if bank_name_col is not None:
+        # First row of each bank, like df.iloc[0] in the per-bank engine
+        bank_names = (
+            panel[bank_name_col]
+            .groupby(level=BANK_LEVEL, sort=False)
+            .first(skipna=False)
+            .to_dict()
+        )
+    else:
+        bank_names = {}
+
+    results = {}
+    for bank, frame in frames.items():
+        if bank not in indicators:
+            results[bank] = empty_bank_result(bank, frame)
+            continue
+        meta = {
+            "bank_name": bank_names.get(bank),
+            "period": periods.get(bank),
+            "source_file": bank,
+        }
+        results[bank] = build_bank_result(
+            meta, indicators_full[bank], indicators[bank], quality[bank]
+        )
+    return results
+
+
+def empty_bank_result(bank: str, frame: pd.DataFrame) -> dict:
+    """Result of a bank without rows (e.g. a header-only file): every indicator is None."""
+    indicators_full, indicators, quality = compute_registered_indicators(frame)
+    meta = {"bank_name": None, "period": None, "source_file": bank}
+    return build_bank_result(meta, indicators_full, indicators, quality)
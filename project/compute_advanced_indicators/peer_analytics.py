@@ -0,0 +1,108 @@
+"""
+Cross-bank (peer) analytics computed once for the whole universe.
+
+- All banks and all periods are stacked into one panel (rows: observations, columns: indicators).
+- Spearman matrix: every column is ranked once, then Pearson correlation runs on the ranks.
+- Peer quantiles: one quantile table per indicator, used by the stress-test rules
+  as peer-relative thresholds.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from project.compute_advanced_indicators.build_correlation_matrix import write_corr
+
+PEER_DIR = "peer_analytics"
+PEER_QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+
+def build_indicator_panel(results: list[dict]) -> pd.DataFrame:
+    """
+    Stack the indicator time series of every bank into one panel.
+    Accepts Series or lists (results that were already saved to JSON).
+    Indicators missing for a bank are NaN on its rows.
+    """
+    banks = []
+    names = {}
+    for result in results:
+        series = {
+            k: np.asarray(pd.Series(v, dtype=float))
+            for k, v in result["indicators_full"].items()
+            if v is not None
+        }
+        if series:
+            banks.append(series)
+            names.update(dict.fromkeys(series))
+
+    if not banks:
+        return pd.DataFrame()
+
+    lengths = [len(next(iter(series.values()))) for series in banks]
+    columns = {
+        name: np.concatenate(
+            [series.get(name, np.full(n, np.nan)) for series, n in zip(banks, lengths)]
+        )
+        for name in names
+    }
+    return pd.DataFrame(columns)
+
+
+def universe_spearman(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Spearman correlation across all banks and periods.
+    Columns are ranked once over their valid values, then correlated pairwise (Pearson).
+    """
+    panel = panel.loc[:, panel.count() >= 2]
+    if panel.shape[1] < 2:
+        return pd.DataFrame()
+    return panel.rank().corr()
+
+
+def peer_quantiles(
+    panel: pd.DataFrame, qs: tuple[float, ...] = PEER_QUANTILES
+) -> pd.DataFrame:
+    """Quantile table of every indicator (index: indicator, columns: quantile level)."""
+    if panel.empty:
+        return pd.DataFrame(columns=list(qs), dtype=float)
+    return panel.quantile(list(qs)).T
+
+
+def build_and_save_peer_analytics(
+    results: list[dict], output_dir: str, corr_format: str = "xlsx"
+) -> pd.DataFrame:
+    """
+    Compute the universe Spearman matrix and peer quantiles and save them to
+    `output_dir/peer_analytics`. Returns the peer quantile table.
+    """
+    panel = build_indicator_panel(results)
+    corr = universe_spearman(panel)
+    quantiles = peer_quantiles(panel)
+
+    peer_dir = os.path.join(output_dir, PEER_DIR)
+    os.makedirs(peer_dir, exist_ok=True)
+
+    write_corr(
+        os.path.join(peer_dir, f"universe_correlation.{corr_format}"), corr, corr_format
+    )
+
+    quantile_table = {
+        name: {
+            f"q{round(q * 100):02d}": (None if pd.isna(v) else float(v))
+            for q, v in row.items()
+        }
+        for name, row in quantiles.iterrows()
+    }
+    with open(
+        os.path.join(peer_dir, "peer_quantiles.json"), "w", encoding="utf-8"
+    ) as f:
+        json.dump(
+            {"observations": int(len(panel)), "quantiles": quantile_table},
+            f,
+            indent=4,
+            ensure_ascii=False,
+        )
+
+    return quantiles
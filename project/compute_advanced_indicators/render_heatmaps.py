@@ -0,0 +1,216 @@
+"""
+Deferred rendering of correlation heatmaps.
+
+Runs as a separate stage after the indicators are computed (or later, on its own):
+- reads the saved correlation matrices (xlsx, npz, parquet or json),
+- renders them with the non-interactive Agg canvas, reusing one figure per label set
+  and only updating the image data and text artists between banks,
+- spreads the banks over worker processes,
+- optionally skips matrices whose heatmap is newer than the matrix (incremental runs).
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+HEATMAP_DIR = "heatmaps"
+CORR_SUFFIX = "_correlation"
+
+
+def read_corr(path: str) -> pd.DataFrame:
+    """Read a correlation matrix written by build_correlation_matrix.write_corr."""
+    if path.endswith(".xlsx"):
+        return pd.read_excel(path, index_col=0)
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            labels = list(data["labels"])
+            return pd.DataFrame(data["matrix"], index=labels, columns=labels)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        matrix = np.array(data["matrix"], dtype=float).reshape(
+            len(data["labels"]), len(data["labels"])
+        )
+        return pd.DataFrame(matrix, index=data["labels"], columns=data["labels"])
+    raise ValueError(f"Unsupported correlation file: {path}")
+
+
+class HeatmapRenderer:
+    """
+    Render heatmaps with a reused figure.
+    The figure, axes, colorbar and N x N text artists are built once per label set;
+    later banks with the same labels only update the image data and the texts.
+    """
+
+    def __init__(
+        self, title: str = "Spearman Correlation (Indicators)", dpi: int = 150
+    ):
+        self.title = title
+        self.dpi = dpi
+        self.templates = {}
+
+    def _template(self, labels: tuple[str, ...]) -> dict:
+        template = self.templates.get(labels)
+        if template is not None:
+            return template
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        n = len(labels)
+        # Same compact sizing and font sizes as plot_heatmap_matplotlib
+        fig = Figure(figsize=(max(6, n * 0.5), max(5, n * 0.4)))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        im = ax.imshow(np.zeros((n, n)), aspect="auto", vmin=-1, vmax=1)
+        cbar = fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+
+        ax.set_xticks(np.arange(n), labels=labels, rotation=45, ha="right")
+        ax.set_yticks(np.arange(n), labels=labels)
+        ax.tick_params(axis="both", labelsize=6)
+        cbar.ax.tick_params(labelsize=6)
+        ax.set_title(self.title, fontsize=10)
+
+        texts = [
+            [ax.text(j, i, "", ha="center", va="center", fontsize=6) for j in range(n)]
+            for i in range(n)
+        ]
+        fig.tight_layout()
+
+        template = {"fig": fig, "im": im, "texts": texts}
+        self.templates[labels] = template
+        return template
+
+    def render(self, corr: pd.DataFrame, out_png: str) -> bool:
+        """Render one matrix to a PNG file. Returns False for an empty matrix."""
+        if corr.empty:
+            return False
+
+        data = corr.to_numpy(dtype=float)
+        template = self._template(tuple(str(c) for c in corr.columns))
+        # Color scale follows the data, as in the per-bank heatmap
+        template["im"].set_data(data)
+        template["im"].autoscale()
+        for i, row in enumerate(template["texts"]):
+            for j, text in enumerate(row):
+                val = data[i, j]
+                text.set_text("" if np.isnan(val) else f"{val:.2f}")
+
+        template["fig"].savefig(out_png, format="png", dpi=self.dpi)
+        return True
+
+
+_renderer: HeatmapRenderer | None = None
+
+
+def heatmap_path(corr_path: str, out_dir: str) -> str:
+    """PNG file of the heatmap of a saved matrix."""
+    base = os.path.splitext(os.path.basename(corr_path))[0]
+    base = base.removesuffix(CORR_SUFFIX)
+    return os.path.join(out_dir, f"{base}_heatmap.png")
+
+
+def is_stale(corr_path: str, out_dir: str) -> bool:
+    """Whether the heatmap is missing or older than its matrix."""
+    out_png = heatmap_path(corr_path, out_dir)
+    return not os.path.exists(out_png) or os.path.getmtime(out_png) < os.path.getmtime(
+        corr_path
+    )
+
+
+def render_file(corr_path: str, out_dir: str) -> str | None:
+    """Render the heatmap of one saved matrix; one renderer is reused per process."""
+    global _renderer
+    if _renderer is None:
+        _renderer = HeatmapRenderer()
+
+    out_png = heatmap_path(corr_path, out_dir)
+    if _renderer.render(read_corr(corr_path), out_png):
+        return out_png
+    return None
+
+
+def render_heatmaps(
+    corr_dir: str,
+    out_dir: str | None = None,
+    workers: int = 1,
+    stale_only: bool = False,
+    corr_format: str | None = None,
+) -> list:
+    """
+    Render heatmaps for every correlation matrix in corr_dir, or with stale_only only
+    for the matrices rewritten since their heatmap was rendered.
+    With corr_format, only matrices saved in that format are considered, so matrices
+    left over from runs in another format are neither rendered nor checked for staleness.
+    Returns the paths of the written PNG files.
+    """
+    out_dir = out_dir or os.path.join(corr_dir, HEATMAP_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    corr_files = sorted(
+        os.path.join(corr_dir, name)
+        for name in os.listdir(corr_dir)
+        if os.path.splitext(name)[0].endswith(CORR_SUFFIX)
+        and (corr_format is None or name.endswith(f".{corr_format}"))
+    )
+    if stale_only:
+        corr_files = [path for path in corr_files if is_stale(path, out_dir)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(corr_files) // (workers * 4))
+            pngs = list(
+                executor.map(
+                    render_file,
+                    corr_files,
+                    [out_dir] * len(corr_files),
+                    chunksize=chunksize,
+                )
+            )
+    else:
+        pngs = [render_file(path, out_dir) for path in corr_files]
+
+    return [png for png in pngs if png is not None]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Render heatmaps for saved correlation matrices."
+    )
+    parser.add_argument(
+        "--corr_dir",
+        required=True,
+        help="Directory containing *_correlation.{xlsx,npz,parquet,json} files.",
+    )
+    parser.add_argument(
+        "--out_dir",
+        help="Directory for the PNG files (default: <corr_dir>/heatmaps).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used for rendering.",
+    )
+    parser.add_argument(
+        "--corr_format",
+        choices=("xlsx", "npz", "parquet", "json"),
+        help="Only render matrices saved in this format (default: all formats).",
+    )
+    parser.add_argument(
+        "--stale_only",
+        action="store_true",
+        help="Only render matrices that are newer than their heatmap.",
+    )
+
+    args = parser.parse_args()
+
+    render_heatmaps(
+        args.corr_dir, args.out_dir, args.workers, args.stale_only, args.corr_format
+    )
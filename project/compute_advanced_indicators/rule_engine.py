@@ -0,0 +1,291 @@
+"""
+Compiled evaluator for stress-test rule conditions.
+
+Conditions produced by build_stresstest_rules (e.g. 'abs(Duration_Gap) > 1.23' or
+'(A > 1.00) and (B < 0.50)') are parsed once with the `ast` module, checked against a
+small whitelist of nodes and compiled into NumPy closures. A compiled rule set then
+evaluates every rule against every row of an indicator panel (bank-years or scenarios)
+as array operations, without `eval`.
+
+A comparison with a missing value (NaN or an indicator absent from the panel) is unknown,
+and unknown is never a hit: `and`, `or` and `not` follow three-valued logic (so neither
+`x != 5` nor `not x > 5` hits a row where x is missing, while `a > 1 or x > 5` still hits
+where a > 1).
+A rule without the evaluated condition (e.g. no peer condition for an indicator without
+peer quantiles) never hits; a rule set where no rule has it is rejected.
+"""
+
+import argparse
+import ast
+import json
+import operator
+from dataclasses import dataclass
+from functools import lru_cache, reduce
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+LEVELS = {"WARNING": "condition_warning", "CRITICAL": "condition_critical"}
+PEER_LEVELS = {
+    "WARNING": "peer_condition_warning",
+    "CRITICAL": "peer_condition_critical",
+}
+
+FUNCTIONS = {"abs": np.abs}
+CONSTANTS = {"inf": np.inf, "nan": np.nan}
+
+BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+COMPARE_OPS = {
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+Env = dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A parsed condition: the indicators it reads and a function env -> boolean mask."""
+
+    source: str
+    variables: tuple[str, ...]
+    fn: Callable[[Env], np.ndarray]
+
+    def __call__(self, env: Env) -> np.ndarray:
+        return self.fn(env)
+
+
+def _compile_node(node: ast.AST, variables: dict) -> Callable[[Env], np.ndarray]:
+    """Compile one whitelisted numeric AST node into a closure over the column environment."""
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        value = float(node.value)
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return lambda env: value
+        name = node.id
+        variables[name] = None
+        return lambda env: env[name]
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile_node(node.operand, variables)
+        if isinstance(node.op, ast.USub):
+            return lambda env: -operand(env)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BIN_OPS:
+        op = BIN_OPS[type(node.op)]
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        return lambda env: op(left(env), right(env))
+
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and len(node.args) == 1
+        and not node.keywords
+    ):
+        func = FUNCTIONS[node.func.id]
+        arg = _compile_node(node.args[0], variables)
+        return lambda env: func(arg(env))
+
+    raise ValueError(f"Unsupported expression in rule condition: {ast.dump(node)}")
+
+
+def _all(masks) -> np.ndarray:
+    """Element-wise AND of masks that may mix arrays and scalars."""
+    return reduce(np.logical_and, masks)
+
+
+def _any(masks) -> np.ndarray:
+    return reduce(np.logical_or, masks)
+
+
+def _compile_predicate(
+    node: ast.AST, variables: dict
+) -> Callable[[Env], tuple[np.ndarray, np.ndarray]]:
+    """
+    Compile a boolean AST node into a closure returning (true, false) masks.
+    A row where neither holds is unknown (a missing value was compared).
+    """
+    if isinstance(node, ast.Expression):
+        return _compile_predicate(node.body, variables)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = _compile_predicate(node.operand, variables)
+
+        def negate(env):
+            true, false = operand(env)
+            return false, true
+
+        return negate
+
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile_predicate(value, variables) for value in node.values]
+        is_and = isinstance(node.op, ast.And)
+
+        def combine(env):
+            trues, falses = zip(*(part(env) for part in parts))
+            if is_and:
+                return _all(trues), _any(falses)
+            return _any(trues), _all(falses)
+
+        return combine
+
+    if isinstance(node, ast.Compare) and all(
+        type(op) in COMPARE_OPS for op in node.ops
+    ):
+        # Chained comparisons (a < b < c) are the AND of their pairs
+        operands = [_compile_node(node.left, variables)] + [
+            _compile_node(comparator, variables) for comparator in node.comparators
+        ]
+        ops = [COMPARE_OPS[type(op)] for op in node.ops]
+
+        def compare(env):
+            values = [operand(env) for operand in operands]
+            known = _all([~np.isnan(value) for value in values])
+            mask = _all([op(a, b) for op, a, b in zip(ops, values, values[1:])])
+            return mask & known, ~mask & known
+
+        return compare
+
+    # A bare number is true when non-zero, unknown when missing
+    value = _compile_node(node, variables)
+
+    def truth(env):
+        number = value(env)
+        known = ~np.isnan(number)
+        return (number != 0) & known, (number == 0) & known
+
+    return truth
+
+
+# Bounded so a long-lived process evaluating many rule files does not grow without limit
+@lru_cache(maxsize=4096)
+def compile_condition(condition: str) -> CompiledCondition:
+    """Parse and compile a condition string (recently used strings are compiled once)."""
+    try:
+        tree = ast.parse(condition.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid rule condition: {condition!r}") from e
+    variables = {}
+    predicate = _compile_predicate(tree, variables)
+    return CompiledCondition(condition, tuple(variables), lambda env: predicate(env)[0])
+
+
+def panel_env(panel: pd.DataFrame, variables) -> Env:
+    """Float column arrays for the given indicators; missing indicators are all-NaN."""
+    n = len(panel)
+    return {
+        name: (
+            panel[name].to_numpy(dtype=float)
+            if name in panel.columns
+            else np.full(n, np.nan)
+        )
+        for name in variables
+    }
+
+
+NEVER = CompiledCondition("False", (), lambda env: False)
+
+
+class CompiledRuleSet:
+    """Stress-test rules compiled once and evaluated against whole panels."""
+
+    def __init__(self, rules: list[dict], levels: dict[str, str] = LEVELS):
+        for key in levels.values():
+            if rules and not any(key in rule for rule in rules):
+                hint = (
+                    " (peer conditions are only written when the rules are built"
+                    " with peer quantiles, see --peer_analytics)"
+                    if key in PEER_LEVELS.values()
+                    else ""
+                )
+                raise ValueError(f"No rule has a '{key}' condition{hint}.")
+        self.rules = rules
+        self.levels = levels
+        self.conditions = {
+            level: [
+                compile_condition(rule[key]) if key in rule else NEVER for rule in rules
+            ]
+            for level, key in levels.items()
+        }
+        variables = {}
+        for conditions in self.conditions.values():
+            for condition in conditions:
+                variables.update(dict.fromkeys(condition.variables))
+        self.variables = tuple(variables)
+
+    def evaluate(self, panel: pd.DataFrame) -> dict[str, pd.DataFrame]:
+        """
+        Hit matrices {level: DataFrame}, rows = panel rows, columns = rule positions.
+        Every column is one vectorised evaluation over all rows.
+        """
+        env = panel_env(panel, self.variables)
+        n = len(panel)
+        hits = {}
+        for level, conditions in self.conditions.items():
+            matrix = np.zeros((n, len(conditions)), dtype=bool)
+            for j, condition in enumerate(conditions):
+                matrix[:, j] = condition(env)
+            hits[level] = pd.DataFrame(matrix, index=panel.index)
+        return hits
+
+
+def evaluate_rules(
+    rules: list[dict], panel: pd.DataFrame, levels: dict[str, str] = LEVELS
+) -> dict[str, pd.DataFrame]:
+    """Evaluate a list of rules (as saved by build_stresstest_rules) against a panel."""
+    return CompiledRuleSet(rules, levels).evaluate(panel)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Evaluate stress-test rules against a table of indicator values."
+    )
+    parser.add_argument(
+        "--rules", required=True, help="Rules JSON written by build_stresstest_rules."
+    )
+    parser.add_argument(
+        "--panel",
+        required=True,
+        help="CSV with one row per bank-year or scenario and one column per indicator.",
+    )
+    parser.add_argument(
+        "--output_prefix",
+        required=True,
+        help="Hit matrices are written to <prefix>_warning.csv and <prefix>_critical.csv.",
+    )
+    parser.add_argument(
+        "--peer",
+        action="store_true",
+        help="Evaluate the peer-relative conditions instead of the bank's own ones.",
+    )
+
+    args = parser.parse_args()
+
+    with open(args.rules, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    try:
+        hits = evaluate_rules(
+            rules, pd.read_csv(args.panel), PEER_LEVELS if args.peer else LEVELS
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    for level, matrix in hits.items():
+        matrix.astype(int).to_csv(f"{args.output_prefix}_{level.lower()}.csv")
@@ -0,0 +1,179 @@
+"""
+Streaming ingestion of a single large CSV that contains many banks.
+
+The file is read in chunks and split into per-bank DataFrames, so peak memory is bounded
+by one chunk plus the largest single bank instead of the whole file.
+
+- Sorted input (rows of each bank are contiguous): a bank is emitted as soon as the next bank starts.
+- Unsorted input: rows are spilled to one temporary CSV per bank, then each bank is read back in turn.
+
+Rows without a bank name cannot be attributed to any bank: they are skipped with a warning.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import warnings
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+
+def bank_file_key(bank_name) -> str:
+    """File-system safe name used for the per-bank outputs of a streamed bank."""
+    key = re.sub(r"[^\w\-]+", "_", str(bank_name)).strip("_")
+    return key or "bank"
+
+
+class BankKeys:
+    """
+    Collision-free file keys for the banks of one run.
+    A bank gets its bank_file_key; when another bank of the run already has that key
+    (e.g. "Bank A" and "Bank/A"), a short hash of the raw name is appended.
+    The same bank name always gets the same key.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.issued = set()
+
+    def key(self, bank_name) -> str:
+        name = str(bank_name)
+        key = self.keys.get(name)
+        if key is None:
+            key = bank_file_key(name)
+            if key in self.issued:
+                digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+                key = f"{key}_{digest}"
+            self.keys[name] = key
+            self.issued.add(key)
+        return key
+
+
+def _read_chunks(
+    file_path: str, chunksize: int, columns: list[str] | None
+) -> Iterator[pd.DataFrame]:
+    usecols = None if columns is None else set(columns).__contains__
+    return pd.read_csv(file_path, chunksize=chunksize, usecols=usecols)
+
+
+def _drop_missing_banks(
+    chunks: Iterator[pd.DataFrame], bank_name_col: str, file_path: str
+) -> Iterator[pd.DataFrame]:
+    """Skip rows without a bank name (and chunks left empty) and warn once with their count."""
+    dropped = 0
+    for chunk in chunks:
+        missing = chunk[bank_name_col].isna()
+        if missing.any():
+            dropped += int(missing.sum())
+            chunk = chunk[~missing]
+        if not chunk.empty:
+            yield chunk
+    if dropped:
+        warnings.warn(
+            f"{file_path}: skipped {dropped} rows without a '{bank_name_col}' value"
+        )
+
+
+def _finish(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    """Join the chunk parts of one bank and renumber rows like a per-bank file."""
+    if len(parts) == 1:
+        return parts[0].reset_index(drop=True)
+    return pd.concat(parts, ignore_index=True)
+
+
+class UnsortedInputError(ValueError):
+    """A bank's rows are not contiguous in an input read in sorted mode."""
+
+
+def iter_sorted_bank_frames(
+    file_path: str,
+    bank_name_col: str,
+    chunksize: int = 100_000,
+    columns: list[str] | None = None,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    Yield (bank name, DataFrame) for a CSV whose rows are grouped by bank.
+    Raises UnsortedInputError if a bank appears again after its rows were emitted.
+    """
+    emitted = set()
+    current = None
+    parts = []
+
+    chunks = _read_chunks(file_path, chunksize, columns)
+    for chunk in _drop_missing_banks(chunks, bank_name_col, file_path):
+        banks = chunk[bank_name_col].to_numpy()
+        # Start of each run of equal bank names within the chunk
+        run_starts = np.flatnonzero(np.r_[True, banks[1:] != banks[:-1]])
+        run_stops = np.r_[run_starts[1:], len(banks)]
+
+        for start, stop in zip(run_starts, run_stops):
+            bank = banks[start]
+            if bank != current:
+                if current is not None:
+                    emitted.add(current)
+                    yield current, _finish(parts)
+                if bank in emitted:
+                    raise UnsortedInputError(
+                        f"{file_path} is not sorted by '{bank_name_col}': rows of {bank!r} "
+                        "are not contiguous; rerun with --unsorted"
+                    )
+                current, parts = bank, []
+            parts.append(chunk.iloc[start:stop])
+
+    if current is not None:
+        yield current, _finish(parts)
+
+
+def iter_spilled_bank_frames(
+    file_path: str,
+    bank_name_col: str,
+    chunksize: int = 100_000,
+    columns: list[str] | None = None,
+    spill_dir: str | None = None,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    Yield (bank name, DataFrame) for a CSV in any row order.
+    Rows are first spilled to one temporary CSV per bank; banks are yielded in sorted order.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="bank_spill_", dir=spill_dir)
+    try:
+        spill_files = {}
+        chunks = _read_chunks(file_path, chunksize, columns)
+        for chunk in _drop_missing_banks(chunks, bank_name_col, file_path):
+            for bank, rows in chunk.groupby(bank_name_col, sort=False):
+                path = spill_files.get(bank)
+                if path is None:
+                    digest = hashlib.sha1(str(bank).encode("utf-8")).hexdigest()
+                    path = spill_files[bank] = os.path.join(tmp_dir, f"{digest}.csv")
+                    rows.to_csv(path, index=False)
+                else:
+                    rows.to_csv(path, mode="a", header=False, index=False)
+
+        for bank in sorted(spill_files, key=str):
+            df = pd.read_csv(spill_files[bank])
+            os.remove(spill_files[bank])
+            yield bank, df
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def iter_bank_frames(
+    file_path: str,
+    bank_name_col: str,
+    chunksize: int = 100_000,
+    presorted: bool = True,
+    columns: list[str] | None = None,
+    spill_dir: str | None = None,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """Stream per-bank DataFrames out of a multi-bank CSV."""
+    if not file_path.endswith(".csv"):
+        raise ValueError("Streaming mode supports CSV files only.")
+    if presorted:
+        return iter_sorted_bank_frames(file_path, bank_name_col, chunksize, columns)
+    return iter_spilled_bank_frames(
+        file_path, bank_name_col, chunksize, columns, spill_dir
+    )
@@ -0,0 +1,181 @@
+"""
+Streaming writer for the consolidated bank indicators table.
+
+Rows are added one bank at a time and written in batches, so only one batch is held
+in memory whatever the number of banks:
+
+- CSV: each batch is appended to the file.
+- Parquet: each batch is one row group (requires pyarrow).
+- Excel: rows are appended to a write-only (streaming) openpyxl workbook.
+
+When the writer exits on an exception, the partially written file is removed.
+
+export_table_to_excel converts a finished CSV table to Excel the same way.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+SHEET_NAME = "Sheet1"
+
+
+def table_row(bank: dict) -> dict:
+    """Flatten one bank result into a table row."""
+    row = {}
+    row.update(bank["meta"])
+    row.update(bank["indicators"])
+    row.update({f"{k}_quality": i for k, i in bank["quality"].items()})
+    row.update({f"{k}_flag": i for k, i in bank["flags"].items()})
+    return row
+
+
+def _cell(value):
+    """Excel cell value: missing values become empty cells."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class BankTableWriter:
+    """
+    Write the bank table incrementally as results arrive.
+    The columns are fixed by the first batch. Use as a context manager.
+    """
+
+    def __init__(self, output_file: str, batch_size: int = 1000):
+        if output_file.endswith(".csv"):
+            self.table_format = "csv"
+        elif output_file.endswith(".parquet"):
+            self.table_format = "parquet"
+        elif output_file.endswith(".xlsx"):
+            self.table_format = "xlsx"
+        else:
+            raise ValueError(
+                "Unsupported output file format. Please provide a CSV, Parquet or Excel file."
+            )
+        self.output_file = output_file
+        self.batch_size = batch_size
+        self.rows = []
+        self.columns = None
+        self._parquet_writer = None
+        self._workbook = None
+        self._sheet = None
+
+    def __enter__(self) -> "BankTableWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # A failed run must not leave a table that looks complete
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def add(self, bank: dict) -> None:
+        self.rows.append(table_row(bank))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def update(self, banks) -> "BankTableWriter":
+        for bank in banks:
+            self.add(bank)
+        return self
+
+    def flush(self) -> None:
+        """Write the buffered rows."""
+        first = self.columns is None
+        if first:
+            if not self.rows:
+                return
+            self.columns = list(self.rows[0])
+        df = pd.DataFrame(self.rows, columns=self.columns)
+        self.rows = []
+
+        if self.table_format == "csv":
+            df.to_csv(
+                self.output_file, mode="w" if first else "a", header=first, index=False
+            )
+        elif self.table_format == "parquet":
+            self._write_parquet(df)
+        else:
+            self._write_excel(df, first)
+
+    def _write_parquet(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Stable types across row groups, even when a batch has only missing values
+        for col in df.columns:
+            if col.endswith("_flag"):
+                df[col] = df[col].astype("boolean")
+            elif col.endswith("_quality") or df[col].dtype == object:
+                df[col] = df[col].astype("string")
+        if self._parquet_writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._parquet_writer = pq.ParquetWriter(self.output_file, table.schema)
+        else:
+            table = pa.Table.from_pandas(
+                df, schema=self._parquet_writer.schema, preserve_index=False
+            )
+        self._parquet_writer.write_table(table)
+
+    def _write_excel(self, df: pd.DataFrame, first: bool) -> None:
+        if first:
+            from openpyxl import Workbook
+
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet(SHEET_NAME)
+            self._sheet.append(self.columns)
+        for row in df.itertuples(index=False, name=None):
+            self._sheet.append([_cell(value) for value in row])
+
+    def close(self) -> None:
+        """Flush the last batch and finish the file (an empty table still gets a file)."""
+        self.flush()
+        if self.columns is None:
+            # No bank at all: keep writing an (empty) file like before
+            if self.table_format == "csv":
+                pd.DataFrame().to_csv(self.output_file, index=False)
+            elif self.table_format == "parquet":
+                pd.DataFrame().to_parquet(self.output_file)
+            else:
+                self._write_excel(pd.DataFrame(), first=True)
+            self.columns = []
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._workbook is not None:
+            self._workbook.save(self.output_file)
+            self._workbook = None
+
+    def abort(self) -> None:
+        """Drop the buffered rows and remove the partially written file."""
+        self.rows = []
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        self._workbook = None
+        if self.columns is not None and os.path.exists(self.output_file):
+            os.remove(self.output_file)
+
+
+def export_table_to_excel(
+    csv_file: str, excel_file: str, chunksize: int = 10_000
+) -> None:
+    """Convert a CSV table to Excel with a write-only workbook, reading the CSV in chunks."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    header = True
+    for chunk in pd.read_csv(csv_file, chunksize=chunksize):
+        if header:
+            sheet.append(list(chunk.columns))
+            header = False
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append([_cell(value) for value in row])
+    workbook.save(excel_file)
@@ -0,0 +1,76 @@
+"""
+A cached read must give the same data (and so the same indicators) as parsing the file,
+and parse a file again only when its content changed.
+"""
+
+import os
+import shutil
+
+import pandas as pd
+
+from project.compute_advanced_indicators.bank_data_cache import (
+    ENTRY_SUFFIX,
+    read_with_cache,
+)
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+)
+from project.compute_advanced_indicators.main import (
+    compute_advanced_indicators,
+    load_columns,
+)
+from project.compute_advanced_indicators.utils import read_bank_data
+
+
+def test_cached_read_matches_baseline(bank_dir, baseline, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    columns = load_columns(DATE_COL, BANK_NAME_COL)
+    for file in BANK_FILES:
+        path = os.path.join(bank_dir, file)
+        # Cold (parsed and stored) then warm (loaded from the cache)
+        for _ in range(2):
+            df = read_bank_data(
+                path, use_cache=True, cache_dir=cache_dir, columns=columns
+            )
+            result = compute_advanced_indicators(
+                df,
+                source_file=file,
+                date_col_name=DATE_COL,
+                bank_name_col=BANK_NAME_COL,
+            )
+            assert_same_result(result, baseline[file])
+    assert len([n for n in os.listdir(cache_dir) if n.endswith(ENTRY_SUFFIX)]) == 3
+
+
+def test_parses_again_only_when_content_changes(bank_dir, tmp_path):
+    path = str(tmp_path / "bank.xlsx")
+    shutil.copy(os.path.join(bank_dir, BANK_FILES[0]), path)
+    cache_dir = str(tmp_path / "cache")
+    parsed = []
+
+    def reader(file_path):
+        parsed.append(file_path)
+        return pd.read_excel(file_path)
+
+    first = read_with_cache(path, reader, cache_dir=cache_dir)
+    second = read_with_cache(path, reader, cache_dir=cache_dir)
+    assert len(parsed) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    shutil.copy(os.path.join(bank_dir, BANK_FILES[1]), path)
+    changed = read_with_cache(path, reader, cache_dir=cache_dir)
+    assert len(parsed) == 2
+    pd.testing.assert_frame_equal(changed, pd.read_excel(path))
+
+
+def test_eviction_keeps_the_cache_bounded(bank_dir, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    for file in BANK_FILES:
+        read_with_cache(
+            os.path.join(bank_dir, file), pd.read_excel, cache_dir, max_bytes=1
+        )
+    # A bound below one entry evicts every entry, and with them their stat records
+    assert os.listdir(cache_dir) == []
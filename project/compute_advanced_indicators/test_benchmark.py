@@ -0,0 +1,79 @@
+"""
+Synthetic banks must exercise every indicator with realistic values, and the engines
+must give them the baseline per-bank results too (including the proxy cases).
+"""
+
+import numpy as np
+import pytest
+
+from project.compute_advanced_indicators.benchmark import (
+    STAGES,
+    run_benchmark,
+    synthetic_bank,
+    write_synthetic_banks,
+)
+from project.compute_advanced_indicators.conftest import (
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+    baseline_result,
+)
+from project.compute_advanced_indicators.indicators.registry import required_columns
+from project.compute_advanced_indicators.main import (
+    compute_advanced_indicators,
+    process_input_dir,
+)
+
+
+def test_synthetic_bank_covers_every_indicator():
+    df = synthetic_bank(np.random.default_rng(0), 0, drop_rate=0, nan_column_rate=0)
+    assert set(required_columns()) <= set(df.columns)
+
+    result = compute_advanced_indicators(
+        df, date_col_name=DATE_COL, bank_name_col=BANK_NAME_COL
+    )
+    assert set(result["quality"].values()) == {"direct"}
+    assert all(value is not None for value in result["indicators"].values())
+    # Same units as bank_data: NSFR in percent becomes a ratio around 1.15
+    assert 0.9 < result["indicators"]["Net_Stable_Funding_Ratio"] < 1.4
+
+
+def test_write_synthetic_banks_is_reproducible(tmp_path):
+    first = write_synthetic_banks(str(tmp_path / "a"), 3, years=5, seed=1)
+    second = write_synthetic_banks(str(tmp_path / "b"), 3, years=5, seed=1)
+    assert first == second
+    for file in first:
+        assert (tmp_path / "a" / file).read_bytes() == (
+            tmp_path / "b" / file
+        ).read_bytes()
+
+
+@pytest.mark.parametrize(
+    "options", [{"workers": 2}, {"engine": "panel"}], ids=["workers", "panel"]
+)
+def test_engines_match_baseline_on_synthetic_banks(options, tmp_path):
+    input_dir = tmp_path / "input"
+    files = write_synthetic_banks(str(input_dir), 6, years=10, seed=2)
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    results = list(
+        process_input_dir(
+            str(input_dir),
+            str(output_dir),
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+            heatmap=False,
+            **options,
+        )
+    )
+    assert len({frozenset(r["quality"].items()) for r in results}) > 1
+    for file, result in zip(files, results):
+        assert_same_result(result, baseline_result(str(input_dir / file)))
+
+
+def test_run_benchmark_times_every_stage(tmp_path):
+    record = run_benchmark(
+        2, years=5, work_dir=str(tmp_path), corr_format="json", heatmap=False
+    )
+    assert list(record["stages_s"]) == list(STAGES)
+    assert record["total_s"] == pytest.approx(sum(record["stages_s"].values()))
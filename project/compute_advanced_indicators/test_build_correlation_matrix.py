@@ -0,0 +1,54 @@
+"""
+Every correlation format must store the Spearman matrix of the baseline results, and
+the xlsx workbook must carry its heatmap after the single-pass write.
+"""
+
+import pandas as pd
+import pytest
+
+from project.compute_advanced_indicators.build_correlation_matrix import (
+    build_and_save_correlation_matrix,
+    indicator_series,
+    to_dataframe,
+)
+from project.compute_advanced_indicators.conftest import BANK_FILES
+from project.compute_advanced_indicators.options import (
+    CORR_FORMATS,
+    parquet_available,
+)
+from project.compute_advanced_indicators.render_heatmaps import read_corr
+
+
+@pytest.mark.parametrize("corr_format", CORR_FORMATS)
+def test_saved_matrix_matches_spearman(corr_format, baseline, tmp_path):
+    if corr_format == "parquet" and not parquet_available():
+        pytest.skip("pyarrow is not installed")
+    for file in BANK_FILES:
+        expected = to_dataframe(
+            indicator_series(baseline[file]["indicators_full"])
+        ).corr(method="spearman")
+        base = file.removesuffix(".xlsx")
+        corr = build_and_save_correlation_matrix(
+            baseline[file], str(tmp_path), base, corr_format, heatmap=False
+        )
+        pd.testing.assert_frame_equal(corr, expected)
+        saved = read_corr(str(tmp_path / f"{base}_correlation.{corr_format}"))
+        pd.testing.assert_frame_equal(
+            saved, expected, check_names=False, check_index_type=False
+        )
+
+
+def test_xlsx_heatmap_is_embedded(baseline, tmp_path):
+    from openpyxl import load_workbook
+
+    file = BANK_FILES[0]
+    build_and_save_correlation_matrix(baseline[file], str(tmp_path), "bank")
+    workbook = load_workbook(tmp_path / "bank_correlation.xlsx")
+    assert len(workbook["Correlation_Matrix"]._images) == 1
+
+
+def test_empty_matrix_still_writes_a_sheet(tmp_path):
+    bank = {"indicators_full": {"Duration_Gap": None}}
+    corr = build_and_save_correlation_matrix(bank, str(tmp_path), "empty")
+    assert corr.empty
+    assert read_corr(str(tmp_path / "empty_correlation.xlsx")).empty
@@ -0,0 +1,49 @@
+"""
+Rules built from the per-bank quantile table must be the rules the original pipeline
+wrote for the same banks, and the table must hold pandas' quantiles.
+"""
+
+import json
+import os
+
+import pytest
+
+from project.compute_advanced_indicators.build_stresstest_rules import (
+    QUANTILES,
+    build_rules_from_bank_data,
+    clean_indicators,
+    quantile_table,
+)
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    ORIGINAL_OUTPUT_DIR,
+)
+from project.compute_advanced_indicators.utils import bank_result_to_json
+
+
+def original_rules(file: str) -> list:
+    path = os.path.join(
+        ORIGINAL_OUTPUT_DIR,
+        "stresstest_rules",
+        f"{file.removesuffix('.xlsx')}_rules.json",
+    )
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("file", BANK_FILES)
+def test_rules_match_original_outputs(file, baseline):
+    expected = original_rules(file)
+    assert build_rules_from_bank_data(baseline[file]) == expected
+    # Results reloaded from JSON give the same rules
+    assert build_rules_from_bank_data(bank_result_to_json(baseline[file])) == expected
+
+
+@pytest.mark.parametrize("file", BANK_FILES)
+def test_quantile_table_matches_pandas(file, baseline):
+    indicators = clean_indicators(baseline[file]["indicators_full"])
+    table = quantile_table(indicators)
+    assert list(table) == list(indicators)
+    for name, series in indicators.items():
+        for q in QUANTILES:
+            assert table[name][q] == pytest.approx(series.quantile(q), rel=1e-12)
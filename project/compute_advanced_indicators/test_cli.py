@@ -0,0 +1,89 @@
+"""
+The CLI must write the outputs of the original pipeline, and reject invalid
+invocations before the pipeline (pandas and the indicator modules) is imported.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from project.compute_advanced_indicators.cli import run
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    ORIGINAL_OUTPUT_DIR,
+)
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+
+def test_run_writes_original_outputs(bank_dir, tmp_path):
+    output_dir = tmp_path / "output"
+    run(
+        [
+            "--input_dir",
+            bank_dir,
+            "--output_dir",
+            str(output_dir),
+            "--date_col_name",
+            DATE_COL,
+            "--bank_name_col",
+            BANK_NAME_COL,
+            "--no_heatmap",
+        ]
+    )
+    for file in BANK_FILES:
+        stem = file.removesuffix(".xlsx")
+        for name in (
+            f"{stem}_indicators.json",
+            os.path.join("stresstest_rules", f"{stem}_rules.json"),
+        ):
+            assert (output_dir / name).read_bytes() == open(
+                os.path.join(ORIGINAL_OUTPUT_DIR, name), "rb"
+            ).read(), name
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        (["--input_dir", "in", "--workers", "0"], "must be a positive integer"),
+        (["--input_file", "all.csv"], "--input_file requires --bank_name_col"),
+        (
+            ["--input_dir", "in", "--engine", "panel", "--workers", "2"],
+            "--engine panel runs in one process",
+        ),
+        (["--input_dir", "in", "--no_bank_files"], "--no_bank_files requires --store"),
+    ],
+)
+def test_invalid_invocations_are_rejected(args, message, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        run(args + ["--output_dir", "out"])
+    assert excinfo.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_invalid_invocation_does_not_import_the_pipeline(tmp_path):
+    script = (
+        "import sys\n"
+        "from project.compute_advanced_indicators.cli import run\n"
+        "try:\n"
+        "    run(['--input_dir', 'in', '--output_dir', 'out', '--workers', '0'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted({'pandas', 'project.compute_advanced_indicators.main'}"
+        " & set(sys.modules)))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.path.abspath(REPO_ROOT)}
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert completed.stdout.strip() == "[]"
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,84 @@
+"""
+Vectorised flagging must give every bank the flags of the per-bank detect_flags,
+under the default thresholds and under any other profile.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from project.compute_advanced_indicators.conftest import BANK_FILES
+from project.compute_advanced_indicators.flagging import (
+    DEFAULT_PROFILE,
+    breach_counts,
+    detect_flags_frame,
+    indicator_matrix,
+    load_threshold_profiles,
+    peer_profile,
+)
+from project.compute_advanced_indicators.utils import THRESHOLDS, detect_flags
+
+
+@pytest.fixture(scope="module")
+def results(baseline) -> dict[str, dict]:
+    results = dict(baseline)
+    # Values on the thresholds, on both sides of them and missing
+    for offset in (-1e-9, 0.0, 1e-9):
+        results[f"edge{offset}"] = {
+            "indicators": {
+                key: item["threshold"] + offset for key, item in THRESHOLDS.items()
+            }
+        }
+    results["missing"] = {"indicators": dict.fromkeys(THRESHOLDS)}
+    results["nan"] = {"indicators": dict.fromkeys(THRESHOLDS, np.nan)}
+    return results
+
+
+def assert_flags_match(flags: pd.DataFrame, results: dict, profile: dict) -> None:
+    for bank, result in results.items():
+        expected = detect_flags(
+            {k: v for k, v in result["indicators"].items() if k in profile}, profile
+        )
+        actual = {
+            key: None if pd.isna(value) else bool(value)
+            for key, value in flags.loc[bank].items()
+        }
+        assert actual == expected, bank
+
+
+def test_default_profile_matches_detect_flags(results):
+    flags = detect_flags_frame(indicator_matrix(results))
+    assert_flags_match(flags, results, THRESHOLDS)
+    for file in BANK_FILES:
+        assert flags.loc[file].to_dict() == results[file]["flags"]
+
+    counts = breach_counts(flags)
+    for bank, result in results.items():
+        expected = detect_flags(result["indicators"])
+        assert counts[bank] == sum(v for v in expected.values() if v is not None)
+
+
+def test_other_profiles_match_detect_flags(results, tmp_path):
+    config = tmp_path / "profiles.json"
+    config.write_text(
+        json.dumps({"strict": {"Duration_Gap": {"threshold": 0.5, "sign": ">"}}})
+    )
+    profiles = load_threshold_profiles(str(config))
+    assert profiles[DEFAULT_PROFILE] is THRESHOLDS
+    assert profiles["strict"]["Duration_Gap"]["threshold"] == 0.5
+
+    peer = peer_profile(
+        {key: {"q10": -0.1, "q90": 0.1} for key in list(THRESHOLDS)[:5]}
+    )
+    matrix = indicator_matrix(results)
+    for profile in (profiles["strict"], peer):
+        assert_flags_match(detect_flags_frame(matrix, profile), results, profile)
+
+
+def test_invalid_profile_is_rejected(tmp_path):
+    config = tmp_path / "profiles.json"
+    config.write_text(json.dumps({"bad": {"Duration_Gap": {"threshold": 1}}}))
+    with pytest.raises(ValueError, match="Duration_Gap"):
+        load_threshold_profiles(str(config))
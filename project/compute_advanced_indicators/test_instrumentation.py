@@ -0,0 +1,105 @@
+"""
+Instrumented runs must give the baseline results, and every process must report the
+per-bank stages of every bank to the run report and the Chrome trace.
+"""
+
+import json
+
+import pytest
+
+from project.compute_advanced_indicators import instrumentation
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+)
+from project.compute_advanced_indicators.main import process_input_dir
+
+BANK_STAGES = ["bank", "read", "indicators", "correlation", "rules", "json"]
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool_dir = str(tmp_path / "spool")
+    instrumentation.enable(spool_dir)
+    yield spool_dir
+    instrumentation.disable()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_instrumented_run_matches_baseline(
+    workers, spool, bank_dir, baseline, tmp_path
+):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    results = list(
+        process_input_dir(
+            bank_dir,
+            str(output_dir),
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+            workers=workers,
+            heatmap=False,
+        )
+    )
+    for file, result in zip(BANK_FILES, results):
+        assert_same_result(result, baseline[file])
+
+    instrumentation.disable()
+    events = instrumentation.collect_events(spool)
+    for name in BANK_STAGES:
+        # Nested stages are labelled with the bank of the enclosing stage
+        banks = sorted(event["bank"] for event in events if event["stage"] == name)
+        assert banks == BANK_FILES, name
+    assert [event["ts_us"] for event in events] == sorted(
+        event["ts_us"] for event in events
+    )
+
+    report = instrumentation.write_run_report(spool, str(output_dir), chrome_trace=True)
+    with open(output_dir / "run_report.json", "r", encoding="utf-8") as f:
+        assert json.load(f) == json.loads(json.dumps(report))
+    for name in BANK_STAGES:
+        assert report["stages"][name]["count"] == len(BANK_FILES)
+        assert {item["bank"] for item in report["stages"][name]["slowest"]} == set(
+            BANK_FILES
+        )
+
+    with open(output_dir / "trace.json", "r", encoding="utf-8") as f:
+        trace = json.load(f)["traceEvents"]
+    assert len(trace) == len(events)
+    assert min(event["ts"] for event in trace) == 0
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace)
+
+
+def test_nested_stages_and_report(spool):
+    with instrumentation.stage("outer", bank="a"):
+        with instrumentation.stage("inner"):
+            pass
+    with instrumentation.stage("inner", bank="b"):
+        pass
+    with instrumentation.stage("unlabelled"):
+        pass
+
+    events = instrumentation.collect_events(spool)
+    assert [(event["stage"], event["bank"]) for event in events] == [
+        ("outer", "a"),
+        ("inner", "a"),
+        ("inner", "b"),
+        ("unlabelled", None),
+    ]
+    report = instrumentation.build_report(events)
+    assert report["processes"] == 1
+    assert report["stages"]["inner"]["count"] == 2
+    assert report["stages"]["unlabelled"]["slowest"] == []
+    assert report["elapsed_s"] >= report["stages"]["outer"]["wall_s"]["total"]
+
+
+def test_disabled_stage_records_nothing(tmp_path):
+    instrumentation.enable(str(tmp_path))
+    instrumentation.disable()
+    assert instrumentation.spool_dir() is None
+    assert instrumentation.pool_options() == {}
+    with instrumentation.stage("ignored", bank="a"):
+        pass
+    assert instrumentation.collect_events(str(tmp_path)) == []
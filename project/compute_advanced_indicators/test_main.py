@@ -0,0 +1,43 @@
+"""
+process_input_dir must yield the baseline result of every bank, in sorted file order,
+whatever the number of worker processes.
+"""
+
+import os
+
+import pytest
+
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+)
+from project.compute_advanced_indicators.main import process_input_dir
+from project.compute_advanced_indicators.manifest import output_paths
+
+
+def run(bank_dir: str, output_dir: str, **options) -> list[dict]:
+    os.makedirs(output_dir, exist_ok=True)
+    return list(
+        process_input_dir(
+            bank_dir,
+            output_dir,
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+            heatmap=False,
+            **options,
+        )
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_workers_keep_file_order(workers, bank_dir, baseline, tmp_path):
+    results = run(bank_dir, str(tmp_path), workers=workers)
+
+    assert [result["meta"]["source_file"] for result in results] == BANK_FILES
+    for result in results:
+        assert_same_result(result, baseline[result["meta"]["source_file"]])
+        assert os.path.exists(
+            output_paths(str(tmp_path), result["meta"]["source_file"])["indicators"]
+        )
@@ -0,0 +1,70 @@
+"""
+Incremental runs must yield the baseline result of every bank while recomputing only
+the banks whose input changed; the others are reloaded from their saved outputs.
+"""
+
+import os
+import shutil
+
+from project.compute_advanced_indicators import main
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+    baseline_result,
+)
+from project.compute_advanced_indicators.manifest import MANIFEST_FILE
+
+
+def run_incremental(input_dir: str, output_dir: str) -> list[dict]:
+    return list(
+        main.process_input_dir(
+            input_dir,
+            output_dir,
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+            incremental=True,
+            heatmap=False,
+        )
+    )
+
+
+def test_only_changed_banks_are_recomputed(bank_dir, baseline, tmp_path, monkeypatch):
+    input_dir = tmp_path / "input"
+    shutil.copytree(bank_dir, input_dir)
+    output_dir = str(tmp_path / "output")
+    os.makedirs(output_dir)
+
+    recomputed = []
+    process_bank_file = main.process_bank_file
+
+    def recording(file, *args, **kwargs):
+        recomputed.append(file)
+        return process_bank_file(file, *args, **kwargs)
+
+    monkeypatch.setattr(main, "process_bank_file", recording)
+
+    results = run_incremental(str(input_dir), output_dir)
+    assert recomputed == BANK_FILES
+    assert os.path.exists(os.path.join(output_dir, MANIFEST_FILE))
+
+    # Nothing changed: every result is reloaded
+    recomputed.clear()
+    reloaded = run_incremental(str(input_dir), output_dir)
+    assert recomputed == []
+    for file, first, second in zip(BANK_FILES, results, reloaded):
+        assert_same_result(first, baseline[file])
+        assert_same_result(second, baseline[file])
+
+    # New content for the second bank only
+    changed = BANK_FILES[1]
+    shutil.copy(os.path.join(bank_dir, BANK_FILES[0]), input_dir / changed)
+    recomputed.clear()
+    results = run_incremental(str(input_dir), output_dir)
+    assert recomputed == [changed]
+    assert_same_result(results[0], baseline[BANK_FILES[0]])
+    assert_same_result(
+        results[1], baseline_result(str(input_dir / changed), source_file=changed)
+    )
+    assert_same_result(results[2], baseline[BANK_FILES[2]])
@@ -0,0 +1,140 @@
+"""
+Every table of the SQLite store must read back as the baseline outputs of each bank,
+and a failed run must leave nothing behind.
+"""
+
+import json
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from project.compute_advanced_indicators.build_correlation_matrix import (
+    build_correlation_matrix,
+)
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    ORIGINAL_OUTPUT_DIR,
+)
+from project.compute_advanced_indicators.output_store import (
+    TABLE_COLUMNS,
+    SQLiteStore,
+)
+
+
+def query(path: str, sql: str, *params) -> list[tuple]:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def test_store_reads_back_baseline_outputs(baseline, tmp_path):
+    path = str(tmp_path / "store.db")
+    # Batches of two banks: the last bank is flushed on exit
+    with SQLiteStore(path, {"input": "bank_data"}, batch_size=2) as store:
+        for file in BANK_FILES:
+            store.add_bank(file, baseline[file])
+    ((settings,),) = query(path, "SELECT settings FROM runs")
+    assert json.loads(settings) == {"input": "bank_data"}
+
+    for file in BANK_FILES:
+        result = baseline[file]
+        meta = result["meta"]
+        assert query(
+            path,
+            "SELECT bank_name, period, source_file FROM banks WHERE bank_key = ?",
+            file,
+        ) == [(meta["bank_name"], meta["period"], meta["source_file"])]
+
+        indicators = query(
+            path,
+            "SELECT indicator, value, quality, flag FROM indicators "
+            "WHERE bank_key = ? ORDER BY rowid",
+            file,
+        )
+        assert indicators == [
+            (
+                name,
+                value,
+                result["quality"][name],
+                None if result["flags"][name] is None else int(result["flags"][name]),
+            )
+            for name, value in result["indicators"].items()
+        ]
+
+        for name, series in result["indicators_full"].items():
+            rows = query(
+                path,
+                "SELECT position, value FROM series "
+                "WHERE bank_key = ? AND indicator = ? ORDER BY position",
+                file,
+                name,
+            )
+            if series is None:
+                assert rows == []
+                continue
+            values = series.to_numpy(dtype=float)
+            valid = np.flatnonzero(~np.isnan(values))
+            assert rows == list(zip(valid.tolist(), values[valid].tolist()))
+
+        stored = pd.DataFrame(
+            query(
+                path,
+                "SELECT row_indicator, col_indicator, value FROM correlations "
+                "WHERE bank_key = ?",
+                file,
+            ),
+            columns=["row", "col", "value"],
+        ).pivot(index="row", columns="col", values="value")
+        corr = build_correlation_matrix(result)
+        # Missing correlations are not stored
+        pd.testing.assert_frame_equal(
+            stored.reindex(index=corr.index, columns=corr.columns),
+            corr,
+            check_names=False,
+        )
+
+        with open(
+            os.path.join(
+                ORIGINAL_OUTPUT_DIR,
+                "stresstest_rules",
+                f"{file.removesuffix('.xlsx')}_rules.json",
+            ),
+            "r",
+            encoding="utf-8",
+        ) as f:
+            original_rules = json.load(f)
+        rules = query(
+            path,
+            "SELECT condition_warning, condition_critical, rationale FROM rules "
+            "WHERE bank_key = ? ORDER BY position",
+            file,
+        )
+        assert rules == [
+            (
+                rule["condition_warning"],
+                rule["condition_critical"],
+                rule["rationale"],
+            )
+            for rule in original_rules
+        ]
+
+
+def test_failed_run_is_discarded(baseline, tmp_path):
+    path = str(tmp_path / "store.db")
+    with SQLiteStore(path) as store:
+        store.add_bank(BANK_FILES[0], baseline[BANK_FILES[0]])
+
+    with pytest.raises(RuntimeError):
+        with SQLiteStore(path, batch_size=1) as store:
+            # Committed by the batch flush before the failure
+            store.add_bank(BANK_FILES[1], baseline[BANK_FILES[1]])
+            raise RuntimeError("run failed")
+
+    assert query(path, "SELECT run_id FROM runs") == [(1,)]
+    for table in TABLE_COLUMNS:
+        assert query(path, f"SELECT DISTINCT run_id FROM {table}") == [(1,)], table
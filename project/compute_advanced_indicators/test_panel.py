@@ -0,0 +1,70 @@
+"""
+The panel engine must give every bank the result of the per-bank engine, including
+banks in different direct/proxy availability groups and banks without rows.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+)
+from project.compute_advanced_indicators.indicators.registry import INDICATORS
+from project.compute_advanced_indicators.main import (
+    compute_advanced_indicators,
+    process_input_dir,
+)
+from project.compute_advanced_indicators.panel import compute_panel_indicators
+from project.compute_advanced_indicators.utils import read_bank_data
+
+
+@pytest.fixture(scope="module")
+def frames(bank_dir) -> dict:
+    frames = {file: read_bank_data(os.path.join(bank_dir, file)) for file in BANK_FILES}
+    # Same bank without its direct columns: a second availability group
+    proxies = frames[BANK_FILES[0]].copy()
+    for spec in INDICATORS:
+        for col in spec.columns:
+            if col in proxies.columns and spec.proxy_columns:
+                proxies[col] = np.nan
+    frames["proxies.xlsx"] = proxies
+    frames["empty.xlsx"] = proxies.iloc[:0]
+    return frames
+
+
+def test_panel_matches_per_bank_engine(frames):
+    results = compute_panel_indicators(
+        {file: frame.copy() for file, frame in frames.items()},
+        DATE_COL,
+        BANK_NAME_COL,
+    )
+    assert list(results) == list(frames)
+    for file, frame in frames.items():
+        expected = compute_advanced_indicators(
+            frame.copy(),
+            source_file=file,
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+        )
+        assert_same_result(results[file], expected)
+
+
+def test_panel_engine_run_matches_baseline(bank_dir, baseline, tmp_path):
+    results = list(
+        process_input_dir(
+            bank_dir,
+            str(tmp_path),
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+            engine="panel",
+            heatmap=False,
+        )
+    )
+    assert [result["meta"]["source_file"] for result in results] == BANK_FILES
+    for result in results:
+        assert_same_result(result, baseline[result["meta"]["source_file"]])
@@ -0,0 +1,69 @@
+"""
+Peer analytics must stack the baseline series of every bank, and its Spearman matrix
+and quantiles must match pandas on that panel.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from project.compute_advanced_indicators.conftest import BANK_FILES
+from project.compute_advanced_indicators.peer_analytics import (
+    PEER_QUANTILES,
+    build_and_save_peer_analytics,
+    build_indicator_panel,
+    peer_quantiles,
+    universe_spearman,
+)
+from project.compute_advanced_indicators.utils import bank_result_to_json
+
+
+def stacked_series(results: list[dict]) -> pd.DataFrame:
+    """Per-bank frames of the indicator series, concatenated row-wise."""
+    frames = [
+        pd.DataFrame(
+            {k: v for k, v in result["indicators_full"].items() if v is not None}
+        ).reset_index(drop=True)
+        for result in results
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_panel_stacks_every_bank(baseline):
+    results = [baseline[file] for file in BANK_FILES]
+    panel = build_indicator_panel(results)
+    pd.testing.assert_frame_equal(
+        panel, stacked_series(results)[panel.columns], check_dtype=False
+    )
+    # Results reloaded from JSON (lists with None) give the same panel
+    reloaded = [bank_result_to_json(result) for result in results]
+    pd.testing.assert_frame_equal(build_indicator_panel(reloaded), panel)
+
+
+def test_spearman_and_quantiles_match_pandas(baseline):
+    panel = build_indicator_panel([baseline[file] for file in BANK_FILES])
+
+    # On complete rows, ranking each column once is pandas' Spearman correlation
+    complete = panel.dropna()
+    pd.testing.assert_frame_equal(
+        universe_spearman(complete), complete.corr(method="spearman")
+    )
+
+    quantiles = peer_quantiles(panel)
+    for name, row in quantiles.iterrows():
+        np.testing.assert_allclose(
+            row.to_numpy(),
+            np.nanquantile(panel[name].to_numpy(), PEER_QUANTILES),
+        )
+
+
+def test_saved_peer_quantiles(baseline, tmp_path):
+    results = [baseline[file] for file in BANK_FILES]
+    quantiles = build_and_save_peer_analytics(results, str(tmp_path), "json")
+    with open(tmp_path / "peer_analytics" / "peer_quantiles.json") as f:
+        saved = json.load(f)
+    assert saved["observations"] == len(build_indicator_panel(results))
+    for name, row in quantiles.iterrows():
+        assert saved["quantiles"][name]["q10"] == row[0.10]
+        assert saved["quantiles"][name]["q90"] == row[0.90]
@@ -0,0 +1,84 @@
+"""
+A heatmap drawn on a reused figure must be pixel-identical to one drawn on a fresh
+figure, and stale-only runs must re-render exactly the rewritten matrices.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from project.compute_advanced_indicators.build_correlation_matrix import (
+    build_and_save_correlation_matrix,
+    build_correlation_matrix,
+)
+from project.compute_advanced_indicators.conftest import BANK_FILES
+from project.compute_advanced_indicators.render_heatmaps import (
+    HeatmapRenderer,
+    render_heatmaps,
+)
+
+
+def pixels(path) -> np.ndarray:
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGBA"))
+
+
+def test_reused_figure_matches_fresh_figure(baseline, tmp_path):
+    corr = build_correlation_matrix(baseline[BANK_FILES[0]])
+    # Same labels, other values: the second render reuses the first figure
+    other = corr * 0.5
+    other.iloc[0, 1] = np.nan
+
+    reused = HeatmapRenderer()
+    reused.render(corr, str(tmp_path / "first.png"))
+    reused.render(other, str(tmp_path / "reused.png"))
+    assert len(reused.templates) == 1
+    HeatmapRenderer().render(other, str(tmp_path / "fresh.png"))
+
+    np.testing.assert_array_equal(
+        pixels(tmp_path / "reused.png"), pixels(tmp_path / "fresh.png")
+    )
+    assert not np.array_equal(
+        pixels(tmp_path / "first.png"), pixels(tmp_path / "reused.png")
+    )
+
+
+@pytest.fixture
+def corr_dir(baseline, tmp_path) -> str:
+    directory = str(tmp_path / "correlation_matrices")
+    for file in BANK_FILES:
+        build_and_save_correlation_matrix(
+            baseline[file], directory, file.removesuffix(".xlsx"), "npz"
+        )
+    return directory
+
+
+def test_stale_only_renders_rewritten_matrices(baseline, corr_dir):
+    pngs = render_heatmaps(corr_dir, corr_format="npz")
+    assert [os.path.basename(png) for png in pngs] == [
+        f"{file.removesuffix('.xlsx')}_heatmap.png" for file in BANK_FILES
+    ]
+    assert render_heatmaps(corr_dir, stale_only=True, corr_format="npz") == []
+
+    # Rewrite one matrix after its heatmap
+    base = BANK_FILES[1].removesuffix(".xlsx")
+    png = os.path.join(corr_dir, "heatmaps", f"{base}_heatmap.png")
+    os.utime(png, (0, 0))
+    build_and_save_correlation_matrix(baseline[BANK_FILES[1]], corr_dir, base, "npz")
+    assert render_heatmaps(corr_dir, stale_only=True, corr_format="npz") == [png]
+
+
+def test_other_formats_are_not_checked(baseline, corr_dir):
+    render_heatmaps(corr_dir, corr_format="npz")
+    # The heatmap is newer than its npz matrix, but older than a leftover json one
+    base = BANK_FILES[0].removesuffix(".xlsx")
+    png = os.path.join(corr_dir, "heatmaps", f"{base}_heatmap.png")
+    os.utime(os.path.join(corr_dir, f"{base}_correlation.npz"), (1, 1))
+    os.utime(png, (2, 2))
+    build_and_save_correlation_matrix(
+        baseline[BANK_FILES[0]], corr_dir, base, "json", heatmap=False
+    )
+    assert render_heatmaps(corr_dir, stale_only=True, corr_format="npz") == []
+    assert render_heatmaps(corr_dir, stale_only=True) == [png]
@@ -0,0 +1,100 @@
+"""
+The compiled rule engine must agree with Python's own evaluation of the conditions
+on complete rows, and never hit on a missing value (including under `not`).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from project.compute_advanced_indicators.rule_engine import (
+    PEER_LEVELS,
+    compile_condition,
+    evaluate_rules,
+    panel_env,
+)
+
+PANEL = pd.DataFrame(
+    {
+        "x": [1.0, 5.0, np.nan, 7.0, -3.0],
+        "a": [2.0, 0.0, 2.0, 0.0, np.nan],
+    }
+)
+
+
+def hits(condition: str, panel: pd.DataFrame = PANEL) -> list[bool]:
+    compiled = compile_condition(condition)
+    mask = np.broadcast_to(
+        compiled(panel_env(panel, compiled.variables)), (len(panel),)
+    )
+    return mask.tolist()
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        "x > 1.5",
+        "abs(x) >= 3",
+        "x != 5",
+        "not x > 5",
+        "(x > 0) and (a < 1)",
+        "(x > 6) or (a > 1)",
+        "1 < x < 6",
+        "x * 2 - a <= 4",
+        "not (x > 0 and a > 1)",
+    ],
+)
+def test_matches_python_on_complete_rows(condition):
+    complete = PANEL.dropna()
+    expected = [
+        bool(eval(condition, {"abs": abs}, row.to_dict()))
+        for _, row in complete.iterrows()
+    ]
+    assert hits(condition, complete) == expected
+
+
+@pytest.mark.parametrize(
+    "condition, expected",
+    [
+        ("x != 5", [True, False, False, True, True]),
+        ("not x > 5", [True, True, False, False, True]),
+        ("not (a > 1)", [False, True, False, True, False]),
+        # A known true operand of `or` still hits; a missing one never does
+        ("a > 1 or x > 5", [True, False, True, True, False]),
+        ("not (a > 1 or x > 5)", [False, True, False, False, False]),
+        ("missing > 0", [False] * 5),
+        ("not missing > 0", [False] * 5),
+    ],
+)
+def test_missing_values_never_hit(condition, expected):
+    assert hits(condition) == expected
+
+
+def test_unsupported_expressions_are_rejected():
+    with pytest.raises(ValueError):
+        compile_condition("__import__('os').system('true')")
+    with pytest.raises(ValueError):
+        compile_condition("x >")
+
+
+def test_rules_without_peer_conditions():
+    rules = [
+        {"condition_warning": "x > 1", "condition_critical": "x > 6"},
+        {
+            "condition_warning": "a > 1",
+            "condition_critical": "a > 3",
+            "peer_condition_warning": "a > 0",
+            "peer_condition_critical": "a > 1",
+        },
+    ]
+    result = evaluate_rules(rules, PANEL)
+    assert result["WARNING"][0].tolist() == [False, True, False, True, False]
+    assert result["CRITICAL"][0].tolist() == [False, False, False, True, False]
+
+    # Rules without a peer condition never hit
+    peer = evaluate_rules(rules, PANEL, PEER_LEVELS)
+    assert not peer["WARNING"][0].any()
+    assert peer["WARNING"][1].tolist() == [True, False, True, False, False]
+
+    with pytest.raises(ValueError, match="peer_condition_warning"):
+        evaluate_rules(rules[:1], PANEL, PEER_LEVELS)
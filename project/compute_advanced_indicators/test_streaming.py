@@ -0,0 +1,109 @@
+"""
+Streaming a multi-bank CSV must give every bank the result of its own per-bank file,
+whether banks span several chunks or their rows are interleaved (unsorted mode).
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    BANK_NAME_COL,
+    DATE_COL,
+    assert_same_result,
+    baseline_result,
+)
+from project.compute_advanced_indicators.main import process_stream
+from project.compute_advanced_indicators.streaming import (
+    BankKeys,
+    UnsortedInputError,
+    iter_bank_frames,
+)
+from project.compute_advanced_indicators.utils import read_bank_data
+
+
+@pytest.fixture(scope="module")
+def bank_csvs(bank_dir, tmp_path_factory) -> dict[str, str]:
+    """One CSV per bank, keyed by bank name (the per-bank baseline inputs)."""
+    directory = tmp_path_factory.mktemp("bank_csv")
+    paths = {}
+    for file in BANK_FILES:
+        df = read_bank_data(os.path.join(bank_dir, file))
+        path = str(directory / file.replace(".xlsx", ".csv"))
+        df.to_csv(path, index=False)
+        paths[df[BANK_NAME_COL].iloc[0]] = path
+    return paths
+
+
+def write_universe(bank_csvs: dict, path: str, interleaved: bool = False) -> str:
+    frames = [pd.read_csv(csv) for csv in bank_csvs.values()]
+    if interleaved:
+        # Round-robin over the banks; each bank keeps its own row order
+        rows = [
+            frame.iloc[[i]]
+            for i in range(max(map(len, frames)))
+            for frame in frames
+            if i < len(frame)
+        ]
+        frames = rows
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def stream(input_file: str, output_dir: str, **options) -> list[dict]:
+    return list(
+        process_stream(
+            input_file,
+            output_dir,
+            date_col_name=DATE_COL,
+            bank_name_col=BANK_NAME_COL,
+            heatmap=False,
+            **options,
+        )
+    )
+
+
+@pytest.mark.parametrize("presorted, interleaved", [(True, False), (False, True)])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stream_matches_per_bank_files(
+    presorted, interleaved, workers, bank_csvs, tmp_path
+):
+    input_file = write_universe(bank_csvs, str(tmp_path / "all.csv"), interleaved)
+    # Small chunks so that every bank spans several of them
+    results = stream(
+        input_file,
+        str(tmp_path),
+        chunksize=7,
+        presorted=presorted,
+        workers=workers,
+    )
+
+    names = list(bank_csvs) if presorted else sorted(bank_csvs)
+    assert [result["meta"]["bank_name"] for result in results] == names
+    for result in results:
+        expected = baseline_result(
+            bank_csvs[result["meta"]["bank_name"]], source_file="all.csv"
+        )
+        assert_same_result(result, expected)
+        key = BankKeys().key(result["meta"]["bank_name"])
+        assert os.path.exists(tmp_path / f"{key}_indicators.json")
+
+
+def test_sorted_mode_rejects_interleaved_input(bank_csvs, tmp_path):
+    input_file = write_universe(bank_csvs, str(tmp_path / "all.csv"), True)
+    with pytest.raises(UnsortedInputError, match="--unsorted"):
+        list(iter_bank_frames(input_file, BANK_NAME_COL, chunksize=7))
+
+
+def test_bank_keys_add_a_hash_only_on_collisions():
+    keys = BankKeys()
+    assert keys.key("Bank of China") == "Bank_of_China"
+    assert keys.key("Bank A") == "Bank_A"
+    collision = keys.key("Bank/A")
+    assert collision.startswith("Bank_A_") and collision != "Bank_A"
+    # Stable for a name already seen
+    assert keys.key("Bank A") == "Bank_A"
+    assert keys.key("Bank/A") == collision
+    assert keys.key("***") == "bank"
@@ -0,0 +1,69 @@
+"""
+The batched table writer must write the rows of the original one-shot table, in every
+format, and remove a partially written table when the run fails.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    ORIGINAL_OUTPUT_DIR,
+)
+from project.compute_advanced_indicators.options import (
+    TABLE_FORMATS,
+    parquet_available,
+)
+from project.compute_advanced_indicators.table_writer import (
+    BankTableWriter,
+    export_table_to_excel,
+    table_row,
+)
+
+READERS = {"csv": pd.read_csv, "parquet": pd.read_parquet, "xlsx": pd.read_excel}
+
+
+def assert_same_table(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("table_format", TABLE_FORMATS)
+def test_batches_match_original_table(table_format, baseline, tmp_path):
+    if table_format == "parquet" and not parquet_available():
+        pytest.skip("pyarrow is not installed")
+    path = str(tmp_path / f"table.{table_format}")
+    with BankTableWriter(path, batch_size=2) as writer:
+        writer.update(baseline[file] for file in BANK_FILES)
+
+    # The table the original pipeline wrote for the same banks
+    original = pd.read_excel(
+        os.path.join(ORIGINAL_OUTPUT_DIR, "bank_indicators_table.xlsx")
+    )
+    original = original.set_index("source_file", drop=False).loc[BANK_FILES]
+    table = READERS[table_format](path)
+    assert table.columns.tolist() == original.columns.tolist()
+    assert_same_table(table, original)
+    assert_same_table(table, pd.DataFrame([table_row(baseline[f]) for f in BANK_FILES]))
+
+
+def test_csv_export_to_excel(baseline, tmp_path):
+    csv_file = str(tmp_path / "table.csv")
+    with BankTableWriter(csv_file) as writer:
+        writer.update(baseline[file] for file in BANK_FILES)
+    export_table_to_excel(csv_file, str(tmp_path / "table.xlsx"), chunksize=2)
+    assert_same_table(pd.read_excel(tmp_path / "table.xlsx"), pd.read_csv(csv_file))
+
+
+def test_failed_run_removes_the_table(baseline, tmp_path):
+    path = tmp_path / "table.csv"
+    with pytest.raises(RuntimeError):
+        with BankTableWriter(str(path), batch_size=1) as writer:
+            writer.add(baseline[BANK_FILES[0]])
+            raise RuntimeError("run failed")
+    assert not path.exists()
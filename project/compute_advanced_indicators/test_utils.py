@@ -0,0 +1,132 @@
+"""
+The streaming top-k must rank banks like sorting every bank's summary row, as the
+original create_summary did (with ties kept in arrival order), and bank results must
+serialise to the JSON the original pipeline wrote.
+"""
+
+import json
+import os
+import random
+
+import pandas as pd
+import pytest
+from rich.console import Console
+
+from project.compute_advanced_indicators.conftest import (
+    BANK_FILES,
+    ORIGINAL_OUTPUT_DIR,
+)
+from project.compute_advanced_indicators.utils import (
+    THRESHOLDS,
+    TopKRanker,
+    create_summary,
+    detect_flags,
+    jsonl_line,
+    ranking_key,
+    save_json,
+)
+
+
+def random_banks(count: int, seed: int = 0) -> list[dict]:
+    """Banks with few distinct flag counts (many ties) and some missing indicators."""
+    rng = random.Random(seed)
+    banks = []
+    for b in range(count):
+        indicators = {}
+        for key, item in THRESHOLDS.items():
+            r = rng.random()
+            if r < 0.2:
+                indicators[key] = None
+            else:
+                spread = abs(item["threshold"]) or 1
+                indicators[key] = round(
+                    item["threshold"] + rng.uniform(-1, 1) * spread, 2
+                )
+        banks.append(
+            {
+                "meta": {"bank_name": f"Bank {b}"},
+                "indicators": indicators,
+                "flags": detect_flags(indicators),
+            }
+        )
+    return banks
+
+
+def reference_rows(banks: list[dict], k: int, key) -> list[dict]:
+    """Summary rows of every bank, stable-sorted by the ranking key, first k kept."""
+    rows = []
+    for bank in banks:
+        flags = {f: v for f, v in bank["flags"].items() if v is not None}
+        rows.append(
+            (
+                key(bank),
+                {
+                    "bank_name": bank["meta"]["bank_name"],
+                    "flag_count": sum(flags.values()),
+                    "flagged_indicators": ", ".join(
+                        f"{f} ({bank['indicators'][f]})" for f, v in flags.items() if v
+                    ),
+                },
+            )
+        )
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return [row for _, row in rows[:k]]
+
+
+@pytest.mark.parametrize("rank_by", ["flag_count", "severity"])
+@pytest.mark.parametrize("k", [1, 3, 5, 500])
+def test_top_k_matches_full_sort(rank_by, k):
+    banks = random_banks(200)
+    key = ranking_key(rank_by)
+    ranked = TopKRanker(k, key).update(banks).ranked()
+    assert ranked == reference_rows(banks, k, key)
+
+
+def test_summary_file(tmp_path):
+    banks = random_banks(30, seed=1)
+    create_summary(iter(banks), str(tmp_path), Console(quiet=True), top_k=3)
+    lines = (tmp_path / "summary.txt").read_text().splitlines()
+    assert lines[0] == "Top 3 Most Risky Banks Based on Threshold Breaches:"
+    expected = reference_rows(banks, 3, ranking_key("flag_count"))
+    assert lines[2:] == [
+        f"{row['bank_name']} — Flags: {row['flag_count']} | Indicators: {row['flagged_indicators']}"
+        for row in expected
+    ]
+
+
+def test_severity_uses_the_flagging_thresholds():
+    strict = {**THRESHOLDS, "Duration_Gap": {"threshold": 5.0, "sign": ">"}}
+    bank = {"flags": {"Duration_Gap": True}, "indicators": {"Duration_Gap": 6.0}}
+    assert ranking_key("severity")(bank) == (1, pytest.approx(1.0))
+    assert ranking_key("severity", strict)(bank) == (1, pytest.approx(0.2))
+
+
+def test_k_must_be_positive():
+    with pytest.raises(ValueError):
+        TopKRanker(0)
+
+
+@pytest.mark.parametrize("file", BANK_FILES)
+def test_json_matches_original_outputs(file, baseline, tmp_path):
+    with open(
+        os.path.join(
+            ORIGINAL_OUTPUT_DIR, f"{file.removesuffix('.xlsx')}_indicators.json"
+        ),
+        "r",
+    ) as f:
+        original = f.read()
+    result = {**baseline[file], "outputs": {"corr": pd.DataFrame(), "rules": []}}
+    save_json(result, str(tmp_path / "pretty.json"))
+    assert (tmp_path / "pretty.json").read_text() == original
+
+    save_json(result, str(tmp_path / "compact.json"), "compact")
+    with open(tmp_path / "compact.json", "r") as f:
+        assert json.load(f) == json.loads(original)
+    assert json.loads(jsonl_line(result)) == json.loads(original)
+
+    # The result itself is left untouched
+    assert "outputs" in result
+    assert all(
+        v is None or isinstance(v, pd.Series)
+        for v in result["indicators_full"].values()
+    )
@@ -1,9 +1,20 @@
 import pandas as pd
+import numpy as np
+import heapq
 import json
 import os
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterable
 from rich.table import Table
 from rich import box
 from rich.console import Console
+from project.compute_advanced_indicators.bank_data_cache import (
+    DEFAULT_MAX_CACHE_BYTES,
+    read_with_cache,
+)
+from project.compute_advanced_indicators.options import JSON_FORMATS
+from project.compute_advanced_indicators.table_writer import BankTableWriter
 
 THRESHOLDS = {
     # Liquidity: if > 1.5, the bank has issued more loans than it has collected in deposits
@@ -37,16 +48,17 @@ THRESHOLDS = {
 }
 
 
-def detect_flags(indicators: dict) -> dict:
+def detect_flags(indicators: dict, thresholds: dict = THRESHOLDS) -> dict:
     """
     Detect flags based on computed indicators and predefined thresholds.
+    For the whole universe at once, see flagging.detect_flags_frame.
 
     True is Bad, False is Good.
     """
     flags = {}
     for key, value in indicators.items():
-        threshold = THRESHOLDS[key]["threshold"]
-        sign = THRESHOLDS[key]["sign"]
+        threshold = thresholds[key]["threshold"]
+        sign = thresholds[key]["sign"]
         if value is None or pd.isna(value):
             flags[key] = None
             continue
@@ -60,37 +72,137 @@ def detect_flags(indicators: dict) -> dict:
     return flags
 
 
+def build_bank_result(
+    meta: dict,
+    indicators_full: dict,
+    indicators: dict,
+    quality: dict,
+    thresholds: dict = THRESHOLDS,
+) -> dict:
+    """Assemble the per-bank result: drop empty series, round aggregates and detect flags."""
+    indicators_full = {
+        k: None if v is None or v.empty else v for k, v in indicators_full.items()
+    }
+    indicators = {k: None if v is None else round(v, 2) for k, v in indicators.items()}
+
+    return {
+        "meta": meta,
+        "indicators_full": indicators_full,
+        "indicators": indicators,
+        "quality": quality,
+        "flags": detect_flags(indicators, thresholds),
+    }
+
+
+def flag_count_key(bank: dict) -> tuple:
+    """Rank by the number of breached thresholds."""
+    return (sum(v for v in bank["flags"].values() if v is not None),)
+
+
+def severity_key(bank: dict, thresholds: dict = THRESHOLDS) -> tuple:
+    """
+    Rank by the number of breached thresholds, ties broken by severity:
+    the summed relative distance of the breached indicators beyond their thresholds.
+    thresholds must be the ones the bank's flags were detected with.
+    """
+    severity = 0.0
+    for key, flag in bank["flags"].items():
+        if flag:
+            threshold = thresholds[key]["threshold"]
+            severity += abs(bank["indicators"][key] - threshold) / max(
+                abs(threshold), 1e-9
+            )
+    return flag_count_key(bank) + (severity,)
+
+
+RANKING_KEYS = {"flag_count": flag_count_key, "severity": severity_key}
+
+
+def ranking_key(rank_by: str, thresholds: dict = THRESHOLDS) -> Callable[[dict], tuple]:
+    """Ranking key of RANKING_KEYS, bound to the thresholds the flags were detected with."""
+    if rank_by == "severity":
+        return partial(severity_key, thresholds=thresholds)
+    return RANKING_KEYS[rank_by]
+
+
+class TopKRanker:
+    """
+    Streaming top-k of the riskiest banks.
+    Bank results are consumed one at a time into a min-heap of size k, so memory and work
+    do not grow with the universe. Ties on the key keep the order banks were added in.
+    """
+
+    def __init__(self, k: int = 5, key: Callable[[dict], tuple] = flag_count_key):
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.k = k
+        self.key = key
+        self.heap = []
+        self.seen = 0
+
+    def add(self, bank: dict) -> None:
+        # Later arrivals compare lower on equal keys, so they are evicted first
+        item = (self.key(bank), -self.seen, bank)
+        self.seen += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def update(self, banks: Iterable[dict]) -> "TopKRanker":
+        for bank in banks:
+            self.add(bank)
+        return self
+
+    def ranked(self) -> list[dict]:
+        """Summary rows of the top-k banks, riskiest first."""
+        rows = []
+        for key, _, bank in sorted(self.heap, key=lambda item: item[:2], reverse=True):
+            flags = bank["flags"]
+            indicators = bank["indicators"]
+            rows.append(
+                {
+                    "bank_name": bank["meta"].get("bank_name", "Unknown Bank"),
+                    "flag_count": key[0],
+                    "flagged_indicators": ", ".join(
+                        f"{k} ({indicators[k]})" for k, v in flags.items() if v
+                    ),
+                }
+            )
+        return rows
+
+
 def create_summary(
-    result_bank_indicators: pd.DataFrame, output_dir: str, console: Console
+    result_bank_indicators: Iterable[dict] | TopKRanker,
+    output_dir: str,
+    console: Console,
+    top_k: int = 5,
+    rank_by: str = "flag_count",
+    thresholds: dict = THRESHOLDS,
 ) -> None:
-    """Create a summary of the top 5 banks with the most risk based on threshold breaches."""
-    summary_rows = []
-    for bank in result_bank_indicators:
-        flags = bank["flags"]
-        indicators = bank["indicators"]
-        bank_name = bank["meta"].get("bank_name", "Unknown Bank")
-        not_none_flags = {k: v for k, v in flags.items() if v is not None}
-        count_flags = sum(not_none_flags.values())
-        flagged = ", ".join(
-            [f"{k} ({indicators[k]})" for k, v in not_none_flags.items() if v]
+    """
+    Create a summary of the top-k banks with the most risk based on threshold breaches.
+    Accepts bank results (consumed one at a time) or an already filled TopKRanker.
+    thresholds are the ones the flags were detected with (for the severity ranking).
+    """
+    if isinstance(result_bank_indicators, TopKRanker):
+        ranker = result_bank_indicators
+    else:
+        ranker = TopKRanker(top_k, ranking_key(rank_by, thresholds)).update(
+            result_bank_indicators
         )
-        summary_rows.append((bank_name, count_flags, flagged))
-
-    summary_df = pd.DataFrame(
-        summary_rows, columns=["bank_name", "flag_count", "flagged_indicators"]
-    )
-    summary_df = summary_df.sort_values("flag_count", ascending=False).head(5)
+    summary_rows = ranker.ranked()
 
     summary_file = os.path.join(output_dir, "summary.txt")
     with open(summary_file, "w") as f:
-        f.write("Top 5 Most Risky Banks Based on Threshold Breaches:\n\n")
-        for _, row in summary_df.iterrows():
+        f.write(f"Top {ranker.k} Most Risky Banks Based on Threshold Breaches:\n\n")
+        for row in summary_rows:
             f.write(
                 f"{row['bank_name']} — Flags: {row['flag_count']} | Indicators: {row['flagged_indicators']}\n"
             )
 
     table = Table(
-        title="Top 5 Most Risky Banks",
+        title=f"Top {ranker.k} Most Risky Banks",
         title_style="bold magenta",
         box=box.SIMPLE_HEAVY,
     )
@@ -98,7 +210,7 @@ def create_summary(
     table.add_column("Flags Count", justify="right", style="red")
     table.add_column("Flagged Indicators", style="yellow")
 
-    for _, row in summary_df.iterrows():
+    for row in summary_rows:
         table.add_row(
             row["bank_name"], str(row["flag_count"]), row["flagged_indicators"]
         )
@@ -107,60 +219,192 @@ def create_summary(
     console.print(table)
 
 
+class FrameMemo:
+    """
+    Per-DataFrame memo of column availability and shared intermediate series.
+    Active only inside `frame_memo(df)`, so each column is scanned and each derived series built once per bank.
+    """
+
+    def __init__(self, df: pd.DataFrame, available: dict[str, bool] | None = None):
+        self.df = df
+        self.available = dict(available or {})
+        self.nonzero = {}
+        self.shared = {}
+
+
+_FRAME_MEMOS: dict[int, FrameMemo] = {}
+
+
+@contextmanager
+def frame_memo(df: pd.DataFrame, available: dict[str, bool] | None = None):
+    """
+    Enable memoisation of the helpers below for `df` while the context is active.
+    `available` optionally pre-seeds the column availability (used by the panel engine).
+    """
+    memo = FrameMemo(df, available)
+    _FRAME_MEMOS[id(df)] = memo
+    try:
+        yield memo
+    finally:
+        del _FRAME_MEMOS[id(df)]
+
+
+def _column_available(df: pd.DataFrame, col: str) -> bool:
+    return col in df.columns and not df[col].isna().all()
+
+
 def cols_exist_and_not_na(df: pd.DataFrame, cols: list[str]) -> bool:
     """Helper function to check if all columns exist and are not all NaN"""
-    return all(col in df.columns and not df[col].isna().all() for col in cols)
+    memo = _FRAME_MEMOS.get(id(df))
+    if memo is None:
+        return all(_column_available(df, col) for col in cols)
+
+    for col in cols:
+        if col not in memo.available:
+            memo.available[col] = _column_available(df, col)
+        if not memo.available[col]:
+            return False
+    return True
+
+
+def nonzero(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column with zeros replaced by NaN, for use as a ratio denominator."""
+    memo = _FRAME_MEMOS.get(id(df))
+    if memo is None:
+        return df[col].replace(0, np.nan)
+    if col not in memo.nonzero:
+        memo.nonzero[col] = df[col].replace(0, np.nan)
+    return memo.nonzero[col]
+
+
+def shared(df: pd.DataFrame, key: str, build: Callable[[], Any]) -> Any:
+    """Intermediate result used by several indicators (e.g. OCI), built once per bank."""
+    memo = _FRAME_MEMOS.get(id(df))
+    if memo is None:
+        return build()
+    if key not in memo.shared:
+        memo.shared[key] = build()
+    return memo.shared[key]
+
+
+def indicator_result(indicator_full: pd.Series | None, quality: str) -> dict:
+    """Standard indicator result; the aggregate is derived from the series."""
+    return {
+        "indicator_full": indicator_full,
+        "indicator": None if indicator_full is None else indicator_full.mean(),
+        "quality": quality,
+    }
+
 
+def _json_values(value) -> list:
+    """Series/array to a list of Python scalars with NaN as None (one vectorised mask)."""
+    values = np.asarray(value)
+    result = values.tolist()
+    for i in np.flatnonzero(pd.isna(values)):
+        result[i] = None
+    return result
 
-def save_json(data: dict, filename: str):
-    """Save the computed indicators to a JSON file."""
 
-    for key, value in data["indicators_full"].items():
-        if value is not None:
-            value = [None if pd.isna(v) else v for v in value.tolist()]
-            data["indicators_full"][key] = value
+def bank_result_to_json(data: dict) -> dict:
+    """
+    JSON-ready copy of a bank result; the result itself is left untouched.
+    The in-memory "outputs" (correlation matrix and rules) are not part of the JSON.
+    """
+    return {
+        **{k: v for k, v in data.items() if k != "outputs"},
+        "indicators_full": {
+            k: None if v is None else _json_values(v)
+            for k, v in data["indicators_full"].items()
+        },
+        "indicators": {
+            k: None if pd.isna(v) else v for k, v in data["indicators"].items()
+        },
+    }
 
-    for key, item in data["indicators"].items():
-        if pd.isna(item):
-            data["indicators"][key] = None
 
+def save_json(data: dict, filename: str, json_format: str = "pretty"):
+    """
+    Save the computed indicators to a JSON file.
+    'pretty' is indented for reading; 'compact' has no whitespace and is faster to write and load.
+    """
+    if json_format not in JSON_FORMATS:
+        raise ValueError(
+            f"Unsupported JSON format: {json_format}. Use one of {JSON_FORMATS}."
+        )
+    if json_format == "pretty":
+        text = json.dumps(bank_result_to_json(data), indent=4, ensure_ascii=False)
+    else:
+        text = json.dumps(
+            bank_result_to_json(data), separators=(",", ":"), ensure_ascii=False
+        )
     with open(filename, "w") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.write(text)
 
 
-def read_bank_data(file_path: str) -> pd.DataFrame:
-    """Read bank data from a CSV or Excel file."""
+def jsonl_line(data: dict) -> str:
+    """One bank result as a compact JSON Lines record."""
+    return (
+        json.dumps(bank_result_to_json(data), separators=(",", ":"), ensure_ascii=False)
+        + "\n"
+    )
+
+
+def save_jsonl(results: Iterable[dict], filename: str):
+    """Save bank results as JSON Lines: one compact JSON object per bank."""
+    with open(filename, "w") as f:
+        for data in results:
+            f.write(jsonl_line(data))
+
+
+def _parse_bank_data(file_path: str, usecols=None) -> pd.DataFrame:
+    """Parse a CSV or Excel file without any caching."""
     if file_path.endswith(".csv"):
-        return pd.read_csv(file_path)
+        return pd.read_csv(file_path, usecols=usecols)
     elif file_path.endswith(".xlsx"):
-        return pd.read_excel(file_path)
+        return pd.read_excel(file_path, usecols=usecols)
     else:
         raise ValueError("Unsupported file format. Please provide a CSV or Excel file.")
 
 
-def save_bank_indicators_to_table(
-    indicators: list[dict],
-    output_file: str,
-):
-    """Save the computed indicators to a table format (CSV or Excel)."""
+def read_bank_data(
+    file_path: str,
+    use_cache: bool = False,
+    cache_dir: str | None = None,
+    max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Read bank data from a CSV or Excel file.
+    With use_cache, parsed files are cached on disk (see bank_data_cache) so unchanged files
+    are parsed only once. The cache stores pickles: only enable it for a cache directory
+    nobody else can write to.
+    If `columns` is given, only those of them present in the file are returned (missing ones are ignored).
+    """
+    if not file_path.endswith((".csv", ".xlsx")):
+        raise ValueError("Unsupported file format. Please provide a CSV or Excel file.")
 
-    flattened_data = []
-    for indicator in indicators:
-        row = {}
+    if not use_cache:
+        # Skip parsing of unused columns entirely
+        usecols = None if columns is None else set(columns).__contains__
+        return _parse_bank_data(file_path, usecols=usecols)
 
-        row.update(indicator["meta"])
-        row.update(indicator["indicators"])
-        row.update({f"{k}_quality": i for k, i in indicator["quality"].items()})
-        row.update({f"{k}_flag": i for k, i in indicator["flags"].items()})
-        flattened_data.append(row)
+    # The cache keeps whole files so that any column subset can be served from it
+    df = read_with_cache(
+        file_path, _parse_bank_data, cache_dir=cache_dir, max_bytes=max_cache_bytes
+    )
+    if columns is not None:
+        wanted = set(columns)
+        df = df[[col for col in df.columns if col in wanted]]
+    return df
 
-    df = pd.DataFrame(flattened_data)
 
-    if output_file.endswith(".csv"):
-        df.to_csv(output_file, index=False)
-    elif output_file.endswith(".xlsx"):
-        df.to_excel(output_file, index=False)
-    else:
-        raise ValueError(
-            "Unsupported output file format. Please provide a CSV or Excel file."
-        )
+def save_bank_indicators_to_table(
+    indicators: Iterable[dict],
+    output_file: str,
+):
+    """
+    Save the computed indicators to a table format (CSV, Parquet or Excel).
+    Rows are written in batches as the results are consumed (see table_writer).
+    """
+    with BankTableWriter(output_file) as writer:
+        writer.update(indicators)
@@ -1,8 +1,15 @@
 import re
+import mmap
 import pandas as pd
 import logging
 import os
-from typing import List, Dict, Optional
+import argparse
+import glob
+import json
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
 os.makedirs("project/logs", exist_ok=True)
 os.makedirs("output", exist_ok=True)
@@ -14,6 +21,263 @@ logging.basicConfig(
 )
 
 
+# Number and optional unit following an indicator name (or alias):
+# non-numeric chars between name and number, the number (int or float), optional whitespace
+# and one of the units %, CHF bn, billion, million
+VALUE_REGEX = r"[^0-9\-+,.]*([-+]?\d+(?:\.\d+)?)\s*(%|CHF\s*bn|billion|million)?"
+YEAR_REGEX = r"(?:FY[\s\-:]?|year(?:-end)?|as of|in)[\s\-:]*(20\d{2})"
+
+# str patterns for text read into memory, bytes patterns for memory-mapped files
+VALUE_PATTERNS = {
+    False: re.compile(VALUE_REGEX, flags=re.IGNORECASE),
+    True: re.compile(VALUE_REGEX.encode(), flags=re.IGNORECASE),
+}
+YEAR_PATTERNS = {
+    False: re.compile(YEAR_REGEX, flags=re.IGNORECASE),
+    True: re.compile(YEAR_REGEX.encode(), flags=re.IGNORECASE),
+}
+
+# Phrase after a value that introduces the comparison figure ("14.3%, compared to 13.5%")
+COMPARISON_REGEX = (
+    r"[\s,;]*(?:compared\s+(?:to|with)|versus|vs\.?|against|(?:up\s+|down\s+)?from)\b"
+)
+# Any year token (FY2023, 2022:, in 2021), not part of a longer number or a percentage
+YEAR_TOKEN_REGEX = r"(?<![\d.])(?:FY[\s\-:]?)?(20\d{2})(?![\d%]|\.\d)"
+# A year is taken after a value up to the next clause break, or before it back to the
+# previous sentence break
+CLAUSE_BREAK_REGEX = r"[,;:()!?\n]|\.(?!\d)"
+SENTENCE_BREAK_REGEX = r"[!?\n]|\.(?!\d)"
+
+COMPARISON_PATTERNS = {
+    False: re.compile(COMPARISON_REGEX, flags=re.IGNORECASE),
+    True: re.compile(COMPARISON_REGEX.encode(), flags=re.IGNORECASE),
+}
+YEAR_TOKEN_PATTERNS = {
+    False: re.compile(YEAR_TOKEN_REGEX, flags=re.IGNORECASE),
+    True: re.compile(YEAR_TOKEN_REGEX.encode(), flags=re.IGNORECASE),
+}
+CLAUSE_BREAK_PATTERNS = {
+    False: re.compile(CLAUSE_BREAK_REGEX),
+    True: re.compile(CLAUSE_BREAK_REGEX.encode()),
+}
+SENTENCE_BREAK_PATTERNS = {
+    False: re.compile(SENTENCE_BREAK_REGEX),
+    True: re.compile(SENTENCE_BREAK_REGEX.encode()),
+}
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Regex alternation of `words` built as a prefix trie, so the engine branches on one
+    character at a time instead of trying every word, and the longest word wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [
+            re.escape(char) + build(child) for char, child in node.items() if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if end else body
+
+    return build(trie)
+
+
+class IndicatorScanner:
+    """
+    Finds the first value of every indicator in a single pass over the text.
+
+    All aliases are compiled once into one trie-shaped pattern. At every position where an
+    alias starts, the pattern gives the longest one; the shorter aliases matching at that
+    position are its prefixes. Each indicator then takes its first alias (canonical name
+    first) followed by a number, which is the match `re.search` would return for the
+    indicator's own alternation.
+
+    With `binary=True` the scanner runs over bytes (e.g. a memory-mapped file): aliases
+    are matched as UTF-8 and case is only ignored for ASCII letters.
+    """
+
+    def __init__(
+        self,
+        indicators: Tuple[Tuple[str, Tuple[str, ...]], ...],
+        binary: bool = False,
+    ):
+        self.binary = binary
+        self.indicators = [
+            (
+                name,
+                [
+                    alias.encode().lower() if binary else alias.lower()
+                    for alias in (name,) + aliases
+                    if alias
+                ],
+            )
+            for name, aliases in indicators
+        ]
+        words = sorted({alias for _, aliases in self.indicators for alias in aliases})
+        self.owners = {word: [] for word in words}
+        for i, (_, aliases) in enumerate(self.indicators):
+            for alias in dict.fromkeys(aliases):
+                self.owners[alias].append(i)
+        self.prefixes = {
+            word: [other for other in words if word.startswith(other)] for word in words
+        }
+        # Lookahead: zero-width, so overlapping alias occurrences are all found.
+        # The leading character class lets the engine skip positions cheaply.
+        if binary:
+            # latin-1 maps every byte to one character, so the trie is built byte-wise
+            words = [word.decode("latin-1") for word in words]
+        first = "".join(sorted({re.escape(word[0]) for word in words}))
+        pattern = f"(?=[{first}])(?=({_trie_pattern(words)}))" if words else "(?!)"
+        if binary:
+            pattern = pattern.encode("latin-1")
+        self.pattern = re.compile(pattern, flags=re.IGNORECASE)
+        self.value_pattern = VALUE_PATTERNS[binary]
+        self.comparison_pattern = COMPARISON_PATTERNS[binary]
+
+    def _alias_values(self, text, skip=()):
+        """
+        Yields (indicator index, value match) for every alias occurrence followed by a
+        number, in text order. Indicators in `skip` (which may grow meanwhile) are ignored.
+        """
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1).lower()
+            matching = self.prefixes.get(longest)
+            if matching is None:
+                # Case-insensitive match whose lowercase differs from the alias (non-ASCII)
+                matching = [word for word in self.owners if longest.startswith(word)]
+
+            candidates = {i for word in matching for i in self.owners[word]}
+            values = {}
+            for i in sorted(candidates):
+                if i in skip:
+                    continue
+                for alias in self.indicators[i][1]:
+                    if alias not in matching:
+                        continue
+                    end = start + len(alias)
+                    if end not in values:
+                        values[end] = self.value_pattern.match(text, end)
+                    if values[end]:
+                        yield i, values[end]
+                        break
+
+    def _strings(self, value) -> Tuple[str, str]:
+        number, unit = value.group(1), value.group(2)
+        if self.binary:
+            number = number.decode()
+            unit = unit and unit.decode()
+        return number, unit or ""
+
+    def scan(self, text) -> Dict[str, Tuple[str, str]]:
+        """Map each found indicator to its (value, unit) strings."""
+        found = {}
+        done = set()
+        for i, value in self._alias_values(text, skip=done):
+            found[self.indicators[i][0]] = self._strings(value)
+            done.add(i)
+            if len(done) == len(self.indicators):
+                break
+        return found
+
+    def scan_all(self, text) -> List[Tuple[str, int, int, str, str]]:
+        """
+        Every mention of every indicator as (indicator, start, end, value, unit), where
+        start and end are the offsets of the number and its unit, sorted by start.
+        A number introduced by a comparison right after a mention ("14.3%, compared to
+        13.5%") is another mention of the same indicator.
+        """
+        mentions = {}
+        for i, value in self._alias_values(text):
+            name = self.indicators[i][0]
+            while value is not None:
+                key = (name, value.start(1))
+                if key in mentions:
+                    break
+                number, unit = self._strings(value)
+                mentions[key] = (name, value.start(1), value.end(), number, unit)
+                comparison = self.comparison_pattern.match(text, value.end())
+                value = comparison and self.value_pattern.match(text, comparison.end())
+        return sorted(mentions.values(), key=lambda mention: mention[1])
+
+
+class YearIndex:
+    """
+    Sorted offsets of the year tokens of a text, to find the year of a value by binary
+    search instead of re-parsing the text for every year.
+    """
+
+    def __init__(self, text, binary: bool = False):
+        self.text = text
+        self.clause_break = CLAUSE_BREAK_PATTERNS[binary]
+        self.sentence_break = SENTENCE_BREAK_PATTERNS[binary]
+        self.offsets = []
+        self.years = []
+        for match in YEAR_TOKEN_PATTERNS[binary].finditer(text):
+            self.offsets.append(match.start())
+            self.years.append(int(match.group(1)))
+
+    def year_of(
+        self, start: int, end: int, default: Optional[int] = None
+    ) -> int | None:
+        """
+        Year of the value at text[start:end]: the nearest year token after it within the
+        same clause ("13.5% in FY2022"), otherwise the nearest one before it within the
+        same sentence ("As of FY2023, ... 14.3%"), otherwise `default`.
+        """
+        after = bisect_left(self.offsets, end)
+        if after < len(self.offsets) and not self.clause_break.search(
+            self.text, end, self.offsets[after]
+        ):
+            return self.years[after]
+        before = bisect_left(self.offsets, start) - 1
+        if before >= 0 and not self.sentence_break.search(
+            self.text, self.offsets[before], start
+        ):
+            return self.years[before]
+        return default
+
+
+def normalize_unit(unit_raw: str) -> str:
+    """Normalize units to consistent representation (%, BN, MN, CHF BN)."""
+    unit = unit_raw.strip().lower()
+    if unit in ["billion", "million"]:
+        # Convert textual units to abbreviation
+        if unit == "billion":
+            unit = "bn"
+        elif unit == "million":
+            unit = "mn"
+    return unit.upper() if unit else ""
+
+
+def alias_key(
+    indicators: Dict[str, List[str]],
+) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Hashable form of an alias dictionary, used to cache its scanner."""
+    return tuple((name, tuple(aliases)) for name, aliases in indicators.items())
+
+
+@lru_cache(maxsize=32)
+def get_scanner(
+    indicators: Tuple[Tuple[str, Tuple[str, ...]], ...],
+    binary: bool = False,
+) -> IndicatorScanner:
+    """Scanner for an alias set, compiled once and reused for every text."""
+    return IndicatorScanner(indicators, binary)
+
+
+MENTION_COLUMNS = ["Indicator", "Value", "Unit", "Year", "Start", "End"]
+
+
 class Parser:
     """
     Defines the `Parser` class which provides functionality to read, parse,
@@ -27,25 +291,60 @@ class Parser:
         logging.info("Parser initialized")
         self.input_txt = None
 
-    def read_file(self, file_name: str) -> None:
+    def read_file(self, file_name: str, memory_map: bool = False) -> None:
         """
         Reads the content of a given file and stores it as a stripped string.
 
+        With `memory_map=True` the file is memory-mapped instead: the text is never
+        copied into a Python string, and the regexes scan the mapped bytes directly
+        (the OS pages the file in and out as needed), so very large files do not need
+        twice their size in memory. The file must be UTF-8 (or ASCII) encoded.
+
         :param file_name: The name or path of the file to be read
         :type file_name: str
+        :param memory_map: Memory-map the file instead of reading it into a string
+        :type memory_map: bool
         :raises Exception: If an error occurs during the file reading process
         :return: None
         """
         logging.info(f"Reading file {file_name}")
 
         try:
-            with open(file_name, "r") as f:
-                self.input_txt = f.read().strip()
-
+            self.load_file(file_name, memory_map)
             logging.info(f"File {file_name} read successfully")
         except Exception:
             logging.error(f"Error reading file {file_name}", exc_info=True)
 
+    def load_file(self, file_name: str, memory_map: bool = False) -> None:
+        """Same as `read_file`, but errors are raised instead of logged."""
+        self.close()
+        if memory_map:
+            with open(file_name, "rb") as f:
+                # An empty file cannot be mapped
+                if os.fstat(f.fileno()).st_size == 0:
+                    self.input_txt = ""
+                else:
+                    self.input_txt = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            with open(file_name, "r") as f:
+                self.input_txt = f.read().strip()
+
+    def close(self) -> None:
+        """Releases a memory-mapped input file."""
+        if isinstance(self.input_txt, mmap.mmap):
+            self.input_txt.close()
+        self.input_txt = None
+
+    @property
+    def memory_mapped(self) -> bool:
+        return isinstance(self.input_txt, mmap.mmap)
+
+    def has_text(self) -> bool:
+        """Whether the input contains anything but whitespace."""
+        if self.memory_mapped:
+            return re.search(rb"\S", self.input_txt) is not None
+        return bool(self.input_txt)
+
     def extract_indicators(
         self, indicators: Dict[str, List[str]], year: Optional[int] = None
     ) -> pd.DataFrame | None:
@@ -63,56 +362,14 @@ class Parser:
                           'Year' is filled with given year or None if not provided.
         """
 
-        if not self.input_txt:
+        if not self.has_text():
             logging.error("No input text provided")
             return None
 
         logging.info("Extracting indicators...")
 
-        # Regex pattern template to extract a numeric value and optional unit after an indicator name
-        # Matches optional prefixes, spaces, the indicator name (or alias), then a number and optional unit
-        pattern_template = (
-            r"(?:{aliases})"  # Match one of the aliases
-            r"[^0-9\-+,.]*"  # Non-numeric chars between name and number
-            r"([-+]?\d+(?:\.\d+)?)"  # Capture number (int or float)
-            r"\s*"  # Optional whitespace
-            r"(%|CHF\s*bn|billion|million)?"  # Optional units: %, CHF bn, billion, million
-        )
-
-        records = []
-
-        # Prepare a joined pattern for each indicator with its aliases escaped and joined by |
         try:
-            for canonical_name, aliases in indicators.items():
-                aliases_pattern = "|".join(
-                    re.escape(alias) for alias in [canonical_name] + aliases
-                )
-                pattern = pattern_template.format(aliases=aliases_pattern)
-
-                match = re.search(pattern, self.input_txt, flags=re.IGNORECASE)
-                if match:
-                    value_str = match.group(1)
-                    unit_raw = match.group(2) or ""
-                    value = float(value_str)
-
-                    # Normalize units to consistent representation
-                    unit = unit_raw.strip().lower()
-                    if unit in ["billion", "million"]:
-                        # Convert textual units to abbreviation
-                        if unit == "billion":
-                            unit = "bn"
-                        elif unit == "million":
-                            unit = "mn"
-
-                    records.append(
-                        {
-                            "Indicator": canonical_name,
-                            "Value": value,
-                            "Unit": unit.upper() if unit else "",
-                            "Year": year,
-                        }
-                    )
-
+            records = self.indicator_records(indicators, year)
             logging.info(f"Extracted {len(records)} indicators")
 
             return pd.DataFrame(records)
@@ -121,32 +378,272 @@ class Parser:
             logging.error("Error extracting indicators", exc_info=True)
             return None
 
+    def indicator_records(
+        self, indicators: Dict[str, List[str]], year: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Same as `extract_indicators`, but returns the rows as a list of dicts and raises
+        errors instead of logging them.
+        """
+        scanner = get_scanner(alias_key(indicators), binary=self.memory_mapped)
+        found = scanner.scan(self.input_txt)
+
+        records = []
+        for canonical_name in indicators:
+            if canonical_name not in found:
+                continue
+            value_str, unit_raw = found[canonical_name]
+            records.append(
+                {
+                    "Indicator": canonical_name,
+                    "Value": float(value_str),
+                    "Unit": normalize_unit(unit_raw),
+                    "Year": year,
+                }
+            )
+        return records
+
+    def extract_mentions(
+        self, indicators: Dict[str, List[str]], year: Optional[int] = None
+    ) -> pd.DataFrame | None:
+        """
+        Extracts every mention of the indicators, each with its own year, in one scan.
+
+        Unlike `extract_indicators`, every alias occurrence followed by a number is kept,
+        as well as comparison figures ("14.3%, compared to 13.5% in FY2022"). Each value
+        gets the year token nearest to it (see `YearIndex.year_of`), so current and
+        prior-year figures end up in one multi-year table.
+
+        Args:
+            indicators (Dict[str, List[str]]): Canonical indicator names and their aliases.
+            year (Optional[int]): Year of the values without a year token in their sentence,
+                e.g. the result of `extract_year`.
+
+        Returns:
+            pd.DataFrame: DataFrame with columns: ['Indicator', 'Value', 'Unit', 'Year', 'Start', 'End'],
+                          where 'Start' and 'End' are the offsets of the value and its unit in the text
+                          (byte offsets when memory-mapped), in text order.
+        """
+        if not self.has_text():
+            logging.error("No input text provided")
+            return None
+
+        logging.info("Extracting indicator mentions...")
+
+        try:
+            records = self.mention_records(indicators, year)
+            logging.info(f"Extracted {len(records)} indicator mentions")
+
+            return pd.DataFrame(records, columns=MENTION_COLUMNS)
+
+        except Exception:
+            logging.error("Error extracting indicator mentions", exc_info=True)
+            return None
+
+    def mention_records(
+        self, indicators: Dict[str, List[str]], year: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Same as `extract_mentions`, but returns the rows as a list of dicts and raises
+        errors instead of logging them.
+        """
+        scanner = get_scanner(alias_key(indicators), binary=self.memory_mapped)
+        years = YearIndex(self.input_txt, binary=self.memory_mapped)
+        return [
+            {
+                "Indicator": name,
+                "Value": float(value_str),
+                "Unit": normalize_unit(unit_raw),
+                "Year": years.year_of(start, end, year),
+                "Start": start,
+                "End": end,
+            }
+            for name, start, end, value_str, unit_raw in scanner.scan_all(
+                self.input_txt
+            )
+        ]
+
     def extract_year(self) -> int | None:
         logging.info("Extracting year...")
-        pattern = r"(?:FY[\s\-:]?|year(?:-end)?|as of|in)[\s\-:]*(20\d{2})"
-        match = re.search(pattern, self.input_txt, flags=re.IGNORECASE)
+        match = YEAR_PATTERNS[self.memory_mapped].search(self.input_txt)
         if match:
-            logging.info(f"Year extracted: {match.group(1)}")
-            return int(match.group(1))
+            year = int(match.group(1))
+            logging.info(f"Year extracted: {year}")
+            return year
         logging.warning("Year not found")
         return None
 
 
-if __name__ == "__main__":
-    file_name = "data/input.txt"
-    indicator_aliases = {
-        "CET1 Ratio": ["CET1", "CET1 Capital Ratio"],
-        "Tier 1 Ratio": ["Tier 1"],
-        "Total Capital Ratio": [],
-        "Liquidity Coverage Ratio": ["LCR"],
-        "Net Stable Funding Ratio": ["NSFR"],
-        "Risk-Weighted Assets": ["RWA"],
-    }
+INDICATOR_ALIASES = {
+    "CET1 Ratio": ["CET1", "CET1 Capital Ratio"],
+    "Tier 1 Ratio": ["Tier 1"],
+    "Total Capital Ratio": [],
+    "Liquidity Coverage Ratio": ["LCR"],
+    "Net Stable Funding Ratio": ["NSFR"],
+    "Risk-Weighted Assets": ["RWA"],
+}
+
+TABLE_COLUMNS = ["Document", "Year", "Indicator", "Value", "Unit"]
+MENTION_TABLE_COLUMNS = TABLE_COLUMNS + ["Start", "End"]
+
+# Alias set, reading mode and extraction mode of a batch, set once per worker process
+_batch_indicators = None
+_batch_memory_map = False
+_batch_mentions = False
+
+
+def find_documents(source: str) -> List[str]:
+    """
+    Report texts to parse: a single file, every `.txt` file of a directory,
+    or the files matching a glob pattern (`**` is recursive).
+    """
+    if os.path.isfile(source):
+        return [source]
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.txt")))
+    return sorted(
+        path for path in glob.glob(source, recursive=True) if os.path.isfile(path)
+    )
+
+
+def init_batch(
+    indicators: Dict[str, List[str]], memory_map: bool = False, mentions: bool = False
+) -> None:
+    """
+    Sets the alias set of a batch and compiles its scanner once (worker initializer),
+    so the documents sent to a worker only carry their path.
+    """
+    global _batch_indicators, _batch_memory_map, _batch_mentions
+    _batch_indicators = indicators
+    _batch_memory_map = memory_map
+    _batch_mentions = mentions
+    get_scanner(alias_key(indicators), binary=memory_map)
+
 
+def parse_document(path: str) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Parses one document of the batch. A failing document returns its error
+    instead of raising, so it does not stop the rest of the batch.
+    """
     parser = Parser()
-    parser.read_file(file_name)
-    year = parser.extract_year()
-    df = parser.extract_indicators(indicator_aliases, year)
+    try:
+        parser.load_file(path, memory_map=_batch_memory_map)
+        if not parser.has_text():
+            raise ValueError("Document is empty")
+        year = parser.extract_year()
+        if _batch_mentions:
+            records = parser.mention_records(_batch_indicators, year)
+        else:
+            records = parser.indicator_records(_batch_indicators, year)
+    except Exception as e:
+        logging.error(f"Error parsing document {path}", exc_info=True)
+        return [], f"{type(e).__name__}: {e}"
+    finally:
+        parser.close()
+    return [{"Document": path, **record} for record in records], None
+
+
+def parse_documents(
+    paths: List[str],
+    indicators: Dict[str, List[str]],
+    workers: int = 1,
+    memory_map: bool = False,
+    mentions: bool = False,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Parses documents across a process pool.
+
+    With `mentions=True` every mention of the indicators is extracted with its own year
+    and offsets (see `Parser.extract_mentions`) instead of the first value per indicator.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: the long table of indicators
+            (Document, Year, Indicator, Value, Unit, plus Start and End for mentions)
+            in document order, and the failed documents with their error (Document, Error).
+    """
+    logging.info(f"Parsing {len(paths)} documents with {workers} workers")
+    if workers > 1:
+        # Several documents per task to amortise the inter-process overhead
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_batch,
+            initargs=(indicators, memory_map, mentions),
+        ) as executor:
+            results = list(executor.map(parse_document, paths, chunksize=chunksize))
+    else:
+        init_batch(indicators, memory_map, mentions)
+        results = [parse_document(path) for path in paths]
+
+    rows = [row for records, _ in results for row in records]
+    errors = [
+        {"Document": path, "Error": error}
+        for path, (_, error) in zip(paths, results)
+        if error is not None
+    ]
+    logging.info(f"Extracted {len(rows)} indicators, {len(errors)} documents failed")
+    return (
+        pd.DataFrame(
+            rows, columns=MENTION_TABLE_COLUMNS if mentions else TABLE_COLUMNS
+        ),
+        pd.DataFrame(errors, columns=["Document", "Error"]),
+    )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Extract financial indicators from report texts."
+    )
+    arg_parser.add_argument(
+        "--input",
+        default="data/input.txt",
+        help="Report text file, directory of .txt files or glob pattern.",
+    )
+    arg_parser.add_argument(
+        "--output",
+        default="output/output.csv",
+        help="CSV with one row per document and indicator.",
+    )
+    arg_parser.add_argument(
+        "--aliases",
+        help="JSON file mapping canonical indicator names to their aliases.",
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes.",
+    )
+    arg_parser.add_argument(
+        "--memory_map",
+        action="store_true",
+        help="Memory-map the documents instead of reading them into memory.",
+    )
+    arg_parser.add_argument(
+        "--mentions",
+        action="store_true",
+        help="Extract every mention with its own year and offsets instead of the first value per indicator.",
+    )
+    args = arg_parser.parse_args()
+
+    indicator_aliases = INDICATOR_ALIASES
+    if args.aliases is not None:
+        with open(args.aliases, "r", encoding="utf-8") as f:
+            indicator_aliases = json.load(f)
+
+    documents = find_documents(args.input)
+    if not documents:
+        arg_parser.error(f"No documents found for {args.input}")
 
-    if df is not None:
-        df.to_csv("output/output.csv", index=False)
+    df, errors = parse_documents(
+        documents,
+        indicator_aliases,
+        workers=args.workers,
+        memory_map=args.memory_map,
+        mentions=args.mentions,
+    )
+    df.to_csv(args.output, index=False)
+    if not errors.empty:
+        errors_file = f"{os.path.splitext(args.output)[0]}_errors.csv"
+        errors.to_csv(errors_file, index=False)
+        print(f"{len(errors)} of {len(documents)} documents failed, see {errors_file}")
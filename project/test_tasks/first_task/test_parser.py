@@ -0,0 +1,351 @@
+"""
+extract_indicators must return exactly what the original implementation returned:
+one re.search per indicator over its canonical name and aliases, first match wins.
+Also covers the memory-mapped mode, the batch mode and the mention extraction.
+"""
+
+import os
+import random
+import re
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from project.test_tasks.first_task.parser import (
+    INDICATOR_ALIASES,
+    MENTION_COLUMNS,
+    Parser,
+    YearIndex,
+    normalize_unit,
+    parse_documents,
+)
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+
+PATTERN_TEMPLATE = (
+    r"(?:{aliases})"
+    r"[^0-9\-+,.]*"
+    r"([-+]?\d+(?:\.\d+)?)"
+    r"\s*"
+    r"(%|CHF\s*bn|billion|million)?"
+)
+
+# "Tier" / "T" / "Capital Ratio" are prefixes of other names and aliases
+PREFIX_ALIASES = {
+    **INDICATOR_ALIASES,
+    "Capital Ratio": ["capital"],
+    "Tier": ["T"],
+}
+
+TOKENS = [
+    "CET1",
+    " capital ratio",
+    "Tier 1",
+    " Ratio",
+    "LCR",
+    "lcr",
+    "NSFR",
+    "nsfr",
+    "RWA",
+    "Total Capital Ratio",
+    "TOTAL CAPITAL RATIO",
+    " was ",
+    "12.5",
+    "%",
+    " billion",
+    " Million",
+    "-3",
+    "+4",
+    ", ",
+    ".",
+    "CHF bn",
+    "chf  BN",
+    "\n",
+    " 7 ",
+    "Capital",
+    "t",
+    "(",
+    ")",
+]
+
+
+def reference_extract(text: str, indicators: dict, year=None) -> pd.DataFrame:
+    """The original per-indicator re.search implementation."""
+    records = []
+    for canonical_name, aliases in indicators.items():
+        aliases_pattern = "|".join(
+            re.escape(alias) for alias in [canonical_name] + aliases
+        )
+        pattern = PATTERN_TEMPLATE.format(aliases=aliases_pattern)
+        match = re.search(pattern, text, flags=re.IGNORECASE)
+        if match:
+            unit = (match.group(2) or "").strip().lower()
+            unit = {"billion": "bn", "million": "mn"}.get(unit, unit)
+            records.append(
+                {
+                    "Indicator": canonical_name,
+                    "Value": float(match.group(1)),
+                    "Unit": unit.upper() if unit else "",
+                    "Year": year,
+                }
+            )
+    return pd.DataFrame(records)
+
+
+def extract(text: str, indicators: dict, year=None, tmp_path=None) -> pd.DataFrame:
+    """extract_indicators on a string, or on a memory-mapped file (binary scanner)."""
+    parser = Parser()
+    if tmp_path is None:
+        parser.input_txt = text
+    else:
+        path = tmp_path / "report.txt"
+        path.write_text(text, encoding="utf-8")
+        parser.load_file(str(path), memory_map=True)
+    try:
+        return parser.extract_indicators(indicators, year)
+    finally:
+        parser.close()
+
+
+def random_texts(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 40)))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "CET1 ratio 13.2% and Tier 1 ratio of 15.1%, LCR 140%",
+        "cet1 capital ratio: 12.9 %; tier 1 14; nsfr -3.5; rwa 120 CHF bn",
+        "Total Capital Ratio was 18.0 %. RWA of CHF 305 billion, LCR 2 million",
+        "Tier 10 then Capital 7 and T 3",
+        "The capital ratio rose to 17%, Tier 1 ratio 16",
+        "no indicator here 2023",
+    ],
+)
+@pytest.mark.parametrize("indicators", [INDICATOR_ALIASES, PREFIX_ALIASES])
+def test_matches_reference(text, indicators):
+    expected = reference_extract(text, indicators, 2023)
+    pd.testing.assert_frame_equal(extract(text, indicators, 2023), expected)
+
+
+@pytest.mark.parametrize("indicators", [INDICATOR_ALIASES, PREFIX_ALIASES])
+def test_matches_reference_on_random_texts(indicators):
+    for text in random_texts(500):
+        expected = reference_extract(text, indicators)
+        pd.testing.assert_frame_equal(extract(text, indicators), expected, obj=text)
+
+
+@pytest.mark.parametrize("indicators", [INDICATOR_ALIASES, PREFIX_ALIASES])
+def test_binary_matches_reference(indicators, tmp_path):
+    for text in random_texts(100, seed=2):
+        # read_file strips the text; the mapped file is scanned as is
+        text = text.strip()
+        if not text:
+            continue
+        expected = reference_extract(text, indicators, 2023)
+        pd.testing.assert_frame_equal(
+            extract(text, indicators, 2023, tmp_path), expected, obj=text
+        )
+
+
+def test_no_text_returns_none():
+    assert extract("", INDICATOR_ALIASES) is None
+
+
+REPORT = (
+    "As of FY2023, the CET1 ratio was 14.3%, compared to 13.5% in FY2022. "
+    "LCR 140%. Tier 1 12 CHF bn in 2021"
+)
+
+
+def test_memory_mapped_file_matches_string(tmp_path):
+    # Non-ASCII text before the figures: the mapped bytes are UTF-8 encoded
+    text = "Rückblick — " + REPORT
+    path = tmp_path / "report.txt"
+    path.write_text(text, encoding="utf-8")
+
+    parser = Parser()
+    parser.load_file(str(path), memory_map=True)
+    assert parser.memory_mapped
+    mapped_year = parser.extract_year()
+    mapped = parser.extract_indicators(INDICATOR_ALIASES, mapped_year)
+    parser.close()
+    assert parser.input_txt is None
+
+    parser.input_txt = text
+    assert mapped_year == parser.extract_year() == 2023
+    pd.testing.assert_frame_equal(
+        mapped, parser.extract_indicators(INDICATOR_ALIASES, 2023)
+    )
+
+
+@pytest.mark.parametrize("content", ["", " \n\t "])
+def test_memory_mapped_empty_file_has_no_text(content, tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_text(content, encoding="utf-8")
+    parser = Parser()
+    parser.load_file(str(path), memory_map=True)
+    try:
+        assert not parser.has_text()
+        assert parser.extract_indicators(INDICATOR_ALIASES) is None
+    finally:
+        parser.close()
+
+
+def write_batch(directory) -> list[str]:
+    """Two good documents around an empty and a non-UTF-8 one."""
+    documents = {
+        "a.txt": "FY2023 CET1 ratio 13.2%, LCR 140%".encode("utf-8"),
+        "b.txt": b"",
+        "c.txt": b"FY2022 CET1 \xff\xfe 12.0%",
+        "d.txt": "FY2021 NSFR 120%".encode("utf-8"),
+    }
+    for name, content in documents.items():
+        (directory / name).write_bytes(content)
+    return [str(directory / name) for name in documents]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_documents_isolates_failures(workers, tmp_path):
+    paths = write_batch(tmp_path)
+    table, errors = parse_documents(paths, INDICATOR_ALIASES, workers=workers)
+
+    assert table["Document"].tolist() == [paths[0], paths[0], paths[3]]
+    assert table["Indicator"].tolist() == [
+        "CET1 Ratio",
+        "Liquidity Coverage Ratio",
+        "Net Stable Funding Ratio",
+    ]
+    assert table["Year"].tolist() == [2023, 2023, 2021]
+    assert errors["Document"].tolist() == [paths[1], paths[2]]
+    assert errors["Error"][0] == "ValueError: Document is empty"
+    assert errors["Error"][1].startswith("UnicodeDecodeError")
+
+
+def test_cli_writes_failed_documents(tmp_path):
+    write_batch(tmp_path)
+    output = tmp_path / "out.csv"
+    env = {**os.environ, "PYTHONPATH": os.path.abspath(REPO_ROOT)}
+    # Runs in tmp_path, where the parser also creates its log directory
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "project.test_tasks.first_task.parser",
+            "--input",
+            str(tmp_path),
+            "--output",
+            str(output),
+        ],
+        cwd=tmp_path,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+    assert pd.read_csv(output)["Document"].nunique() == 2
+    errors = pd.read_csv(tmp_path / "out_errors.csv")
+    assert [os.path.basename(path) for path in errors["Document"]] == ["b.txt", "c.txt"]
+
+
+@pytest.mark.parametrize(
+    "text, value, expected",
+    [
+        # Nearest year after the value within its clause
+        ("CET1 13.5% in FY2022, 14.3% in 2023", "13.5%", 2022),
+        ("CET1 13.5% in FY2022, 14.3% in 2023", "14.3%", 2023),
+        # Otherwise the nearest year before it within its sentence
+        ("As of FY2023, CET1 was 14.3%", "14.3%", 2023),
+        ("In 2021 and 2022 CET1 was 14.3%", "14.3%", 2022),
+        # A sentence break separates the value from an earlier year
+        ("Year 2023. CET1 was 14.3%", "14.3%", None),
+        # A later year after a clause break belongs to the next clause
+        ("CET1 14.3%, LCR 140% in 2021", "14.3%", None),
+        # Numbers that are not years
+        ("CET1 14.3% vs 2023.5 and 2020%", "14.3%", None),
+    ],
+)
+def test_year_index(text, value, expected):
+    start = text.index(value)
+    years = YearIndex(text)
+    assert years.year_of(start, start + len(value)) == expected
+    assert years.year_of(start, start + len(value), 1999) == (expected or 1999)
+
+    binary = YearIndex(text.encode("utf-8"), binary=True)
+    assert binary.year_of(start, start + len(value)) == expected
+
+
+@pytest.mark.parametrize(
+    "unit, expected",
+    [
+        ("%", "%"),
+        (" billion", "BN"),
+        ("Million", "MN"),
+        ("chf  bn", "CHF  BN"),
+        ("", ""),
+        ("  ", ""),
+    ],
+)
+def test_normalize_unit(unit, expected):
+    assert normalize_unit(unit) == expected
+
+
+def test_extract_mentions():
+    parser = Parser()
+    parser.input_txt = REPORT
+    mentions = parser.extract_mentions(INDICATOR_ALIASES, 2020)
+
+    assert mentions.columns.tolist() == MENTION_COLUMNS
+    assert mentions[["Indicator", "Value", "Unit", "Year"]].values.tolist() == [
+        ["CET1 Ratio", 14.3, "%", 2023],
+        ["CET1 Ratio", 13.5, "%", 2022],
+        # No year in its sentence: the default year
+        ["Liquidity Coverage Ratio", 140.0, "%", 2020],
+        ["Tier 1 Ratio", 12.0, "CHF BN", 2021],
+    ]
+    assert [REPORT[start:end] for start, end in mentions[["Start", "End"]].values] == [
+        "14.3%",
+        "13.5%",
+        "140%",
+        "12 CHF bn",
+    ]
+
+    # The first mention of each indicator is what extract_indicators returns
+    first = mentions.drop_duplicates("Indicator").set_index("Indicator")
+    indicators = parser.extract_indicators(INDICATOR_ALIASES).set_index("Indicator")
+    pd.testing.assert_frame_equal(
+        first[["Value", "Unit"]], indicators.loc[first.index, ["Value", "Unit"]]
+    )
+
+
+def test_extract_mentions_memory_mapped(tmp_path):
+    # Offsets are byte offsets when memory-mapped
+    text = "Rückblick — " + REPORT
+    path = tmp_path / "report.txt"
+    path.write_text(text, encoding="utf-8")
+    parser = Parser()
+    parser.load_file(str(path), memory_map=True)
+    try:
+        mapped = parser.extract_mentions(INDICATOR_ALIASES, 2020)
+    finally:
+        parser.close()
+
+    parser.input_txt = REPORT
+    expected = parser.extract_mentions(INDICATOR_ALIASES, 2020)
+    shift = len("Rückblick — ".encode("utf-8"))
+    expected[["Start", "End"]] += shift
+    pd.testing.assert_frame_equal(mapped, expected)
+
+
+def test_extract_mentions_without_text():
+    parser = Parser()
+    parser.input_txt = ""
+    assert parser.extract_mentions(INDICATOR_ALIASES) is None
+    parser.input_txt = "No indicators in 2023."
+    mentions = parser.extract_mentions(INDICATOR_ALIASES)
+    assert mentions.empty
+    assert mentions.columns.tolist() == MENTION_COLUMNS
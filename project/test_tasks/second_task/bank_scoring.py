@@ -1,6 +1,7 @@
 import logging
 import json
 import os
+import numpy as np
 import pandas as pd
 
 os.makedirs("project/logs", exist_ok=True)
@@ -15,17 +16,133 @@ logging.basicConfig(
 SCORING_RULES_PATH = "project/data/scoring_rules.json"
 
 
-def scoring(bank_data: dict) -> None | pd.DataFrame:
+SCORECARD_COLUMNS = [
+    "Bank",
+    "Indicator",
+    "Value",
+    "Score",
+    "Confidence",
+    "Class",
+    "Total Score",
+]
+CLASSES = ["Critical", "Warning", "Good"]
+PENALTY = 10
+
+
+def load_scoring_rules(path: str = SCORING_RULES_PATH) -> dict:
+    """
+    Loads the scoring rules once into arrays aligned on the indicator order of the file:
+    'indicators' (names), 'low' and 'high' (thresholds) and 'scores' (indicator x [low, medium, high]).
+    """
+    logging.info(f"Loading scoring rules from {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        scoring_rules = json.load(f)
+    logging.info("Scoring rules loaded.")
+
+    thresholds = np.array(
+        [rules["thresholds"] for rules in scoring_rules.values()], dtype=float
+    ).reshape(-1, 2)
+    return {
+        "indicators": list(scoring_rules),
+        "low": thresholds[:, 0],
+        "high": thresholds[:, 1],
+        # Integer scores stay integers, like in the per-bank scorecards
+        "scores": np.array(
+            [rules["scores"] for rules in scoring_rules.values()]
+        ).reshape(-1, 3),
+    }
+
+
+def round_2(values: np.ndarray) -> np.ndarray:
+    """
+    Python's round(x, 2) on an array. np.round scales by 100 first, which can round
+    values like 0.495 the other way, so values close to a tie are rounded one by one.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(value, 2) for value in values[ties].tolist()]
+    return rounded
+
+
+def score_banks(values: pd.DataFrame, rules: dict) -> pd.DataFrame:
+    """
+    Scores every bank and indicator at once.
+
+    Arguments:
+        values (pd.DataFrame): Bank x indicator matrix (one row per bank, indexed by bank name).
+        rules (dict): Scoring rules from `load_scoring_rules`.
+
+    Returns:
+        pd.DataFrame: One tidy scorecard for all banks with the columns
+        Bank, Indicator, Value, Score, Confidence, Class and Total Score (of the bank),
+        in bank order and then in the indicator order of the rules. Missing (or zero)
+        indicator values are skipped, like in `scoring`. A bank without any valid indicator
+        therefore has no rows (and gets no per-bank scorecard files), where the original
+        per-bank script crashed in `scorecard_to_json` on its empty scorecard.
+    """
+    indicators = rules["indicators"]
+    low, high, scores = rules["low"], rules["high"], rules["scores"]
+    matrix = values.reindex(columns=indicators).to_numpy(dtype=float)
+    valid = ~np.isnan(matrix) & (matrix != 0)
+
+    mid_point = (low + high) / 2
+    half_range = (high - low) / 2
+    critical = matrix < low
+    warning = (matrix >= low) & (matrix < high)
+    conditions = [critical, warning]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Critical: how far below the low threshold
+        # Warning: how close to the midpoint of the thresholds, with a penalty below it
+        # Good: how close to twice the high threshold, with a penalty below 1.5x the high threshold
+        score = np.select(
+            conditions,
+            [scores[:, 0], scores[:, 1] - PENALTY * (matrix < mid_point)],
+            scores[:, 2] - PENALTY * (matrix < high * 1.5),
+        )
+        confidence = np.select(
+            conditions,
+            [1 - matrix / low, 1 - np.abs(matrix - mid_point) / half_range],
+            np.minimum(matrix / (high * 2), 1),
+        )
+    confidence = round_2(confidence)
+    classes = np.select(conditions, [0, 1], 2)
+    total_score = np.where(valid, score, 0).sum(axis=1)
+
+    banks, columns = np.nonzero(valid)
+    return pd.DataFrame(
+        {
+            "Bank": values.index.to_numpy()[banks],
+            "Indicator": np.array(indicators, dtype=object)[columns],
+            "Value": matrix[banks, columns],
+            "Score": score[banks, columns],
+            "Confidence": confidence[banks, columns],
+            "Class": pd.Categorical.from_codes(classes[banks, columns], CLASSES),
+            "Total Score": total_score[banks],
+        },
+        columns=SCORECARD_COLUMNS,
+    )
+
+
+def bank_data_to_matrix(bank_data: dict) -> pd.DataFrame:
+    """Converts {bank name: {indicator: value}} into a bank x indicator matrix."""
+    return pd.DataFrame.from_dict(bank_data, orient="index")
+
+
+def scoring(bank_data: dict, rules: dict | None = None) -> None | pd.DataFrame:
     """
     Evaluates bank data according to predefined scoring rules and produces a scorecard outlining results for each indicator.
 
     The function applies a set of scoring rules to bank data, which includes processing indicators and determining their
     classification, score, and confidence level based on thresholds and specified scoring logic. Data not matching expected
     indicators results in warnings. The total score is calculated by aggregating individual indicator scores and returned
-    within the scorecard.
+    within the scorecard. To score many banks, use `score_banks` on the whole bank x indicator matrix instead.
 
     Arguments:
         bank_data (dict): Dictionary containing the bank indicators and their corresponding values.
+        rules (dict | None): Scoring rules from `load_scoring_rules`; loaded from SCORING_RULES_PATH if not given.
 
     Returns:
         None or pd.DataFrame: A DataFrame containing the scoring results for each indicator, including classification, score,
@@ -34,80 +151,20 @@ def scoring(bank_data: dict) -> None | pd.DataFrame:
 
     logging.info("Bank scoring...")
 
-    try:
-        logging.info(f"Loading scoring rules from {SCORING_RULES_PATH}")
-        with open(SCORING_RULES_PATH, "r", encoding="utf-8") as f:
-            scoring_rules = json.load(f)
-    except Exception:
-        logging.error("Error loading scoring rules", exc_info=True)
-        return None
-
-    logging.info("Scoring rules loaded.")
+    if rules is None:
+        try:
+            rules = load_scoring_rules()
+        except Exception:
+            logging.error("Error loading scoring rules", exc_info=True)
+            return None
 
-    scorecard = pd.DataFrame(
-        columns=["Indicator", "Value", "Score", "Confidence", "Class"]
-    )
-    total_score = 0
-    for indicator, rules in scoring_rules.items():
-        logging.info(f"Processing scoring for indicator: {indicator}")
-
-        indicator_value = bank_data.get(indicator)
-        if not indicator_value:
+    for indicator in rules["indicators"]:
+        if not bank_data.get(indicator):
             logging.warning(f"Indicator {indicator} not found in bank data.")
-            continue
-
-        threshold_low, threshold_high = rules["thresholds"]
-        score_low, score_medium, score_high = rules["scores"]
-        penalty = 10
-        score = None
-        confidence = None
-        cls = None
-        if indicator_value < threshold_low:
-            cls = "Critical"
-            score = score_low
-
-            # Calculate confidence based on how far the indicator is below the low threshold
-            confidence = 1 - indicator_value / threshold_low
-            confidence = round(confidence, 2)
-
-        elif threshold_low <= indicator_value < threshold_high:
-            cls = "Warning"
-            score = score_medium
-
-            # Calculate confidence based on the midpoint of the thresholds
-            mid_point = (threshold_low + threshold_high) / 2
-            half_range = (threshold_high - threshold_low) / 2
-            confidence = 1 - abs(indicator_value - mid_point) / half_range
-            confidence = round(confidence, 2)
-
-            # Apply penalty if the indicator is close to the low or high threshold
-            if indicator_value < mid_point:
-                score -= penalty
-
-        elif indicator_value >= threshold_high:
-            cls = "Good"
-            score = score_high
-
-            # Calculate confidence based on how close the indicator is to the high threshold
-            confidence = min(indicator_value / (threshold_high * 2), 1)
-            confidence = round(confidence, 2)
-
-            # Apply penalty if the indicator is significantly below the high threshold
-            if indicator_value < threshold_high * 1.5:
-                score -= penalty
-
-        total_score += score
-        scorecard.loc[scorecard.shape[0]] = [
-            indicator,
-            indicator_value,
-            score,
-            confidence,
-            cls,
-        ]
-
-    scorecard["Total Score"] = total_score
+
+    scorecard = score_banks(pd.DataFrame([bank_data]), rules)
     logging.info("Scoring completed.")
-    return scorecard
+    return scorecard.drop(columns="Bank")
 
 
 def scorecard_to_json(scorecard: pd.DataFrame, output_path: str) -> None:
@@ -173,8 +230,15 @@ if __name__ == "__main__":
         bank_data = json.load(f)
 
     bank_data[test_bank_name] = test_bank_data
-    for bank_name, indicators in bank_data.items():
-        scorecard = scoring(indicators)
-        if scorecard is not None:
+
+    try:
+        rules = load_scoring_rules()
+    except Exception:
+        logging.error("Error loading scoring rules", exc_info=True)
+    else:
+        scorecards = score_banks(bank_data_to_matrix(bank_data), rules)
+        scorecards.to_csv("output/scorecards.csv", index=False)
+        for bank_name, scorecard in scorecards.groupby("Bank", sort=False):
+            scorecard = scorecard.drop(columns="Bank")
             scorecard.to_csv(f"output/{bank_name}_scorecard.csv", index=False)
             scorecard_to_json(scorecard, f"output/{bank_name}_scorecard.json")
@@ -0,0 +1,142 @@
+"""
+score_banks must reproduce the original per-bank, per-indicator scoring loop,
+including Python's round(x, 2) on the confidences.
+"""
+
+import json
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from project.test_tasks.second_task.bank_scoring import (
+    bank_data_to_matrix,
+    load_scoring_rules,
+    round_2,
+    score_banks,
+    scoring,
+)
+
+RULES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "..",
+    "data",
+    "scoring_rules.json",
+)
+
+
+def reference_scoring(bank_data: dict, scoring_rules: dict) -> pd.DataFrame:
+    """The original scoring loop (penalty 10), on the raw scoring rules JSON."""
+    rows = []
+    total_score = 0
+    for indicator, rules in scoring_rules.items():
+        value = bank_data.get(indicator)
+        if not value:
+            continue
+        low, high = rules["thresholds"]
+        score_low, score_medium, score_high = rules["scores"]
+        if value < low:
+            cls, score = "Critical", score_low
+            confidence = round(1 - value / low, 2)
+        elif value < high:
+            cls, score = "Warning", score_medium
+            mid_point = (low + high) / 2
+            confidence = round(1 - abs(value - mid_point) / ((high - low) / 2), 2)
+            if value < mid_point:
+                score -= 10
+        else:
+            cls, score = "Good", score_high
+            confidence = round(min(value / (high * 2), 1), 2)
+            if value < high * 1.5:
+                score -= 10
+        total_score += score
+        rows.append([indicator, value, score, confidence, cls])
+    scorecard = pd.DataFrame(
+        rows, columns=["Indicator", "Value", "Score", "Confidence", "Class"]
+    )
+    scorecard["Total Score"] = total_score
+    return scorecard
+
+
+@pytest.fixture(scope="module")
+def raw_rules() -> dict:
+    with open(RULES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def rules() -> dict:
+    return load_scoring_rules(RULES_PATH)
+
+
+def random_banks(indicators: list, count: int = 300, seed: int = 0) -> dict:
+    """Random banks with missing and zero indicators and values on the thresholds."""
+    rng = random.Random(seed)
+    on_thresholds = [10, 11, 12, 13, 14, 15, 16, 18, 100, 105, 110, 115, 130, 195]
+    banks = {}
+    for b in range(count):
+        bank = {}
+        for indicator in indicators + ["Risk-Weighted Assets"]:
+            r = rng.random()
+            if r < 0.1:
+                continue
+            if r < 0.13:
+                bank[indicator] = 0
+            elif r < 0.4:
+                bank[indicator] = float(rng.choice(on_thresholds))
+            else:
+                bank[indicator] = round(rng.uniform(0, 200), 1)
+        banks[f"Bank {b}"] = bank
+    return banks
+
+
+def assert_same_scorecard(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    assert actual["Indicator"].tolist() == expected["Indicator"].tolist()
+    np.testing.assert_allclose(actual["Value"], expected["Value"].astype(float))
+    assert actual["Score"].tolist() == expected["Score"].tolist()
+    # Exact equality: the confidences must be rounded like round(x, 2)
+    assert actual["Confidence"].tolist() == expected["Confidence"].tolist()
+    assert actual["Class"].astype(str).tolist() == expected["Class"].tolist()
+    assert actual["Total Score"].tolist() == expected["Total Score"].tolist()
+
+
+def test_score_banks_matches_reference(rules, raw_rules):
+    banks = random_banks(rules["indicators"])
+    scorecards = score_banks(bank_data_to_matrix(banks), rules)
+    for bank, bank_data in banks.items():
+        actual = scorecards[scorecards["Bank"] == bank].reset_index(drop=True)
+        assert_same_scorecard(actual, reference_scoring(bank_data, raw_rules))
+
+
+def test_scoring_matches_reference(rules, raw_rules):
+    for bank_data in random_banks(rules["indicators"], count=30, seed=1).values():
+        assert_same_scorecard(
+            scoring(bank_data, rules), reference_scoring(bank_data, raw_rules)
+        )
+
+
+def test_bank_without_valid_indicators_has_no_rows(rules):
+    banks = {"Empty": {"CET1 Ratio": 0}, "Scored": {"CET1 Ratio": 13.0}}
+    scorecards = score_banks(bank_data_to_matrix(banks), rules)
+    assert scorecards["Bank"].tolist() == ["Scored"]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [0.005, 0.015, 0.125, 0.145, 0.285, 0.495, 0.575, 0.995, 1.005, 2.675, -0.495],
+)
+def test_round_2_ties(value):
+    assert round_2(np.array([value])).tolist() == [round(value, 2)]
+
+
+def test_round_2_matches_round():
+    rng = np.random.default_rng(0)
+    # Many values on (or next to) a tie of the second decimal
+    values = np.concatenate(
+        [rng.uniform(-2, 2, 5000), np.round(rng.uniform(-2, 2, 5000), 3)]
+    )
+    assert round_2(values).tolist() == [round(value, 2) for value in values.tolist()]